@@ -0,0 +1,167 @@
+"""
+Пересчет отчетов на прошлые даты (backfill).
+
+Каждая выгрузка читается и обогащается один раз (DataProcessor.prepared_df),
+после чего для каждой даты диапазона пересчитываются только колонки,
+зависящие от даты (дни на проверке, SLA), и формируются отчеты.
+Даты распределяются по процессам пакетами, чтобы подготовленный
+DataFrame передавался в каждый процесс один раз.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from config.constants import DEFAULT_OUTPUT_FOLDER
+from core.calendars import get_calendar_registry
+from core.create_dataframes import DataProcessor
+from core.scheduler import REPORT_TYPES, JobScheduler, ScheduledJob, shared_reports
+from main import MainProcessor, parse_as_of
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Все даты от start до end включительно."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _replay_dates(
+        input_file: str,
+        prepared_df: pd.DataFrame,
+        moments: Sequence[datetime],
+        output_folder: str,
+        reports: Optional[List[str]],
+        strict: bool
+) -> Dict[str, int]:
+    """
+    Формирует отчеты для пакета дат (выполняется в отдельном процессе).
+
+    Returns:
+        Словарь дата -> количество работ в base_df на эту дату
+    """
+    registry = get_calendar_registry()
+    source = DataProcessor(input_file, calendar_registry=registry)
+    source.prepared_df = prepared_df
+    scheduler = JobScheduler()
+
+    counts = {}
+    for moment in moments:
+        processor = MainProcessor(input_file, output_folder, registry, scheduler, as_of=moment)
+        processor.data_processor = source.as_of(moment)
+
+        if reports is None:
+            jobs = scheduler.due_jobs(moment)
+        else:
+            jobs = [ScheduledJob('backfill', reports, strict=strict)]
+        shared = shared_reports(jobs)
+        for job in jobs:
+            processor.run_job(job, shared=shared)
+        counts[moment.date().isoformat()] = len(processor.data_processor.base_df)
+    return counts
+
+
+class BackfillRunner:
+    """Формирует отчеты по одной или нескольким выгрузкам за диапазон дат."""
+
+    def __init__(
+            self,
+            input_files: Iterable[str],
+            output_folder: str = DEFAULT_OUTPUT_FOLDER,
+            reports: Optional[List[str]] = None,
+            strict: bool = False,
+            workers: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            input_files: Архивные выгрузки
+            output_folder: Папка для отчетов (при нескольких выгрузках - подпапка на выгрузку)
+            reports: Отчеты для каждой даты; None - по расписанию schedule.yaml
+            strict: Строгая фильтрация (только вместе с reports)
+            workers: Количество процессов (по умолчанию - число ядер)
+        """
+        self.input_files = [Path(path) for path in input_files]
+        self.output_folder = Path(output_folder)
+        self.reports = reports
+        unknown = [report for report in reports or [] if report not in REPORT_TYPES]
+        if unknown:
+            raise ValueError(f"Неизвестные отчеты: {unknown}")
+        self.strict = strict
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, start: datetime, end: datetime) -> Dict[str, Dict[str, int]]:
+        """
+        Формирует отчеты за каждую дату от start до end.
+
+        Args:
+            start: Первая дата (время берется для всех дат)
+            end: Последняя дата
+
+        Returns:
+            Словарь выгрузка -> {дата: количество работ}
+        """
+        moments = [datetime.combine(day, start.time()) for day in date_range(start.date(), end.date())]
+        results = {}
+
+        for input_file in self.input_files:
+            source = DataProcessor(str(input_file), calendar_registry=get_calendar_registry())
+            if source.prepare_df() is None:
+                print(f"Пропуск выгрузки {input_file}")
+                continue
+
+            output_folder = self.output_folder
+            if len(self.input_files) > 1:
+                output_folder = output_folder / input_file.stem
+            output_folder.mkdir(parents=True, exist_ok=True)
+
+            chunks = [moments[i::self.workers] for i in range(min(self.workers, len(moments)))]
+            args = (str(input_file), source.prepared_df)
+            options = (str(output_folder), self.reports, self.strict)
+
+            counts = {}
+            if len(chunks) == 1:
+                counts.update(_replay_dates(*args, chunks[0], *options))
+            else:
+                with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                    futures = [executor.submit(_replay_dates, *args, chunk, *options) for chunk in chunks]
+                    for future in futures:
+                        counts.update(future.result())
+            results[str(input_file)] = dict(sorted(counts.items()))
+
+        return results
+
+
+def main() -> None:
+    """Точка входа пересчета отчетов."""
+    parser = argparse.ArgumentParser(description="Пересчет отчетов Work Analysis на прошлые даты")
+    parser.add_argument('inputs', nargs='+', help="Архивные выгрузки")
+    parser.add_argument('--from', dest='start', required=True, help="Первая дата (ГГГГ-ММ-ДД[ЧЧ:ММ])")
+    parser.add_argument('--to', dest='end', help="Последняя дата (по умолчанию равна --from)")
+    parser.add_argument('--output-folder', default=DEFAULT_OUTPUT_FOLDER, help="Папка для отчетов")
+    parser.add_argument('--reports', nargs='+', choices=REPORT_TYPES,
+                        help="Отчеты для каждой даты (по умолчанию - по расписанию)")
+    parser.add_argument('--strict', action='store_true', help="Строгая фильтрация (> срока)")
+    parser.add_argument('--workers', type=int, help="Количество процессов")
+    args = parser.parse_args()
+
+    start = parse_as_of(args.start)
+    end = parse_as_of(args.end) if args.end else start
+    if end < start:
+        parser.error("--to раньше --from")
+
+    runner = BackfillRunner(args.inputs, args.output_folder, args.reports, args.strict, args.workers)
+    started = datetime.now()
+    results = runner.run(start, end)
+
+    print("Итог пересчета:")
+    for input_file, counts in results.items():
+        print(f"  {input_file}: {len(counts)} дат")
+        for day, count in counts.items():
+            print(f"    {day}: {count} работ")
+    print(f"Время: {(datetime.now() - started).total_seconds():.1f} с")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""
+Бенчмарки этапов обработки.
+
+Запуск из корня проекта:
+    python -m benchmarks.run --size 10k
+    python -m benchmarks.run --size 100k --compare
+"""
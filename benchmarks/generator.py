@@ -0,0 +1,141 @@
+"""
+Детерминированный генератор выгрузок "Непроверенные работы".
+
+Модули и координаторы берутся из config/, поэтому данные
+проходят через обогащение так же, как реальные выгрузки:
+- ~15% работ - дипломы (DIPLOMA_MODULES), ~15% - курсовые, остальное - ДЗ;
+- модули - блоки из professions.yaml с номером потока;
+- время отправки - за последние 30 дней, чаще недавние и в рабочее время;
+- ~1% работ у неизвестных координаторов, ~40% без проверяющего.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import REQUIRED_COLUMNS
+from config.modules import COORDINATORS_DICT, DIPLOMA_MODULES, PROFESSION_TO_BLOCKS
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DATA_FOLDER = Path(__file__).parent / 'data'
+DEFAULT_SEED = 42
+# Фиксированный момент выгрузки, чтобы возраст работ не зависел от дня запуска
+DEFAULT_NOW = datetime(2025, 3, 14, 12, 0)
+
+
+def _blocks() -> np.ndarray:
+    """Блоки из professions.yaml (без служебных запятых)."""
+    blocks = {block.strip().strip(',') for values in PROFESSION_TO_BLOCKS.values() for block in values}
+    return np.array(sorted(block for block in blocks if block))
+
+
+def generate_works(n_rows: int, seed: int = DEFAULT_SEED, now: datetime = DEFAULT_NOW) -> pd.DataFrame:
+    """
+    Генерирует DataFrame в формате выгрузки.
+
+    Args:
+        n_rows: Количество работ
+        seed: Зерно генератора (одинаковое зерно - одинаковые данные)
+        now: Момент выгрузки
+
+    Returns:
+        DataFrame с колонками REQUIRED_COLUMNS
+    """
+    rng = np.random.default_rng(seed)
+    blocks = _blocks()
+    diploma_modules = np.array(DIPLOMA_MODULES)
+
+    kind = rng.random(n_rows)
+    is_diploma = kind < 0.15
+    is_course = (kind >= 0.15) & (kind < 0.30)
+
+    stream = rng.integers(1, 60, n_rows).astype(str)
+    modules = np.char.add(np.char.add(rng.choice(blocks, n_rows), '-'), stream).astype(object)
+    modules[is_diploma] = rng.choice(diploma_modules, is_diploma.sum())
+    task_type = np.where(is_diploma | is_course, 'Диплом', 'ДЗ')
+
+    # Возраст: экспоненциальный (большинство работ свежие), время - чаще рабочие часы
+    age_days = np.minimum(rng.exponential(4.0, n_rows), 30).astype(int)
+    hours = np.where(rng.random(n_rows) < 0.7, rng.integers(9, 19, n_rows), rng.integers(0, 24, n_rows))
+    minutes = rng.integers(0, 60, n_rows)
+    day_start = pd.Timestamp(now.date())
+    submitted = (day_start - pd.to_timedelta(age_days, unit='D')
+                 + pd.to_timedelta(hours, unit='h') + pd.to_timedelta(minutes, unit='m'))
+    submitted = submitted.where(submitted <= pd.Timestamp(now), pd.Timestamp(now))
+
+    coordinator_ids = np.array(list(COORDINATORS_DICT), dtype=np.int64)
+    coord_id = rng.choice(coordinator_ids, n_rows)
+    unknown = rng.random(n_rows) < 0.01
+    coord_id[unknown] = rng.integers(1_000_000, 9_999_999, unknown.sum())
+
+    reviewers = np.array([f'Эксперт {i:03d}' for i in range(max(50, n_rows // 200))], dtype=object)
+    reviewer = rng.choice(reviewers, n_rows)
+    reviewer[rng.random(n_rows) < 0.4] = None
+    # До 4 разных возможных проверяющих: индексы first + j * step различны при step < len / 4
+    candidates_count = rng.integers(0, 5, n_rows)
+    first = rng.integers(0, len(reviewers), n_rows)
+    step = rng.integers(1, len(reviewers) // 4, n_rows)
+    candidates = reviewers[first].copy()
+    for j in range(1, 4):
+        extra = reviewers[(first + j * step) % len(reviewers)]
+        candidates = np.where(candidates_count > j, candidates + ', ' + extra, candidates)
+    candidates[candidates_count == 0] = None
+
+    # Студенты: часть присылает несколько работ
+    students = np.floor(rng.pareto(1.5, n_rows) * n_rows / 20).astype(np.int64) % max(1, n_rows // 3) + 100_000
+    work_ids = np.arange(n_rows) + 1_000_000
+
+    df = pd.DataFrame({
+        'Модуль': modules,
+        'Название задания': np.char.add('Задание ', rng.integers(1, 12, n_rows).astype(str)),
+        'Ссылка на работу в админке': np.char.add('https://admin.example/works/', work_ids.astype(str)),
+        'Ссылка на работу в ЛК эксперта': np.char.add('https://lk.example/review/', work_ids.astype(str)),
+        'ID студента': students,
+        'Отправлена': submitted,
+        'Проверяющий': reviewer,
+        'Возможные проверяющие': candidates,
+        'Дней на проверке': age_days,
+        'Тип задания': task_type,
+        'coord_id': coord_id,
+    })
+    return df[REQUIRED_COLUMNS]
+
+
+def workbook_path(size: str, seed: int = DEFAULT_SEED) -> Path:
+    """Путь к сгенерированной выгрузке в кэше benchmarks/data/."""
+    return DATA_FOLDER / f"works_{size}_{seed}.xlsx"
+
+
+def ensure_workbook(size: str, seed: int = DEFAULT_SEED, path: Optional[Path] = None) -> Path:
+    """
+    Возвращает путь к выгрузке нужного размера, создавая ее при отсутствии.
+
+    Args:
+        size: Ключ SIZES (10k, 100k, 1m)
+        seed: Зерно генератора
+        path: Явный путь (по умолчанию - кэш benchmarks/data/)
+
+    Returns:
+        Путь к файлу xlsx
+    """
+    if size not in SIZES:
+        raise ValueError(f"Неизвестный размер {size}, доступны: {', '.join(SIZES)}")
+    path = Path(path) if path else workbook_path(size, seed)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Генерация выгрузки {size} ({SIZES[size]} строк): {path}")
+        generate_works(SIZES[size], seed).to_excel(path, index=False, engine='openpyxl')
+    return path
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Генерация тестовой выгрузки")
+    parser.add_argument('size', choices=list(SIZES))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help="Путь к файлу (по умолчанию - benchmarks/data/)")
+    args = parser.parse_args()
+    print(ensure_workbook(args.size, args.seed, args.output))
@@ -0,0 +1,173 @@
+"""
+Запуск бенчмарков и сравнение с базовыми результатами.
+
+    python -m benchmarks.run --size 10k                  # замер
+    python -m benchmarks.run --size 10k --save           # замер и запись в baseline.json
+    python -m benchmarks.run --size 100k --compare       # сравнение с baseline.json
+
+Абсолютное время зависит от машины, поэтому baseline.json нужно
+пересоздавать (--save) на каждой машине, где выполняется сравнение.
+При сравнении время этапов делится на время опорного этапа REFERENCE_STAGE
+(чтение xlsx - только pandas, без кода проекта), так что общий сдвиг
+скорости машины или ее загрузки не считается регрессией.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generator import DEFAULT_SEED, SIZES, ensure_workbook
+from benchmarks.stages import STAGES, BenchContext
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+# Этап, относительно которого сравнивается время остальных
+REFERENCE_STAGE = 'read'
+# Поля окружения, при расхождении которых базовые результаты нужно пересоздать
+HOST_KEYS = ('python', 'platform', 'machine', 'cpu_count')
+
+
+def run_stages(context: BenchContext, stages: List[str], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Замеряет этапы.
+
+    Returns:
+        Словарь этап -> {'seconds': лучшее время, 'median': медиана, 'rows': строки}
+    """
+    results = {}
+    for name in stages:
+        timings = []
+        rows = 0
+        for _ in range(repeat):
+            # Вывод этапов (print в отчетах) не должен влиять на замер
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                rows = STAGES[name](context)
+                timings.append(time.perf_counter() - started)
+        results[name] = {
+            'seconds': round(min(timings), 6),
+            'median': round(statistics.median(timings), 6),
+            'rows': int(rows),
+        }
+        print(f"  {name:<22} {min(timings):>10.4f} с  ({rows} строк)")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """Окружение, в котором получены результаты."""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    """Читает baseline.json (пустой словарь, если файла нет)."""
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, Any]], saved: Dict[str, Any], tolerance: float) -> bool:
+    """
+    Сравнивает результаты с базовыми с поправкой на опорный этап.
+
+    Args:
+        results: Результаты run_stages
+        saved: Запись baseline.json для размера ('environment', 'stages')
+        tolerance: Допустимое замедление (во сколько раз)
+
+    Returns:
+        True, если ни один этап не медленнее базового более чем в tolerance раз
+    """
+    baseline = saved.get('stages', {})
+    current = environment()
+    changed = [key for key in HOST_KEYS if saved.get('environment', {}).get(key) != current[key]]
+    if changed:
+        print(f"Внимание: базовые результаты получены в другом окружении ({', '.join(changed)}); "
+              f"пересоздайте их на этой машине (--save)")
+
+    scale = 1.0
+    reference, base_reference = results.get(REFERENCE_STAGE), baseline.get(REFERENCE_STAGE)
+    if reference and base_reference and base_reference['seconds']:
+        scale = reference['seconds'] / base_reference['seconds']
+        print(f"Опорный этап {REFERENCE_STAGE}: x{scale:.2f} к базовому, время этапов сравнивается с поправкой")
+    else:
+        print(f"Опорный этап {REFERENCE_STAGE} не измерен: сравнивается абсолютное время")
+
+    ok = True
+    print(f"Сравнение с базовыми результатами (допуск x{tolerance}):")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:<22} нет базового результата")
+            continue
+        ratio = result['seconds'] / (base['seconds'] * scale) if base['seconds'] else float('inf')
+        status = 'OK'
+        if ratio > tolerance:
+            status = 'РЕГРЕССИЯ'
+            ok = False
+        print(f"  {name:<22} {base['seconds']:>10.4f} -> {result['seconds']:>10.4f} с  x{ratio:.2f}  {status}")
+    return ok
+
+
+def main() -> int:
+    """Точка входа бенчмарков."""
+    parser = argparse.ArgumentParser(description="Бенчмарки этапов обработки")
+    parser.add_argument('--size', choices=list(SIZES), default='10k', help="Размер выгрузки")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Зерно генератора")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES), help="Этапы")
+    parser.add_argument('--repeat', type=int, default=3, help="Повторов каждого этапа (берется лучшее время)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="Файл базовых результатов")
+    parser.add_argument('--save', action='store_true', help="Сохранить результаты как базовые")
+    parser.add_argument('--compare', action='store_true', help="Сравнить с базовыми результатами")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="Допустимое замедление с поправкой на опорный этап (во сколько раз)")
+    args = parser.parse_args()
+    if args.compare and REFERENCE_STAGE not in args.stages:
+        args.stages = [REFERENCE_STAGE] + args.stages
+
+    workbook = ensure_workbook(args.size, args.seed)
+    print(f"Выгрузка: {workbook} ({SIZES[args.size]} строк)")
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        with contextlib.redirect_stdout(io.StringIO()):
+            context = BenchContext(workbook, Path(output_folder))
+        results = run_stages(context, args.stages, args.repeat)
+
+    baseline = load_baseline(args.baseline)
+    ok = True
+    if args.compare:
+        ok = compare(results, baseline.get(args.size, {}), args.tolerance)
+
+    if args.save:
+        saved = baseline.get(args.size, {}).get('stages', {})
+        saved.update(results)
+        baseline[args.size] = {'seed': args.seed, 'environment': environment(), 'stages': saved}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"Базовые результаты сохранены: {args.baseline}")
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
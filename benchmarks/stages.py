@@ -0,0 +1,104 @@
+"""
+Бенчмарки отдельных этапов обработки.
+
+Каждый этап - функция (контекст) -> количество обработанных строк.
+Подготовка данных выполняется один раз в BenchContext и в замер не входит.
+"""
+from pathlib import Path
+from typing import Callable, Dict
+
+import pandas as pd
+
+from benchmarks.generator import DEFAULT_NOW
+from core.create_dataframes import DataProcessor
+from core.get_coordinators import get_coordinator_name
+from core.get_module import get_base_module
+from models.course import CourseWorksProcessor
+from models.homework import process_unverified_works
+
+STAGES: Dict[str, Callable[['BenchContext'], int]] = {}
+
+
+def stage(name: str) -> Callable:
+    """Регистрирует функцию этапа в STAGES."""
+    def decorator(func: Callable[['BenchContext'], int]) -> Callable[['BenchContext'], int]:
+        STAGES[name] = func
+        return func
+    return decorator
+
+
+class BenchContext:
+    """Подготовленные данные для этапов."""
+
+    def __init__(self, workbook: Path, output_folder: Path) -> None:
+        """
+        Args:
+            workbook: Сгенерированная выгрузка
+            output_folder: Временная папка для записываемых отчетов
+        """
+        self.workbook = workbook
+        self.output_folder = output_folder
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+
+        self.raw_df = pd.read_excel(workbook)
+        self.processor = DataProcessor(str(workbook), current_datetime=DEFAULT_NOW)
+        self.validated_df = self.processor._validate_and_prepare_dataframe(self.raw_df)
+        self.processor.base_df = self.processor._add_calculated_columns(self.validated_df)
+        self.processor.create_diploma_df()
+        self.processor.create_homework_df()
+        self.processor.create_course_df()
+
+
+@stage('read')
+def bench_read(ctx: BenchContext) -> int:
+    """Чтение xlsx."""
+    return len(pd.read_excel(ctx.workbook))
+
+
+@stage('base_module')
+def bench_base_module(ctx: BenchContext) -> int:
+    """get_base_module по всем строкам."""
+    return len(ctx.raw_df['Модуль'].apply(get_base_module))
+
+
+@stage('enrich')
+def bench_enrich(ctx: BenchContext) -> int:
+    """Все вычисляемые колонки base_df."""
+    return len(ctx.processor._add_calculated_columns(ctx.validated_df))
+
+
+@stage('working_day_ages')
+def bench_working_day_ages(ctx: BenchContext) -> int:
+    """Рабочие дни на проверке."""
+    return len(ctx.processor._calculate_days_on_review_vectorized(ctx.processor.base_df, DEFAULT_NOW.date()))
+
+
+@stage('split')
+def bench_split(ctx: BenchContext) -> int:
+    """Разбиение на дипломы, ДЗ и курсовые."""
+    processor = ctx.processor
+    return sum(len(df) for df in (
+        processor.create_diploma_df(), processor.create_homework_df(), processor.create_course_df()
+    ))
+
+
+@stage('coordinator_lookup')
+def bench_coordinator_lookup(ctx: BenchContext) -> int:
+    """Имя координатора для каждой строки (как в отчетах по курсовым)."""
+    return len(ctx.raw_df['coord_id'].map(get_coordinator_name))
+
+
+@stage('write_xlsx')
+def bench_write_xlsx(ctx: BenchContext) -> int:
+    """Запись отчета по ДЗ в xlsx."""
+    return len(process_unverified_works(ctx.processor.homework_df, str(ctx.output_folder)))
+
+
+@stage('course_text_reports')
+def bench_course_text_reports(ctx: BenchContext) -> int:
+    """Текстовые отчеты по курсовым (без проверяющих, координаторы просроченных)."""
+    course_df = ctx.processor.course_df
+    processor = CourseWorksProcessor()
+    processor._create_no_reviewers_file(course_df, str(ctx.output_folder))
+    processor._create_overdue_coordinators_file(course_df, str(ctx.output_folder))
+    return len(course_df)
@@ -174,6 +174,18 @@ def load_json_file(file_path: str) -> Any:
         raise
 
 
+def normalize_key(value: Any) -> str:
+    """
+    Нормализует название блока/профессии для поиска по индексам.
+
+    Убирает пробелы и случайные запятые по краям (например, ',INFO-BTRX')
+    и приводит к нижнему регистру без учета локали ('FJD' и 'fjd' совпадают).
+    """
+    if value is None:
+        return ''
+    return str(value).strip().strip(',;').strip().casefold()
+
+
 def save_json_file(file_path: str, data: Any) -> None:
     """Сохраняет данные в JSON файл."""
     try:
@@ -191,6 +203,10 @@ class ConfigManager:
     def __init__(self, config_dir: str = 'config'):
         self.config_dir = config_dir
         self.config = {}
+        # Версия конфигурации: увеличивается при каждой загрузке и изменении
+        self.version = 0
+        self._lookup_indexes = None
+        self._lookup_indexes_version = None
         self.load_all()
 
     def load_all(self) -> Dict[str, Any]:
@@ -202,6 +218,8 @@ class ConfigManager:
         self.professions_path = os.path.join(self.config_dir, 'professions.yaml')
         self.module_path = os.path.join(self.config_dir, 'module.yaml')
         self.dates_path = os.path.join(self.config_dir, 'dates.json')
+        self.calendars_path = os.path.join(self.config_dir, 'calendars.yaml')
+        self.schedule_path = os.path.join(self.config_dir, 'schedule.yaml')
 
         # Загружаем координаторов
         coordinators_data = load_yaml_file(self.coordinators_path)
@@ -222,6 +240,18 @@ class ConfigManager:
         config['HOLIDAYS'] = [date.fromisoformat(d) for d in dates_data.get('holidays', [])]
         config['EXTRA_DAYS'] = [date.fromisoformat(d) for d in dates_data.get('extra_days', [])]
 
+        # Загружаем производственные календари (файл необязателен)
+        if os.path.exists(self.calendars_path):
+            config['CALENDARS'] = load_yaml_file(self.calendars_path) or {}
+        else:
+            config['CALENDARS'] = {}
+
+        # Загружаем расписание отчетов (файл необязателен)
+        if os.path.exists(self.schedule_path):
+            config['SCHEDULE'] = load_yaml_file(self.schedule_path) or {}
+        else:
+            config['SCHEDULE'] = {}
+
         # Генерируем дополнительные словари для удобства
         config['BLOCK_TO_PROFESSION'] = self._create_block_to_profession(config['PROFESSION_TO_BLOCKS'])
         config['LEAD_COORDINATOR_TO_BLOCKS'] = self._create_lead_coordinator_to_blocks(
@@ -239,8 +269,63 @@ class ConfigManager:
         config['COORDINATORS_OLD_FORMAT'] = self._convert_to_old_format(config['COORDINATORS'])
 
         self.config = config
+        self._bump_version()
         return config
 
+    def _bump_version(self):
+        """Отмечает изменение конфигурации (кэшированные индексы устаревают)."""
+        self.version += 1
+
+    def get_lookup_indexes(self) -> Dict[str, Dict[str, str]]:
+        """
+        Возвращает обратные индексы для поиска профессии и ведущего координатора.
+
+        Индексы строятся один раз для текущей версии конфигурации и
+        перестраиваются только после ее изменения. Ключи нормализованы
+        функцией normalize_key.
+
+        Returns:
+            Словарь с ключами BLOCK_TO_PROFESSION, BLOCK_TO_LEAD, PROFESSION_TO_LEAD.
+        """
+        if self._lookup_indexes is None or self._lookup_indexes_version != self.version:
+            self._lookup_indexes = self._build_lookup_indexes(
+                self.config['LEAD_COORDINATORS_TO_PROFESSION'],
+                self.config['PROFESSION_TO_BLOCKS']
+            )
+            self._lookup_indexes_version = self.version
+        return self._lookup_indexes
+
+    def _build_lookup_indexes(self, lead_to_profession: Dict, profession_to_blocks: Dict) -> Dict[str, Dict[str, str]]:
+        """Строит нормализованные индексы блок -> профессия -> ведущий координатор."""
+        profession_to_lead = {}
+        for lead, professions in (lead_to_profession or {}).items():
+            for profession in professions or []:
+                key = normalize_key(profession)
+                if key:
+                    profession_to_lead.setdefault(key, lead)
+
+        block_to_profession = {}
+        block_to_lead = {}
+        for profession, blocks in (profession_to_blocks or {}).items():
+            profession_key = normalize_key(profession)
+            for block in blocks or []:
+                block_key = normalize_key(block)
+                if not block_key:
+                    continue
+                # Как и в BLOCK_TO_PROFESSION, при повторе блока побеждает последняя профессия
+                block_to_profession[block_key] = profession_key
+                lead = profession_to_lead.get(profession_key)
+                if lead is not None:
+                    block_to_lead[block_key] = lead
+                else:
+                    block_to_lead.pop(block_key, None)
+
+        return {
+            'BLOCK_TO_PROFESSION': block_to_profession,
+            'BLOCK_TO_LEAD': block_to_lead,
+            'PROFESSION_TO_LEAD': profession_to_lead,
+        }
+
     def _extend_diploma_modules(self, config: Dict):
         """Дополняет дипломные модули."""
         extended = [
@@ -346,6 +431,7 @@ class ConfigManager:
     def add_coordinator(self, uid: int, name: str):
         """Добавляет нового координатора."""
         self.config['COORDINATORS'][str(uid)] = name
+        self._bump_version()
         self.save_coordinators()
 
     def remove_coordinator(self, uid: int):
@@ -353,6 +439,7 @@ class ConfigManager:
         uid_str = str(uid)
         if uid_str in self.config['COORDINATORS']:
             del self.config['COORDINATORS'][uid_str]
+            self._bump_version()
             self.save_coordinators()
         else:
             print(f"Координатор с UID {uid} не найден")
@@ -362,6 +449,7 @@ class ConfigManager:
         uid_str = str(uid)
         if uid_str in self.config['COORDINATORS']:
             self.config['COORDINATORS'][uid_str] = new_name
+            self._bump_version()
             self.save_coordinators()
         else:
             print(f"Координатор с UID {uid} не найден")
@@ -370,6 +458,7 @@ class ConfigManager:
         """Добавляет праздничный день."""
         if holiday_date not in self.config['HOLIDAYS']:
             self.config['HOLIDAYS'].append(holiday_date)
+            self._bump_version()
             self.save_dates()
         else:
             print(f"Дата {holiday_date} уже в списке праздников")
@@ -378,6 +467,7 @@ class ConfigManager:
         """Удаляет праздничный день."""
         if holiday_date in self.config['HOLIDAYS']:
             self.config['HOLIDAYS'].remove(holiday_date)
+            self._bump_version()
             self.save_dates()
         else:
             print(f"Дата {holiday_date} не найдена в списке праздников")
@@ -386,6 +476,7 @@ class ConfigManager:
         """Добавляет дипломный модуль."""
         if module not in self.config['DIPLOMA_MODULES']:
             self.config['DIPLOMA_MODULES'].append(module)
+            self._bump_version()
             self.save_modules()
         else:
             print(f"Модуль {module} уже в списке дипломных")
@@ -394,6 +485,7 @@ class ConfigManager:
         """Удаляет дипломный модуль."""
         if module in self.config['DIPLOMA_MODULES']:
             self.config['DIPLOMA_MODULES'].remove(module)
+            self._bump_version()
             self.save_modules()
         else:
             print(f"Модуль {module} не найден в списке дипломных")
@@ -8,6 +8,12 @@ REQUIRED_COLUMNS = [
     'Проверяющий', 'Возможные проверяющие', 'Дней на проверке', 'Тип задания', 'coord_id'
 ]
 
+# Колонки, добавляемые при обогащении base_df (не выгружаются в отчеты)
+ENRICHMENT_COLUMNS = [
+    'Профессия', 'Ведущий координатор', 'Время отправки', 'Тип срока',
+    'Рабочих часов на проверке', 'Часов до срока'
+]
+
 # Сроки проверки в рабочих днях
 REVIEW_DEADLINES = {
     'DIPLOMA': 7,
@@ -15,6 +21,41 @@ REVIEW_DEADLINES = {
     'COURSE_PROJECT': 5
 }
 
+# Рабочее окно для расчета SLA в рабочих часах
+WORKING_HOURS = {
+    'START': '09:00',
+    'END': '18:00'
+}
+
+# За сколько рабочих часов до срока работа считается близкой к просрочке
+SLA_WARNING_HOURS = 4
+
+# Горизонт прогноза просрочки в рабочих днях ("под риском завтра")
+FORECAST_HORIZON_DAYS = 1
+
+# Названия типов работ для отчетов
+DEADLINE_TYPE_NAMES = {
+    'DIPLOMA': 'Диплом',
+    'HOMEWORK': 'ДЗ',
+    'COURSE_PROJECT': 'Курсовая'
+}
+
+# Колонки, по которым строки выгрузки считаются одной работой (повторные отправки, дубли выгрузки)
+DUPLICATE_KEY_COLUMNS = ['ID студента', 'Модуль', 'Название задания', 'Ссылка на работу в админке']
+# Какую из повторных строк оставлять: 'latest' - последнюю по 'Отправлена', 'earliest' - первую;
+# None - не удалять повторы
+DUPLICATE_POLICIES = ('latest', 'earliest')
+DUPLICATE_POLICY = 'latest'
+
+# Интервалы возраста работ в рабочих днях для сводок: (название, нижняя граница)
+AGE_BUCKETS = [
+    ('0-1', 0),
+    ('2', 2),
+    ('3-4', 3),
+    ('5-6', 5),
+    ('7+', 7),
+]
+
 # Форматы дат
 DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%Y/%m/%d']
 
@@ -22,4 +63,24 @@ DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%Y/%m/%d']
 DEFAULT_INPUT_FILE = "original_files/Непроверенные_работы.xlsx"
 DEFAULT_OUTPUT_FOLDER = "result_files/"
 DEFAULT_input_FOLDER = "original_files/"
+CALENDAR_CACHE_FOLDER = "config/calendar_cache/"
+
+# Форматы табличных отчетов
+OUTPUT_FORMATS = ('xlsx', 'csv')
+DEFAULT_OUTPUT_FORMAT = 'xlsx'
+DEFAULT_ARCHIVE_FOLDER = "original_files/processed/"
+
+# GUI: наибольшее количество процессов для одновременной обработки нескольких выгрузок
+GUI_MAX_WORKERS = 4
+
+# Режим службы: опрос папки с выгрузками (секунды)
+WATCH_POLL_INTERVAL = 2
+WATCH_SETTLE_SECONDS = 5
+
+# Префикс метрик Prometheus (textfile для node_exporter)
+METRICS_PREFIX = "work_analysis"
+
+# Локальная служба запросов (только localhost)
+QUERY_SERVICE_HOST = "127.0.0.1"
+QUERY_SERVICE_PORT = 8765
 
@@ -132,6 +132,8 @@ DIPLOMA_MODULES = config['DIPLOMA_MODULES']
 SELF_ASSIGNMENT_MODULES = config['SELF_ASSIGNMENT_MODULES']
 holidays = config['HOLIDAYS']
 extra_days = config['EXTRA_DAYS']
+CALENDARS = config['CALENDARS']
+SCHEDULE = config['SCHEDULE']
 COORDINATORS = config['COORDINATORS_OLD_FORMAT']  # Старый формат для совместимости
 LEAD_COORDINATORS_TO_PROFESSION = config['LEAD_COORDINATORS_TO_PROFESSION']
 PROFESSION_TO_BLOCKS = config['PROFESSION_TO_BLOCKS']
@@ -142,4 +144,4 @@ LEAD_COORDINATOR_TO_BLOCKS = config['LEAD_COORDINATOR_TO_BLOCKS']
 COORDINATORS_DICT = config['COORDINATORS']  # Новый формат (словарь)
 
 # Экспортируем менеджер для редактирования
-CONFIG_MANAGER = config_managerNATORS_DICT = config['COORDINATORS']  # Новый формат (словарь)
\ No newline at end of file
+CONFIG_MANAGER = config_manager
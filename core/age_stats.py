@@ -0,0 +1,178 @@
+"""
+Статистика возраста работ для порогов сроков.
+
+По base_df один раз строится гистограмма 'Дней на проверке' для каждого
+типа срока (np.bincount по коду типа и возрасту) и накопленные суммы с
+конца. После этого "сколько работ с возрастом >= N / > N" для любого N -
+обращение к массиву, без фильтрации DataFrame. Так можно сравнивать
+строгую и нестрогую фильтрацию и подбирать сроки REVIEW_DEADLINES.
+
+aging_pivot() - сводка координатор (или ведущий координатор) x тип работы
+x интервал возраста AGE_BUCKETS с итогами: одна таблица сопряженности
+через np.bincount по кодам группы, типа и интервала.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import AGE_BUCKETS, DEADLINE_TYPE_NAMES, REVIEW_DEADLINES
+from core.get_coordinators import coordinator_names
+from core.reviewers import normalize_names
+
+# Разрезы сводки по возрасту: ключ -> (колонка группы, лист отчета)
+AGING_GROUPINGS = {
+    'coordinator': ('Координатор', 'Координаторы'),
+    'lead': ('Ведущий координатор', 'Ведущие координаторы'),
+}
+# Подпись строк без группы и строки итогов
+MISSING_GROUP_LABEL = 'Не указан'
+TOTAL_LABEL = 'Итого'
+
+
+def age_bucket_codes(days: np.ndarray) -> np.ndarray:
+    """Номер интервала AGE_BUCKETS для каждого возраста (пропуски - в первый интервал)."""
+    bounds = np.array([lower for _, lower in AGE_BUCKETS[1:]], dtype=float)
+    return np.searchsorted(bounds, np.nan_to_num(days, nan=0.0), side='right')
+
+
+class AgeStats:
+    """Накопленные гистограммы возраста работ по типам срока."""
+
+    def __init__(self, base_df: pd.DataFrame) -> None:
+        """
+        Args:
+            base_df: DataFrame с колонками 'Тип срока' и 'Дней на проверке'
+        """
+        self.labels = base_df.index
+        self.types: List[str] = list(REVIEW_DEADLINES)
+        type_codes = pd.Categorical(base_df['Тип срока'], categories=self.types).codes.astype(np.int64)
+        days = pd.to_numeric(base_df['Дней на проверке'], errors='coerce').to_numpy(dtype=float)
+
+        # Работы без типа срока или возраста в статистику не входят
+        valid = (type_codes >= 0) & ~np.isnan(days)
+        days = np.clip(days[valid], 0, None).astype(np.int64)
+        type_codes = type_codes[valid]
+        self.skipped = int((~valid).sum())
+        self.max_days = int(days.max()) if len(days) else 0
+
+        width = self.max_days + 1
+        self.histogram = np.bincount(
+            type_codes * width + days, minlength=len(self.types) * width
+        ).reshape(len(self.types), width)
+        # at_least[t, n] - работ типа t с возрастом >= n; последний столбец - нули для n > max_days
+        self.at_least = np.zeros((len(self.types), width + 1), dtype=np.int64)
+        self.at_least[:, :width] = np.cumsum(self.histogram[:, ::-1], axis=1)[:, ::-1]
+
+    def _row(self, deadline_type: str) -> np.ndarray:
+        if deadline_type not in self.types:
+            raise ValueError(f"Неизвестный тип срока: {deadline_type} (доступны {self.types})")
+        return self.at_least[self.types.index(deadline_type)]
+
+    def total(self, deadline_type: str) -> int:
+        """Все работы типа срока."""
+        return int(self._row(deadline_type)[0])
+
+    def count_at_least(self, deadline_type: str, days: int) -> int:
+        """Работы типа срока с возрастом >= days (нестрогая фильтрация)."""
+        row = self._row(deadline_type)
+        return int(row[min(max(int(days), 0), len(row) - 1)])
+
+    def count_above(self, deadline_type: str, days: int) -> int:
+        """Работы типа срока с возрастом > days (строгая фильтрация)."""
+        return self.count_at_least(deadline_type, int(days) + 1)
+
+    def count_overdue(self, deadline_type: str, days: Optional[int] = None, strict_filter: bool = False) -> int:
+        """Просроченные работы типа срока при сроке days (по умолчанию - из REVIEW_DEADLINES)."""
+        days = REVIEW_DEADLINES[deadline_type] if days is None else days
+        return self.count_above(deadline_type, days) if strict_filter else self.count_at_least(deadline_type, days)
+
+    def overdue_counts(
+            self,
+            deadlines: Optional[Dict[str, int]] = None,
+            strict_filter: bool = False
+    ) -> Dict[str, int]:
+        """Просроченные работы по всем типам срока при сроках REVIEW_DEADLINES с переопределением."""
+        deadlines = {**REVIEW_DEADLINES, **(deadlines or {})}
+        return {
+            deadline_type: self.count_overdue(deadline_type, deadlines[deadline_type], strict_filter)
+            for deadline_type in self.types
+        }
+
+    def distribution(self, deadline_type: str) -> Dict[int, int]:
+        """Количество работ типа срока по возрасту (только непустые значения)."""
+        self._row(deadline_type)  # Проверка типа срока
+        counts = self.histogram[self.types.index(deadline_type)]
+        return {int(days): int(counts[days]) for days in np.flatnonzero(counts)}
+
+    def sweep(self, thresholds: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Таблица "что если": работ с возрастом >= N и > N для каждого типа срока.
+
+        Args:
+            thresholds: Пороги N (по умолчанию 0..max_days)
+
+        Returns:
+            DataFrame с колонкой 'Порог, дней' и колонками '<тип> >= N', '<тип> > N'
+        """
+        thresholds = np.arange(self.max_days + 1) if thresholds is None else np.asarray(list(thresholds))
+        at_least = np.clip(thresholds, 0, self.max_days + 1)
+        above = np.clip(thresholds + 1, 0, self.max_days + 1)
+        table = {'Порог, дней': thresholds}
+        for number, deadline_type in enumerate(self.types):
+            name = DEADLINE_TYPE_NAMES.get(deadline_type, deadline_type)
+            table[f'{name} >= N'] = self.at_least[number, at_least]
+            table[f'{name} > N'] = self.at_least[number, above]
+        return pd.DataFrame(table)
+
+
+def aging_labels(base_df: pd.DataFrame, by: str) -> pd.Series:
+    """Значения группы AGING_GROUPINGS[by] для каждой строки."""
+    if by not in AGING_GROUPINGS:
+        raise ValueError(f"Неизвестный разрез: {by} (доступны {list(AGING_GROUPINGS)})")
+    column, _ = AGING_GROUPINGS[by]
+    if by == 'coordinator':
+        labels = coordinator_names(base_df['coord_id'])
+    else:
+        labels = base_df.get(column, pd.Series(pd.NA, index=base_df.index))
+    # Нормализация та же, что в отчете о нагрузке: один координатор - одна строка в обоих отчетах
+    return normalize_names(labels).fillna(MISSING_GROUP_LABEL)
+
+
+def aging_pivot(base_df: pd.DataFrame, by: str = 'coordinator') -> pd.DataFrame:
+    """
+    Сводка по возрасту работ: группа x тип работы x интервал AGE_BUCKETS.
+
+    Args:
+        base_df: DataFrame с колонками 'Тип срока', 'Дней на проверке' и колонкой группы
+        by: Разрез из AGING_GROUPINGS ('coordinator' или 'lead')
+
+    Returns:
+        DataFrame: колонка группы, '<тип> <интервал>' и '<тип> всего' для каждого
+        типа, 'Всего'; последняя строка - TOTAL_LABEL
+    """
+    labels = aging_labels(base_df, by)
+    column, _ = AGING_GROUPINGS[by]
+    group_codes, groups = pd.factorize(labels, sort=True)
+
+    types = list(REVIEW_DEADLINES)
+    type_codes = pd.Categorical(base_df['Тип срока'], categories=types).codes.astype(np.int64)
+    bucket_codes = age_bucket_codes(pd.to_numeric(base_df['Дней на проверке'], errors='coerce').to_numpy(dtype=float))
+    valid = type_codes >= 0
+
+    shape = (len(groups), len(types), len(AGE_BUCKETS))
+    flat = (group_codes.astype(np.int64) * shape[1] + type_codes) * shape[2] + bucket_codes
+    counts = np.bincount(flat[valid], minlength=int(np.prod(shape))).reshape(shape)
+
+    table = {column: list(groups)}
+    for number, deadline_type in enumerate(types):
+        name = DEADLINE_TYPE_NAMES.get(deadline_type, deadline_type)
+        for bucket, (label, _) in enumerate(AGE_BUCKETS):
+            table[f'{name} {label}'] = counts[:, number, bucket]
+        table[f'{name} всего'] = counts[:, number].sum(axis=1)
+    table['Всего'] = counts.sum(axis=(1, 2))
+
+    pivot = pd.DataFrame(table)
+    totals = pivot.drop(columns=column).sum()
+    pivot.loc[len(pivot)] = {column: TOTAL_LABEL, **totals.to_dict()}
+    return pivot
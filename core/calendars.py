@@ -0,0 +1,383 @@
+"""
+Именованные производственные календари.
+
+Базовый календарь строится по workalendar (страна/регион) и дополняется
+локальными праздниками и рабочими днями из dates.json. Каждый календарь
+компилируется в битовую карту рабочих дней на многолетний интервал и
+кэшируется на диске, поэтому при повторных запусках календари не
+пересобираются.
+"""
+import hashlib
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CALENDAR_CACHE_FOLDER
+from config.modules import CALENDARS, holidays, extra_days
+
+try:
+    from workalendar.registry import registry as workalendar_registry
+    import workalendar
+    WORKALENDAR_VERSION = getattr(workalendar, '__version__', 'unknown')
+except ImportError:  # pragma: no cover - workalendar указан в requirements.txt
+    workalendar_registry = None
+    WORKALENDAR_VERSION = None
+
+
+DEFAULT_CALENDAR = 'base'
+
+
+class CompiledCalendar:
+    """
+    Скомпилированный календарь: битовая карта рабочих дней и накопленные суммы.
+
+    Все векторные методы принимают массивы дат (datetime64[D], Series, списки)
+    и работают за O(1) на дату без циклов по дням.
+    """
+
+    def __init__(self, name: str, start: date, working: np.ndarray) -> None:
+        """
+        Args:
+            name: Название календаря
+            start: Первая дата интервала
+            working: Булев массив: True - рабочий день (по дням начиная со start)
+        """
+        self.name = name
+        self.start = start
+        self.end = start + timedelta(days=len(working) - 1)
+        self.working = np.asarray(working, dtype=bool)
+        self._epoch = np.datetime64(start, 'D')
+        # _cum[i] - количество рабочих дней в интервале [start, start + i)
+        self._cum = np.concatenate(([0], np.cumsum(self.working, dtype=np.int64)))
+        # Порядковые номера рабочих дней для поиска n-го рабочего дня
+        self._working_positions = np.flatnonzero(self.working)
+
+    def __repr__(self) -> str:
+        return f"CompiledCalendar({self.name!r}, {self.start}..{self.end})"
+
+    def covers(self, first: date, last: date) -> bool:
+        """Проверяет, что интервал [first, last] входит в календарь."""
+        return self.start <= first and last <= self.end
+
+    def _positions(self, dates: Any) -> np.ndarray:
+        """Переводит даты в индексы битовой карты."""
+        days = np.asarray(pd.to_datetime(pd.Series(dates)).values.astype('datetime64[D]'))
+        positions = (days - self._epoch).astype(np.int64)
+        if positions.size and (positions.min() < 0 or positions.max() >= len(self.working)):
+            raise ValueError(
+                f"Даты вне интервала календаря '{self.name}' ({self.start} - {self.end})"
+            )
+        return positions
+
+    def is_working_day(self, check_date: date) -> bool:
+        """Проверяет, является ли день рабочим."""
+        return bool(self.working[self._positions([check_date])[0]])
+
+    def working_mask(self, dates: Any) -> np.ndarray:
+        """Векторно проверяет, являются ли даты рабочими днями."""
+        return self.working[self._positions(dates)]
+
+    def working_days_before(self, dates: Any) -> np.ndarray:
+        """Количество рабочих дней календаря строго до каждой даты."""
+        return self._cum[self._positions(dates)]
+
+    def working_days_between(self, start_dates: Any, end_dates: Any) -> np.ndarray:
+        """
+        Векторный аналог WorkingDaysCalculator.calculate:
+        рабочие дни строго между датами (не включая start и end).
+
+        Args:
+            start_dates: Начальные даты
+            end_dates: Конечные даты (одна дата или массив той же длины)
+
+        Returns:
+            Массив количества рабочих дней (0, если end <= start + 1)
+        """
+        start = self._positions(start_dates)
+        if np.ndim(end_dates) == 0 or isinstance(end_dates, (date, pd.Timestamp)):
+            end = np.full_like(start, self._positions([end_dates])[0])
+        else:
+            end = self._positions(end_dates)
+        counts = self._cum[np.maximum(end, start + 1)] - self._cum[start + 1]
+        return counts.astype(np.int64)
+
+    def add_working_days(self, start_dates: Any, n: Any) -> np.ndarray:
+        """
+        Векторный аналог WorkingDaysCalculator.find_date_n_working_days_after:
+        n-й рабочий день после start (start не учитывается, при n == 0 - сама дата).
+
+        Args:
+            start_dates: Начальные даты
+            n: Количество рабочих дней (число или массив той же длины)
+
+        Returns:
+            Массив дат datetime64[D]
+        """
+        start = self._positions(start_dates)
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), start.shape)
+        if (n < 0).any():
+            raise ValueError("n не может быть отрицательным")
+
+        # Номер искомого рабочего дня среди всех рабочих дней календаря
+        target = self._cum[start + 1] + n - 1
+        if target.size and target.max() >= len(self._working_positions):
+            raise ValueError(f"Дата выходит за интервал календаря '{self.name}' ({self.end})")
+        result = np.where(n == 0, start, self._working_positions[np.maximum(target, 0)])
+        return self._epoch + result.astype('timedelta64[D]')
+
+
+class CalendarRegistry:
+    """
+    Реестр именованных календарей.
+
+    Календари компилируются лениво и хранятся в памяти; на диске лежит
+    упакованная битовая карта (np.packbits), ключом служит хэш определения.
+    """
+
+    def __init__(
+            self,
+            definitions: Optional[Dict[str, Any]] = None,
+            cache_folder: Optional[str] = CALENDAR_CACHE_FOLDER
+    ) -> None:
+        """
+        Args:
+            definitions: Содержимое calendars.yaml (по умолчанию из конфигурации)
+            cache_folder: Папка дискового кэша. None - без кэша на диске.
+        """
+        definitions = definitions if definitions is not None else CALENDARS
+        self.calendars: Dict[str, Dict[str, Any]] = definitions.get('calendars') or {
+            DEFAULT_CALENDAR: {'country': 'RU', 'use_local_dates': True}
+        }
+        self.default: str = definitions.get('default', DEFAULT_CALENDAR)
+        span = definitions.get('span_years') or {}
+        self.past_years: int = int(span.get('past', 3))
+        self.future_years: int = int(span.get('future', 2))
+        assignment = definitions.get('assignment') or {}
+        self.by_profession: Dict[str, str] = {
+            str(k).casefold(): v for k, v in (assignment.get('by_profession') or {}).items()
+        }
+        self.by_coordinator: Dict[str, str] = {
+            str(k): v for k, v in (assignment.get('by_coordinator') or {}).items()
+        }
+        self.cache_folder = Path(cache_folder) if cache_folder else None
+        self._compiled: Dict[str, CompiledCalendar] = {}
+
+        if self.default not in self.calendars:
+            raise ValueError(f"Календарь по умолчанию '{self.default}' не описан")
+
+    def get(self, name: Optional[str] = None, first: Optional[date] = None,
+            last: Optional[date] = None) -> CompiledCalendar:
+        """
+        Возвращает скомпилированный календарь, покрывающий интервал [first, last].
+
+        Args:
+            name: Название календаря (по умолчанию - календарь по умолчанию)
+            first: Самая ранняя нужная дата
+            last: Самая поздняя нужная дата
+        """
+        name = name or self.default
+        if name not in self.calendars:
+            raise KeyError(f"Неизвестный календарь: {name}")
+
+        span_start, span_end = self._default_span()
+        if first is not None:
+            span_start = min(span_start, date(first.year, 1, 1))
+        if last is not None:
+            span_end = max(span_end, date(last.year, 12, 31))
+
+        compiled = self._compiled.get(name)
+        if compiled is None or not compiled.covers(span_start, span_end):
+            if compiled is not None:
+                span_start = min(span_start, compiled.start)
+                span_end = max(span_end, compiled.end)
+            compiled = self._load_or_compile(name, span_start, span_end)
+            self._compiled[name] = compiled
+        return compiled
+
+    def calendar_names_for(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Выбирает календарь для каждой строки.
+
+        Приоритет: координатор (coord_id) -> профессия -> календарь по умолчанию.
+        """
+        names = pd.Series(self.default, index=df.index, dtype=object)
+        if self.by_profession and 'Профессия' in df.columns:
+            by_profession = df['Профессия'].map(
+                lambda p: self.by_profession.get(str(p).casefold()) if p else None
+            )
+            names = by_profession.where(by_profession.notna(), names)
+        if self.by_coordinator and 'coord_id' in df.columns:
+            by_coordinator = df['coord_id'].astype(str).map(self.by_coordinator)
+            names = by_coordinator.where(by_coordinator.notna(), names)
+        return names
+
+    def working_days_between(self, df: pd.DataFrame, start_dates: pd.Series, end_date: Any) -> np.ndarray:
+        """
+        Считает рабочие дни между датами, выбирая календарь для каждой строки.
+
+        Args:
+            df: DataFrame (для выбора календаря по строкам)
+            start_dates: Даты начала (без пропусков), выровненные по df
+            end_date: Конечная дата или массив дат, выровненный по df
+
+        Returns:
+            Массив рабочих дней
+        """
+        result = np.zeros(len(df), dtype=np.int64)
+        if not len(df):
+            return result
+
+        per_row_end = not (np.ndim(end_date) == 0 or isinstance(end_date, (date, pd.Timestamp)))
+        if per_row_end:
+            end_date = pd.to_datetime(pd.Series(end_date)).to_numpy()
+        names = self.calendar_names_for(df).to_numpy()
+        first, last = self._date_bounds(start_dates, end_date)
+        for name in pd.unique(names):
+            mask = names == name
+            calendar = self.get(name, first, last)
+            end = end_date[mask] if per_row_end else end_date
+            result[mask] = calendar.working_days_between(start_dates[mask], end)
+        return result
+
+    def add_working_days(self, df: pd.DataFrame, start_dates: pd.Series, n: pd.Series) -> np.ndarray:
+        """
+        Находит n-й рабочий день после даты для каждой строки.
+
+        Расчет выполняется по уникальным парам (календарь, дата, n), поэтому
+        его стоимость не зависит от количества строк с одинаковой датой.
+
+        Args:
+            df: DataFrame (для выбора календаря по строкам)
+            start_dates: Даты начала (без пропусков), выровненные по df
+            n: Количество рабочих дней (число или значение для каждой строки)
+
+        Returns:
+            Массив дат datetime64[D]
+        """
+        result = np.empty(len(df), dtype='datetime64[D]')
+        if not len(df):
+            return result
+
+        days = pd.to_datetime(pd.Series(start_dates)).to_numpy().astype('datetime64[D]')
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), (len(df),))
+        names = self.calendar_names_for(df).to_numpy()
+        first = days.min().astype(object)
+        # Запас на сроки, выходящие за последнюю дату
+        last = (days.max() + np.timedelta64(int(n.max()) * 3 + 30, 'D')).astype(object)
+
+        for name in pd.unique(names):
+            mask = names == name
+            calendar = self.get(name, first, last)
+            keys = days[mask].astype(np.int64) * 1024 + n[mask]
+            codes, unique_keys = pd.factorize(keys)
+            unique_days = (unique_keys // 1024).astype('datetime64[D]')
+            result[mask] = calendar.add_working_days(unique_days, unique_keys % 1024)[codes]
+        return result
+
+    def _default_span(self) -> Tuple[date, date]:
+        """Интервал компиляции по умолчанию (по годам от текущего)."""
+        year = date.today().year
+        return date(year - self.past_years, 1, 1), date(year + self.future_years, 12, 31)
+
+    @staticmethod
+    def _date_bounds(start_dates: pd.Series, end_date: Any) -> Tuple[date, date]:
+        """Границы дат, которые должен покрывать календарь."""
+        values = pd.to_datetime(pd.Series(start_dates))
+        ends = pd.to_datetime(pd.Series(np.atleast_1d(end_date)))
+        first = min(values.min(), ends.min()).date()
+        last = max(values.max(), ends.max()).date()
+        return first, last
+
+    def _definition_key(self, name: str, start: date, end: date) -> str:
+        """Хэш определения календаря для дискового кэша."""
+        definition = self.calendars[name]
+        payload = {
+            'name': name,
+            'definition': definition,
+            'local': self._local_overrides(definition),
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'workalendar': WORKALENDAR_VERSION,
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha1(raw).hexdigest()[:16]
+
+    @staticmethod
+    def _local_overrides(definition: Dict[str, Any]) -> Tuple[list, list]:
+        """Праздники и рабочие выходные календаря (dates.json + собственные)."""
+        calendar_holidays = [date.fromisoformat(str(d)) for d in definition.get('holidays') or []]
+        calendar_extra = [date.fromisoformat(str(d)) for d in definition.get('extra_days') or []]
+        if definition.get('use_local_dates'):
+            calendar_holidays = list(holidays) + calendar_holidays
+            calendar_extra = list(extra_days) + calendar_extra
+        return sorted(set(calendar_holidays)), sorted(set(calendar_extra))
+
+    def _load_or_compile(self, name: str, start: date, end: date) -> CompiledCalendar:
+        """Загружает календарь из дискового кэша или компилирует заново."""
+        key = self._definition_key(name, start, end)
+        cache_file = self.cache_folder / f"{name}_{key}.npz" if self.cache_folder else None
+        length = (end - start).days + 1
+
+        if cache_file is not None and cache_file.exists():
+            try:
+                with np.load(cache_file) as cached:
+                    working = np.unpackbits(cached['bits'], count=length).astype(bool)
+                return CompiledCalendar(name, start, working)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Кэш календаря поврежден, пересборка: {cache_file} ({e})")
+
+        working = self._compile(name, start, length)
+
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                np.savez_compressed(cache_file, bits=np.packbits(working))
+            except OSError as e:
+                print(f"Не удалось сохранить кэш календаря {cache_file}: {e}")
+
+        return CompiledCalendar(name, start, working)
+
+    def _compile(self, name: str, start: date, length: int) -> np.ndarray:
+        """Строит битовую карту рабочих дней календаря."""
+        definition = self.calendars[name]
+        days = [start + timedelta(days=i) for i in range(length)]
+
+        country = definition.get('country')
+        if country and workalendar_registry is not None:
+            calendar_class = workalendar_registry.get(country)
+            if calendar_class is None:
+                raise ValueError(f"Календарь workalendar не найден: {country}")
+            source = calendar_class()
+            working = np.fromiter((source.is_working_day(d) for d in days), dtype=bool, count=length)
+        else:
+            if country:
+                print(f"workalendar не установлен: календарь '{name}' строится без государственных праздников")
+            working = np.fromiter((d.weekday() < 5 for d in days), dtype=bool, count=length)
+
+        calendar_holidays, calendar_extra = self._local_overrides(definition)
+        self._apply_dates(working, start, calendar_holidays, False)
+        self._apply_dates(working, start, calendar_extra, True)
+        return working
+
+    @staticmethod
+    def _apply_dates(working: np.ndarray, start: date, dates: Iterable[date], value: bool) -> None:
+        """Отмечает даты в битовой карте (даты вне интервала пропускаются)."""
+        for d in dates:
+            position = (d - start).days
+            if 0 <= position < len(working):
+                working[position] = value
+
+
+_registry: Optional[CalendarRegistry] = None
+
+
+def get_calendar_registry() -> CalendarRegistry:
+    """Возвращает общий реестр календарей (создается один раз на процесс)."""
+    global _registry
+    if _registry is None:
+        _registry = CalendarRegistry()
+    return _registry
@@ -1,13 +1,24 @@
+import numpy as np
 import pandas as pd
-from datetime import date
+from datetime import date, datetime
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any
 
-from config.constants import REQUIRED_COLUMNS, DEFAULT_INPUT_FILE, REVIEW_DEADLINES
-from config.modules import DIPLOMA_MODULES, holidays, extra_days
-from core.working_days import WorkingDaysCalculator
+from config.constants import (
+    REQUIRED_COLUMNS, DEFAULT_INPUT_FILE, REVIEW_DEADLINES, ENRICHMENT_COLUMNS, SLA_WARNING_HOURS,
+    FORECAST_HORIZON_DAYS, DUPLICATE_KEY_COLUMNS, DUPLICATE_POLICIES, DUPLICATE_POLICY
+)
+from config.modules import DIPLOMA_MODULES
+from core.calendars import CalendarRegistry, get_calendar_registry
+from core.sla import SLAEngine
+from core.events import EVENTS, WARNING
+from core.get_coordinators import get_coordinator_name
+from core.progress import ProcessingCancelled, ProgressReporter
 
 from core.get_module import get_base_module
+from core.get_profession import add_profession_columns
+from core.reviewers import ReviewerIndex
+from core.age_stats import AgeStats, aging_pivot
 
 
 class DataProcessor:
@@ -19,50 +30,116 @@ class DataProcessor:
     для разных типов заданий.
     """
 
-    def __init__(self, input_file_path: Optional[str] = None) -> None:
+    def __init__(
+            self,
+            input_file_path: Optional[str] = None,
+            calendar_registry: Optional[CalendarRegistry] = None,
+            current_datetime: Optional[datetime] = None,
+            progress: Optional[ProgressReporter] = None,
+            duplicate_policy: Optional[str] = DUPLICATE_POLICY
+    ) -> None:
         """
         Инициализация процессора данных.
 
         Args:
             input_file_path: Путь к входному файлу Excel. Если не указан,
                            используется путь из констант.
+            calendar_registry: Реестр производственных календарей. Если не указан,
+                           используется общий реестр процесса.
+            current_datetime: Момент, на который считаются сроки. Если не указан,
+                           берется время создания base_df.
+            progress: Ход обработки и флаг отмены (для GUI).
+            duplicate_policy: Какую из повторных строк оставлять ('latest', 'earliest'),
+                           None - не удалять повторы.
+
+        Raises:
+            ValueError: Если duplicate_policy не из DUPLICATE_POLICIES.
         """
+        if duplicate_policy is not None and duplicate_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Неизвестная политика повторов: {duplicate_policy} (доступны {DUPLICATE_POLICIES})")
+        self.duplicate_policy = duplicate_policy
         self.input_file_path: Path = Path(input_file_path or f"../{DEFAULT_INPUT_FILE}")
         self.base_df: Optional[pd.DataFrame] = None
+        self.prepared_df: Optional[pd.DataFrame] = None  # base_df без колонок, зависящих от даты
         self.diploma_df: Optional[pd.DataFrame] = None
         self.homework_df: Optional[pd.DataFrame] = None
         self.course_df: Optional[pd.DataFrame] = None
+        self.forecast_df: Optional[pd.DataFrame] = None
+        self.duplicates_df: Optional[pd.DataFrame] = None  # Удаленные повторные строки
+        self._reviewer_index: Optional[ReviewerIndex] = None
+        self._age_stats: Optional[AgeStats] = None
+        self._aging_pivots: Dict[str, pd.DataFrame] = {}  # Разрез -> сводка по возрасту для base_df
+        self._aging_source: Optional[pd.Index] = None
+        self.current_datetime: Optional[datetime] = current_datetime
         self._processed: bool = False  # Флаг для отслеживания обработки
+        self.progress: ProgressReporter = progress or ProgressReporter()
 
-        self._initialize_working_days_calculator()
-
-    def _initialize_working_days_calculator(self) -> None:
-        """Инициализирует калькулятор рабочих дней."""
-        self.calculator = WorkingDaysCalculator()
-        for holiday in holidays:
-            self.calculator.add_holiday(holiday)
-        for day in extra_days:
-            self.calculator.add_extra_working_day(day)
+        self.calendars: CalendarRegistry = calendar_registry or get_calendar_registry()
+        self.sla = SLAEngine(self.calendars)
 
     def create_base_df(self) -> Optional[pd.DataFrame]:
         """
         Создает базовый DataFrame из входного файла.
 
+        Колонки, не зависящие от момента расчета, берутся из prepared_df
+        (если он еще не построен - из prepare_df), затем удаляются повторы
+        и считаются колонки на current_datetime.
+
         Returns:
             Базовый DataFrame или None в случае ошибки.
-
-        Raises:
-            FileNotFoundError: Если файл не найден.
-            Exception: При других ошибках обработки.
         """
+        if self.prepared_df is None and self.prepare_df() is None:
+            return None
+
         try:
-            df_base = self._load_dataframe()
-            df_base = self._validate_and_prepare_dataframe(df_base)
-            df_base = self._add_calculated_columns(df_base)
+            now = self.current_datetime or datetime.now()
+            self.current_datetime = now
+            df_base = self._drop_duplicates_staged(self.prepared_df)
+            with EVENTS.stage('as_of') as stage:
+                df_base = self._add_as_of_columns(df_base, now)
+                stage.rows = len(df_base)
 
             self.base_df = df_base
             return df_base
 
+        except ProcessingCancelled:
+            raise
+        except Exception as e:
+            print(f"Неожиданная ошибка: {type(e).__name__}: {e}")
+            return None
+
+    def prepare_df(self) -> Optional[pd.DataFrame]:
+        """
+        Читает выгрузку и строит prepared_df - колонки, не зависящие от момента расчета.
+
+        base_df не создается: его строят create_base_df (на current_datetime)
+        или as_of (на любой момент), поэтому для прошлых дат сроки
+        на текущий момент не считаются. Повторы в prepared_df остаются:
+        они удаляются для каждого момента после отбора отправленных до него работ.
+
+        Returns:
+            prepared_df или None в случае ошибки.
+        """
+        try:
+            # Чтение файла - самый долгий этап, поэтому ему отведена большая часть хода
+            self.progress.update("Чтение файла", 0.0)
+            with EVENTS.stage('load') as stage:
+                df_base = self._load_dataframe()
+                stage.rows = len(df_base)
+            self.progress.update("Проверка колонок", 0.7)
+            with EVENTS.stage('validate') as stage:
+                df_base = self._validate_and_prepare_dataframe(df_base)
+                stage.rows = len(df_base)
+            self.progress.update("Расчет сроков", 0.75)
+            with EVENTS.stage('enrich') as stage:
+                self.prepared_df = self._add_static_columns(df_base)
+                stage.rows = len(self.prepared_df)
+            if EVENTS.has_subscribers:
+                self._emit_data_warnings(self.prepared_df)
+            return self.prepared_df
+
+        except ProcessingCancelled:
+            raise
         except FileNotFoundError:
             print(f"Файл не найден: {self.input_file_path}")
             return None
@@ -70,6 +147,27 @@ class DataProcessor:
             print(f"Неожиданная ошибка: {type(e).__name__}: {e}")
             return None
 
+    def _emit_data_warnings(self, df: pd.DataFrame) -> None:
+        """
+        Отправляет предупреждения о данных, которых нет в конфигурации
+        (проверяются только уникальные значения).
+
+        Args:
+            df: Обогащенный DataFrame.
+        """
+        unknown_coordinators = sorted(
+            str(coord_id) for coord_id in df['coord_id'].dropna().unique()
+            if get_coordinator_name(coord_id) == str(coord_id)
+        )
+        if unknown_coordinators:
+            EVENTS.emit(WARNING, 'unknown_coordinators', values=unknown_coordinators,
+                        message=f"Неизвестные координаторы: {len(unknown_coordinators)}")
+
+        without_profession = df.loc[df['Профессия'].isna(), 'Базовый_модуль'].dropna().unique()
+        if len(without_profession):
+            EVENTS.emit(WARNING, 'modules_without_profession', values=sorted(map(str, without_profession)),
+                        message=f"Модули без профессии: {len(without_profession)}")
+
     def _load_dataframe(self) -> pd.DataFrame:
         """
         Загружает DataFrame из Excel файла.
@@ -107,6 +205,60 @@ class DataProcessor:
 
         return df[REQUIRED_COLUMNS].copy()
 
+    def _drop_duplicates_staged(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Удаляет повторы этапом 'dedup' (без изменений, если duplicate_policy - None)."""
+        if self.duplicate_policy is None:
+            return df
+        with EVENTS.stage('dedup', len(df)) as stage:
+            df = self._drop_duplicates(df)
+            stage.rows = len(df)
+        return df
+
+    def _drop_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Удаляет повторные строки одной работы (DUPLICATE_KEY_COLUMNS) по политике duplicate_policy.
+
+        Ключ строки - 64-битный хеш колонок ключа (pd.util.hash_pandas_object),
+        группы - pd.factorize по хешам; выбор строки в группе - groupby по кодам.
+        Все шаги линейные, без сортировки. Удаленные строки сохраняются
+        в duplicates_df с колонкой 'Оставлена отправка'.
+
+        Args:
+            df: prepared_df (или его часть до момента расчета).
+
+        Returns:
+            DataFrame без повторов (порядок строк сохраняется).
+        """
+        hashes = pd.util.hash_pandas_object(df[DUPLICATE_KEY_COLUMNS], index=False).to_numpy()
+        codes, uniques = pd.factorize(hashes)
+        if len(uniques) == len(df):
+            self.duplicates_df = df.iloc[:0][REQUIRED_COLUMNS].copy()
+            return df
+
+        # Пустая дата не выбирается, пока в группе есть строка с датой
+        submitted = df['Время отправки'].reset_index(drop=True)
+        if self.duplicate_policy == 'latest':
+            best = submitted.groupby(codes).transform('max')
+        else:
+            best = submitted.groupby(codes).transform('min')
+        candidates = (submitted == best) | best.isna()
+        # Среди равных по дате остается первая строка группы
+        keep = candidates.to_numpy() & ~pd.Series(np.where(candidates, codes, -1)).duplicated().to_numpy()
+
+        kept_positions = np.empty(len(uniques), dtype=np.int64)
+        kept_positions[codes[keep]] = np.flatnonzero(keep)
+        # В отчет о повторах - колонки выгрузки с полным временем отправки
+        duplicates = df.loc[~keep, REQUIRED_COLUMNS].copy()
+        duplicates['Отправлена'] = submitted.to_numpy()[~keep]
+        duplicates['Оставлена отправка'] = submitted.to_numpy()[kept_positions[codes[~keep]]]
+        self.duplicates_df = duplicates
+
+        works = len(pd.unique(codes[~keep]))
+        print(f"Удалено повторных строк: {len(duplicates)} (работ с повторами: {works})")
+        EVENTS.emit(WARNING, 'duplicates', rows=len(duplicates), works=works, policy=self.duplicate_policy,
+                    message=f"Удалено повторных строк: {len(duplicates)} (работ с повторами: {works})")
+        return df[keep]
+
     def _get_missing_columns(self, df: pd.DataFrame) -> List[str]:
         """
         Возвращает список отсутствующих обязательных колонок.
@@ -129,36 +281,162 @@ class DataProcessor:
         Returns:
             DataFrame с добавленными колонки.
         """
+        self.prepared_df = self._add_static_columns(df)
+
+        now = self.current_datetime or datetime.now()
+        self.current_datetime = now
+        return self._add_as_of_columns(self.prepared_df, now)
+
+    def _add_static_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Добавляет колонки, не зависящие от момента расчета
+        (модуль, профессия, тип и срок проверки).
+
+        Args:
+            df: Исходный DataFrame.
+
+        Returns:
+            DataFrame с добавленными колонками.
+        """
         df = df.copy()
 
         # Добавление базового модуля
         df['Базовый_модуль'] = df['Модуль'].apply(get_base_module)
 
-        # Преобразование даты
-        df['Отправлена'] = pd.to_datetime(df['Отправлена']).dt.date
+        # Профессия и ведущий координатор по базовому модулю
+        df = add_profession_columns(df)
 
-        # Расчет дней на проверке
-        today = date.today()
-        df['Дней на проверке'] = df['Отправлена'].apply(
-            lambda x: self._calculate_days_on_review(x, today)
-        )
+        # Преобразование даты (время отправки сохраняется для расчета SLA)
+        submitted = pd.to_datetime(df['Отправлена'])
+        df['Время отправки'] = submitted
+        df['Отправлена'] = submitted.dt.date
+
+        # Срок проверки
+        df['Тип срока'] = self._get_deadline_types(df)
+        df.insert(df.columns.get_loc('Отправлена') + 1, 'Срок проверки', self._calculate_due_dates(df))
 
         return df
 
-    def _calculate_days_on_review(self, submission_date: date, current_date: date) -> int:
+    def _add_as_of_columns(self, df: pd.DataFrame, now: datetime) -> pd.DataFrame:
+        """
+        Добавляет колонки, зависящие от момента расчета: дни на проверке и SLA.
+
+        Args:
+            df: DataFrame после _add_static_columns.
+            now: Момент, на который считаются сроки.
+
+        Returns:
+            Новый DataFrame с добавленными колонками.
+        """
+        df = df.copy()
+        df['Дней на проверке'] = self._calculate_days_on_review_vectorized(df, now.date())
+        return self.sla.add_sla_columns(df, now)
+
+    def as_of(self, moment: datetime) -> 'DataProcessor':
+        """
+        Пересчитывает данные на другой момент без повторного чтения выгрузки.
+
+        Работы, отправленные после moment, исключаются. Выгрузка содержит
+        только работы, не проверенные на момент ее создания, поэтому для
+        прошлых дат работы, проверенные позже moment, в отчет не попадут.
+
+        Args:
+            moment: Момент, на который считаются сроки.
+
+        Returns:
+            Новый DataProcessor с заполненными base_df, diploma_df, homework_df и course_df.
+        """
+        if self.prepared_df is None and self.prepare_df() is None:
+            raise ValueError(f"Не удалось подготовить данные из {self.input_file_path}")
+
+        prepared = self.prepared_df
+        sent_before = ~(prepared['Время отправки'] > pd.Timestamp(moment)).to_numpy()
+
+        processor = DataProcessor(
+            str(self.input_file_path),
+            calendar_registry=self.calendars,
+            current_datetime=moment,
+            progress=self.progress,
+            duplicate_policy=self.duplicate_policy
+        )
+        processor.prepared_df = prepared
+        # Повторы удаляются после отбора: работа, отправленная повторно после moment,
+        # на момент moment еще представлена прежней отправкой
+        base_df = processor._drop_duplicates_staged(prepared[sent_before])
+        with EVENTS.stage('as_of') as stage:
+            processor.base_df = processor._add_as_of_columns(base_df, moment)
+            stage.rows = len(processor.base_df)
+        with EVENTS.stage('split'):
+            processor.create_diploma_df()
+            processor.create_homework_df()
+            processor.create_course_df()
+        processor._processed = True
+        return processor
+
+    def _calculate_due_dates(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Вычисляет срок проверки: n-й рабочий день после отправки,
+        где n берется из REVIEW_DEADLINES по типу срока.
+
+        Args:
+            df: DataFrame с колонками 'Отправлена' и 'Тип срока'.
+
+        Returns:
+            Series с датами срока (None, если дата отправки или тип срока не заданы).
+        """
+        due_dates = pd.Series(None, index=df.index, dtype=object)
+        deadlines = df['Тип срока'].map(REVIEW_DEADLINES)
+        valid = (df['Отправлена'].notna() & deadlines.notna()).to_numpy()
+        if valid.any():
+            due = self.calendars.add_working_days(
+                df[valid], df['Отправлена'][valid], deadlines[valid].astype(int)
+            )
+            due_dates[valid] = pd.Series(due).dt.date.to_numpy()
+        return due_dates
+
+    def _get_deadline_types(self, df: pd.DataFrame) -> pd.Series:
         """
-        Вычисляет количество дней на проверке.
+        Определяет ключ REVIEW_DEADLINES для каждой строки.
 
         Args:
-            submission_date: Дата отправки задания.
+            df: DataFrame с колонками 'Тип задания' и 'Базовый_модуль'.
+
+        Returns:
+            Series со значениями DIPLOMA, HOMEWORK, COURSE_PROJECT или None.
+        """
+        task_type = df['Тип задания']
+        module_names_lower = [module.lower() for module in DIPLOMA_MODULES]
+        is_diploma_module = df['Базовый_модуль'].str.lower().isin(module_names_lower)
+
+        types = np.select(
+            [
+                task_type == 'ДЗ',
+                (task_type == 'Диплом') & is_diploma_module,
+                task_type == 'Диплом',
+            ],
+            ['HOMEWORK', 'DIPLOMA', 'COURSE_PROJECT'],
+            default=''
+        )
+        return pd.Series(types, index=df.index, dtype=object).replace('', None)
+
+    def _calculate_days_on_review_vectorized(self, df: pd.DataFrame, current_date: date) -> np.ndarray:
+        """
+        Вычисляет количество рабочих дней на проверке для всех строк сразу.
+
+        Args:
+            df: DataFrame с колонкой 'Отправлена'.
             current_date: Текущая дата.
 
         Returns:
-            Количество рабочих дней на проверке.
+            Массив рабочих дней на проверке (0 для пустых дат).
         """
-        if pd.isna(submission_date):
-            return 0
-        return self.calculator.calculate(submission_date, current_date)
+        days = np.zeros(len(df), dtype=np.int64)
+        valid = df['Отправлена'].notna().to_numpy()
+        if valid.any():
+            days[valid] = self.calendars.working_days_between(
+                df[valid], df['Отправлена'][valid], current_date
+            )
+        return days
 
     def create_diploma_df(self) -> Optional[pd.DataFrame]:
         """
@@ -181,19 +459,21 @@ class DataProcessor:
         if 'Тип задания' in diploma_df.columns:
             diploma_df = diploma_df[diploma_df['Тип задания'] == 'Диплом']
 
-        columns_to_drop = ['Базовый_модуль', 'Тип задания', 'coord_id']
+        columns_to_drop = ['Базовый_модуль', 'Тип задания', 'coord_id'] + ENRICHMENT_COLUMNS
         diploma_df = self._drop_columns(diploma_df, columns_to_drop)
 
         print(f"Количество строк в дипломном DF: {len(diploma_df)}")
         self.diploma_df = diploma_df
         return diploma_df
 
-    def create_homework_df(self, strict_filter: bool = False) -> Optional[pd.DataFrame]:
+    def create_homework_df(self, strict_filter: bool = False,
+                           min_days: Optional[int] = None) -> Optional[pd.DataFrame]:
         """
         Создает DataFrame для домашних заданий.
 
         Args:
             strict_filter: Если True - использовать >2 дней, если False - >=2 дней
+            min_days: Срок в рабочих днях (по умолчанию REVIEW_DEADLINES['HOMEWORK'])
 
         Returns:
             DataFrame с домашними заданиями или None в случае ошибки.
@@ -207,7 +487,8 @@ class DataProcessor:
         # print(f"После исключения дипломных модулей: {len(homework_df)} записей")
 
         # Фильтрация по количеству дней на проверке
-        min_days = REVIEW_DEADLINES['HOMEWORK']
+        if min_days is None:
+            min_days = REVIEW_DEADLINES['HOMEWORK']
 
         if strict_filter:
             # Строгая фильтрация: >2 дней
@@ -220,7 +501,7 @@ class DataProcessor:
 
         # print(f"После фильтрации по дням ({filter_text}): {len(homework_df)} записей")
 
-        columns_to_drop = ['Базовый_модуль', 'Тип задания']
+        columns_to_drop = ['Базовый_модуль', 'Тип задания'] + ENRICHMENT_COLUMNS
         homework_df = self._drop_columns(homework_df, columns_to_drop)
 
         # print(f"Итоговое количество строк в ДЗ DF: {len(homework_df)}")
@@ -255,30 +536,149 @@ class DataProcessor:
         self.course_df = course_df
         return course_df
 
-    def check_homework_stats(self):
-        """Проверка статистики по домашним заданиям БЕЗ фильтрации по дипломным модулям"""
-        if self.base_df is None:
-            print("Сначала создайте base_df")
-            return
+    def get_reviewer_index(self) -> Optional[ReviewerIndex]:
+        """
+        Индекс возможных проверяющих по base_df (строится один раз на base_df).
 
-        # Только фильтрация по типу задания, без исключения дипломных модулей
-        homework_df = self.base_df[self.base_df['Тип задания'] == 'ДЗ'].copy()
-        total_homeworks = len(homework_df)
-        # print(f"Всего записей с типом 'ДЗ' в base_df: {total_homeworks}")
+        Returns:
+            ReviewerIndex или None, если base_df не создан.
+        """
+        if not self._validate_base_df():
+            return None
+        if self._reviewer_index is None or self._reviewer_index.labels is not self.base_df.index:
+            with EVENTS.stage('reviewer_index', len(self.base_df)):
+                self._reviewer_index = ReviewerIndex(self.base_df)
+        return self._reviewer_index
+
+    def get_age_stats(self) -> Optional[AgeStats]:
+        """
+        Накопленные гистограммы возраста работ по типам срока (строятся один раз на base_df).
+
+        Returns:
+            AgeStats или None, если base_df не создан.
+        """
+        if not self._validate_base_df():
+            return None
+        if self._age_stats is None or self._age_stats.labels is not self.base_df.index:
+            with EVENTS.stage('age_stats', len(self.base_df)):
+                self._age_stats = AgeStats(self.base_df)
+        return self._age_stats
+
+    def get_aging_pivot(self, by: str = 'coordinator') -> Optional[pd.DataFrame]:
+        """
+        Сводка по возрасту работ (группа x тип работы x интервал AGE_BUCKETS), один раз на base_df.
+
+        Args:
+            by: Разрез из AGING_GROUPINGS ('coordinator' или 'lead')
+
+        Returns:
+            DataFrame из aging_pivot или None, если base_df не создан.
+        """
+        if not self._validate_base_df():
+            return None
+        if self._aging_source is not self.base_df.index:
+            self._aging_pivots = {}
+            self._aging_source = self.base_df.index
+        if by not in self._aging_pivots:
+            with EVENTS.stage(f'aging_pivot.{by}', len(self.base_df)):
+                self._aging_pivots[by] = aging_pivot(self.base_df, by)
+        return self._aging_pivots[by]
+
+    def check_homework_stats(self, min_days: Optional[int] = None) -> Optional[Dict[str, int]]:
+        """
+        Статистика по домашним заданиям БЕЗ фильтрации по дипломным модулям:
+        распределение дней на проверке и сравнение строгой и нестрогой фильтрации.
+
+        Args:
+            min_days: Срок в рабочих днях (по умолчанию REVIEW_DEADLINES['HOMEWORK'])
 
-        # Проверим распределение дней на проверке
-        days_distribution = homework_df['Дней на проверке'].value_counts().sort_index()
-        # print("Распределение дней на проверке (все ДЗ):")
-        for days, count in days_distribution.items():
+        Returns:
+            {'total', 'strict', 'non_strict'} или None, если base_df не создан.
+        """
+        stats = self.get_age_stats()
+        if stats is None:
+            print("Сначала создайте base_df")
+            return None
+
+        if min_days is None:
+            min_days = REVIEW_DEADLINES['HOMEWORK']
+        for days, count in stats.distribution('HOMEWORK').items():
             print(f"  {days} дней: {count} записей")
 
-        # Проверим сколько будет при >2 дней (строго больше)
-        strict_filter = len(homework_df[homework_df['Дней на проверке'] > 2])
-        # print(f"ДЗ с >2 дней на проверке: {strict_filter} записей")
+        return {
+            'total': stats.total('HOMEWORK'),
+            'strict': stats.count_above('HOMEWORK', min_days),
+            'non_strict': stats.count_at_least('HOMEWORK', min_days),
+        }
+
+    def create_forecast_df(
+            self,
+            horizon_days: int = FORECAST_HORIZON_DAYS,
+            strict_filter: bool = False,
+            deadlines: Optional[Dict[str, int]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Создает прогноз: работы, которые еще не просрочены, но станут просроченными
+        через horizon_days рабочих дней.
+
+        Просрочка определяется так же, как в отчетах: 'Дней на проверке' >= срока
+        (или > срока при strict_filter) по REVIEW_DEADLINES для типа работы.
+
+        Args:
+            horizon_days: Горизонт прогноза в рабочих днях (1 - следующий рабочий день).
+            strict_filter: Если True - использовать >срока, если False - >=срока.
+            deadlines: Переопределение сроков REVIEW_DEADLINES.
+
+        Returns:
+            DataFrame с работами под риском или None в случае ошибки.
+        """
+        if not self._validate_base_df():
+            return None
+
+        df = self.base_df
+        deadlines = df['Тип срока'].map({**REVIEW_DEADLINES, **(deadlines or {})})
+        valid = (df['Отправлена'].notna() & deadlines.notna()).to_numpy()
+        candidates = df[valid]
+        deadlines = deadlines[valid].astype(int).to_numpy()
+
+        # Дата прогноза - horizon_days-й рабочий день после сегодняшнего по календарю строки
+        today = self.current_datetime.date()
+        today_column = pd.Series([today] * len(candidates), index=candidates.index)
+        horizon_dates = self.calendars.add_working_days(candidates, today_column, horizon_days)
+        days_at_horizon = self.calendars.working_days_between(
+            candidates, candidates['Отправлена'], horizon_dates
+        )
+        days_today = candidates['Дней на проверке'].to_numpy()
+
+        if strict_filter:
+            overdue_today = days_today > deadlines
+            overdue_at_horizon = days_at_horizon > deadlines
+        else:
+            overdue_today = days_today >= deadlines
+            overdue_at_horizon = days_at_horizon >= deadlines
+
+        forecast_df = candidates[~overdue_today & overdue_at_horizon].copy()
+        forecast_df = forecast_df.sort_values(['Срок проверки', 'Отправлена'])
+
+        print(f"Работ под риском просрочки ({horizon_days} раб. дн.): {len(forecast_df)}")
+        self.forecast_df = forecast_df
+        return forecast_df
+
+    def create_near_breach_df(self, hours: float = SLA_WARNING_HOURS) -> Optional[pd.DataFrame]:
+        """
+        Возвращает работы, которым до срока проверки осталось не больше hours рабочих часов.
+
+        Args:
+            hours: Порог в рабочих часах.
+
+        Returns:
+            DataFrame, отсортированный по остатку времени, или None, если base_df не создан.
+        """
+        if not self._validate_base_df():
+            return None
 
-        # И сколько при >=2 дней (текущая логика)
-        current_filter = len(homework_df[homework_df['Дней на проверке'] >= 2])
-        # print(f"ДЗ с >=2 дней на проверке: {current_filter} записей")
+        near_breach_df = self.base_df[SLAEngine.near_breach_mask(self.base_df, hours)]
+        return near_breach_df.sort_values('Часов до срока').copy()
 
     def _validate_base_df(self) -> bool:
         """
@@ -352,9 +752,11 @@ class DataProcessor:
             return self.base_df, self.diploma_df, self.homework_df, self.course_df
 
         self.create_base_df()
-        self.create_diploma_df()
-        self.create_homework_df(strict_filter=homework_strict_filter)
-        self.create_course_df()
+        self.progress.update("Разбиение по типам работ", 0.95)
+        with EVENTS.stage('split'):
+            self.create_diploma_df()
+            self.create_homework_df(strict_filter=homework_strict_filter)
+            self.create_course_df()
 
         self._processed = True
 
@@ -0,0 +1,207 @@
+"""
+События обработки.
+
+Обработчики подписываются на EVENTS и получают события:
+- stage_started / stage_finished - начало и конец этапа (время, строки);
+- rows_processed - количество строк после этапа;
+- report_written - сохранен файл отчета (путь, строки);
+- warning - предупреждение (например, неизвестные координаторы).
+
+Если подписчиков нет, emit() сразу возвращается. События отправляются
+на уровне этапов и файлов, а не строк. Подписчик с batch_size получает
+списки событий: по batch_size штук или при flush().
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.instrumentation import span
+
+STAGE_STARTED = 'stage_started'
+STAGE_FINISHED = 'stage_finished'
+ROWS_PROCESSED = 'rows_processed'
+REPORT_WRITTEN = 'report_written'
+WARNING = 'warning'
+EVENT_KINDS = (STAGE_STARTED, STAGE_FINISHED, ROWS_PROCESSED, REPORT_WRITTEN, WARNING)
+
+
+class Event:
+    """Событие обработки."""
+
+    __slots__ = ('kind', 'name', 'data', 'timestamp')
+
+    def __init__(self, kind: str, name: str, data: Dict[str, Any]) -> None:
+        self.kind = kind
+        self.name = name
+        self.data = data
+        self.timestamp = time.time()
+
+    def __repr__(self) -> str:
+        return f"Event({self.kind!r}, {self.name!r}, {self.data!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Событие в виде словаря (для JSON и логов)."""
+        return {'kind': self.kind, 'name': self.name, 'timestamp': self.timestamp, **self.data}
+
+
+class _Subscription:
+    """Подписка: обработчик, фильтр событий и буфер для пакетной доставки."""
+
+    __slots__ = ('handler', 'kinds', 'batch_size', 'buffer')
+
+    def __init__(self, handler: Callable, kinds: Optional[Iterable[str]], batch_size: Optional[int]) -> None:
+        self.handler = handler
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.batch_size = batch_size
+        self.buffer: List[Event] = []
+
+
+class EventBus:
+    """Рассылает события подписчикам."""
+
+    def __init__(self) -> None:
+        self._subscriptions: List[_Subscription] = []
+        # Подписки по видам событий пересчитываются при подписке/отписке, а не при emit
+        self._by_kind: Dict[str, List[_Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(
+            self,
+            handler: Callable,
+            kinds: Optional[Iterable[str]] = None,
+            batch_size: Optional[int] = None
+    ) -> Callable:
+        """
+        Подписывает обработчик.
+
+        Args:
+            handler: Функция (Event) или, при batch_size, функция (List[Event])
+            kinds: Виды событий (по умолчанию - все)
+            batch_size: Доставлять события пакетами по batch_size (остаток - при flush())
+
+        Returns:
+            handler (для отписки через unsubscribe)
+        """
+        unknown = set(kinds or ()) - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Неизвестные виды событий: {sorted(unknown)}")
+        with self._lock:
+            self._subscriptions.append(_Subscription(handler, kinds, batch_size))
+            self._rebuild()
+        return handler
+
+    def unsubscribe(self, handler: Callable) -> None:
+        """Отписывает обработчик (накопленные для него события доставляются)."""
+        self.flush(handler)
+        with self._lock:
+            self._subscriptions = [sub for sub in self._subscriptions if sub.handler is not handler]
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._by_kind = {
+            kind: [sub for sub in self._subscriptions if sub.kinds is None or kind in sub.kinds]
+            for kind in EVENT_KINDS
+        }
+
+    def emit(self, kind: str, name: str = '', **data: Any) -> None:
+        """Отправляет событие подписчикам."""
+        subscriptions = self._by_kind.get(kind)
+        if not subscriptions:
+            return
+        event = Event(kind, name, data)
+        for sub in subscriptions:
+            if sub.batch_size is None:
+                sub.handler(event)
+                continue
+            with self._lock:
+                sub.buffer.append(event)
+                batch = None
+                if len(sub.buffer) >= sub.batch_size:
+                    batch, sub.buffer = sub.buffer, []
+            if batch:
+                sub.handler(batch)
+
+    def flush(self, handler: Optional[Callable] = None) -> None:
+        """Доставляет накопленные пакеты (всех подписчиков или одного handler)."""
+        pending = []
+        with self._lock:
+            for sub in self._subscriptions:
+                if sub.buffer and (handler is None or sub.handler is handler):
+                    pending.append((sub.handler, sub.buffer))
+                    sub.buffer = []
+        for target, batch in pending:
+            target(batch)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Any]:
+        """
+        Этап обработки: события начала/конца и замер инструментирования.
+
+        Пример:
+            with EVENTS.stage('load') as stage:
+                df = load()
+                stage.rows = len(df)
+        """
+        self.emit(STAGE_STARTED, name)
+        started = time.perf_counter()
+        recorder = None
+        status = 'error'
+        try:
+            with span(name, rows) as measured:
+                recorder = _StageRows(measured, rows)
+                yield recorder
+            status = 'ok'
+        finally:
+            rows = recorder.rows if recorder is not None else rows
+            self.emit(STAGE_FINISHED, name, seconds=time.perf_counter() - started, rows=rows, status=status)
+        if rows is not None:
+            self.emit(ROWS_PROCESSED, name, rows=rows)
+
+
+class _StageRows:
+    """Передает количество строк этапа и в событие, и в замер инструментирования."""
+
+    __slots__ = ('span', '_rows')
+
+    def __init__(self, measured: Any, rows: Optional[int]) -> None:
+        self.span = measured
+        self._rows = rows
+
+    @property
+    def rows(self) -> Optional[int]:
+        return self._rows
+
+    @rows.setter
+    def rows(self, value: Optional[int]) -> None:
+        self._rows = value
+        self.span.rows = value
+
+
+class EventLog:
+    """Подписчик, сохраняющий события в список (для сводок и отладки)."""
+
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+
+    def __call__(self, events: Any) -> None:
+        if isinstance(events, list):
+            self.events.extend(events)
+        else:
+            self.events.append(events)
+
+    def of_kind(self, kind: str) -> List[Event]:
+        """События указанного вида."""
+        return [event for event in self.events if event.kind == kind]
+
+
+EVENTS = EventBus()
+
+
+def emit(kind: str, name: str = '', **data: Any) -> None:
+    """Отправляет событие через общий EVENTS."""
+    EVENTS.emit(kind, name, **data)
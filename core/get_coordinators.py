@@ -1,4 +1,7 @@
 from typing import Union, Optional, Dict, List
+
+import pandas as pd
+
 from config.modules import COORDINATORS
 
 
@@ -29,6 +32,20 @@ def get_coordinator_name(coord_id: Union[int, str]) -> str:
 
     return search_id
 
+
+def coordinator_names(coord_ids: pd.Series) -> pd.Series:
+    """
+    Имена координаторов для колонки coord_id (имена ищутся только для уникальных ID).
+
+    Args:
+        coord_ids: Колонка coord_id
+
+    Returns:
+        Series с тем же индексом; для неизвестных ID - строковое представление ID, для пропусков - NaN
+    """
+    names = {coord_id: get_coordinator_name(coord_id) for coord_id in coord_ids.dropna().unique()}
+    return coord_ids.map(names)
+
 if __name__ == "__main__":
     coor_id = get_coordinator_name()
     print(coor_id)
@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.config_loader import normalize_key
+from config.modules import CONFIG_MANAGER
+
+
+def add_profession_columns(
+        df: pd.DataFrame,
+        indexes: Optional[Dict[str, Dict[str, str]]] = None,
+        block_column: str = 'Базовый_модуль'
+) -> pd.DataFrame:
+    """
+    Добавляет колонки 'Профессия' и 'Ведущий координатор' по базовому модулю.
+
+    Соединение выполняется по хэш-индексам ConfigManager: нормализуются и
+    ищутся только уникальные значения колонки, после чего результат
+    раскладывается по строкам через коды факторизации.
+
+    Args:
+        df: DataFrame с колонкой базового модуля
+        indexes: Индексы из ConfigManager.get_lookup_indexes(). Если не указаны,
+                 используются индексы текущей конфигурации.
+        block_column: Колонка с названием блока
+
+    Returns:
+        DataFrame с добавленными колонками
+    """
+    if indexes is None:
+        indexes = CONFIG_MANAGER.get_lookup_indexes()
+
+    df = df.copy()
+    codes, uniques = pd.factorize(df[block_column])
+    keys = [normalize_key(block) for block in uniques]
+
+    professions = np.array(
+        [indexes['BLOCK_TO_PROFESSION'].get(key) for key in keys] + [None], dtype=object
+    )
+    leads = np.array(
+        [indexes['BLOCK_TO_LEAD'].get(key) for key in keys] + [None], dtype=object
+    )
+
+    # Код -1 (пустой модуль) указывает на последний элемент - None
+    df['Профессия'] = professions[codes]
+    df['Ведущий координатор'] = leads[codes]
+    return df
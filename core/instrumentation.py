@@ -0,0 +1,237 @@
+"""
+Инструментирование этапов обработки.
+
+Этапы оборачиваются в span('имя') (контекстный менеджер) или @traced('имя').
+Для каждого этапа записываются время (wall и CPU), количество строк и пик
+памяти по tracemalloc. Результат сохраняется в JSON-отчет и, при
+необходимости, в textfile для node_exporter (Prometheus).
+
+По умолчанию инструментирование выключено: span() возвращает общий
+пустой контекстный менеджер, а @traced сразу вызывает функцию.
+"""
+import json
+import os
+import re
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config.constants import METRICS_PREFIX
+
+
+class _NullSpan:
+    """Пустой этап для выключенного инструментирования."""
+
+    __slots__ = ()
+    rows = None
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Измеряемый этап обработки."""
+
+    def __init__(self, owner: 'Instrumentation', name: str, rows: Optional[int] = None) -> None:
+        self.owner = owner
+        self.name = name
+        self.rows = rows
+        self.path = name
+        self._children_peak = 0
+
+    def __enter__(self) -> 'Span':
+        owner = self.owner
+        parent = owner._stack[-1] if owner._stack else None
+        if parent is not None:
+            self.path = f"{parent.path}/{self.name}"
+        if owner.trace_memory:
+            # Пик родителя до начала этапа сохраняется, затем пик сбрасывается для этапа
+            peak = tracemalloc.get_traced_memory()[1]
+            if parent is not None:
+                parent._children_peak = max(parent._children_peak, peak)
+            tracemalloc.reset_peak()
+        owner._stack.append(self)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        owner = self.owner
+        owner._stack.pop()
+
+        peak = None
+        if owner.trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self._children_peak)
+            if owner._stack:
+                parent = owner._stack[-1]
+                parent._children_peak = max(parent._children_peak, peak)
+
+        owner.records.append({
+            'stage': self.path,
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'rows': self.rows,
+            'peak_memory_bytes': peak,
+            'status': 'error' if exc_type else 'ok',
+        })
+        return False
+
+
+class Instrumentation:
+    """Сборщик этапов одного процесса."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Span] = []
+        # Трассировку, запущенную не нами (например, python -X tracemalloc), не останавливаем
+        self._started_tracing = False
+
+    def enable(self, trace_memory: bool = True) -> None:
+        """Включает сбор этапов (и трассировку памяти, если trace_memory)."""
+        self.reset()
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def disable(self) -> List[Dict[str, Any]]:
+        """
+        Выключает сбор этапов.
+
+        Returns:
+            Собранные этапы
+        """
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self.enabled = False
+        self.trace_memory = False
+        return self.records
+
+    def reset(self) -> None:
+        """Очищает собранные этапы."""
+        self.records = []
+        self._stack = []
+
+    def span(self, name: str, rows: Optional[int] = None):
+        """Контекстный менеджер этапа."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, rows)
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def span(name: str, rows: Optional[int] = None):
+    """
+    Измеряет этап обработки.
+
+    Пример:
+        with span('load') as stage:
+            df = load()
+            stage.rows = len(df)
+    """
+    return INSTRUMENTATION.span(name, rows)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Декоратор: измеряет каждый вызов функции как этап name (по умолчанию - имя функции)."""
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION.enabled:
+                return func(*args, **kwargs)
+            with Span(INSTRUMENTATION, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write_json_report(path: str, runs: Iterable[Dict[str, Any]]) -> None:
+    """
+    Сохраняет отчет о запуске в JSON.
+
+    Args:
+        path: Путь к файлу
+        runs: Итоги обработки выгрузок (с ключом 'spans')
+    """
+    report = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': list(runs)}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    print(f"Отчет о запуске сохранен: {path}")
+
+
+def _label(value: Any) -> str:
+    """Экранирует значение метки Prometheus."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_prometheus_textfile(path: str, runs: Iterable[Dict[str, Any]]) -> None:
+    """
+    Сохраняет метрики этапов в формате textfile collector (node_exporter).
+
+    Файл записывается во временный и переименовывается, чтобы node_exporter
+    не прочитал его частично.
+
+    Args:
+        path: Путь к файлу .prom
+        runs: Итоги обработки выгрузок (с ключом 'spans')
+    """
+    metrics = {
+        'wall_seconds': ('gauge', "Время этапа, с"),
+        'cpu_seconds': ('gauge', "Процессорное время этапа, с"),
+        'rows': ('gauge', "Количество строк на этапе"),
+        'peak_memory_bytes': ('gauge', "Пик памяти этапа (tracemalloc), байт"),
+    }
+    # Повторные этапы (например, один отчет в нескольких заданиях) суммируются,
+    # пик памяти берется максимальный: у каждой серии должно быть одно значение
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for run in runs:
+        source = Path(str(run.get('input', ''))).name
+        for record in run.get('spans') or []:
+            stage = re.sub(r'\s+', '_', record['stage'])
+            total = totals.setdefault((source, stage), {})
+            for key in metrics:
+                value = record.get(key)
+                if value is None:
+                    continue
+                if key == 'peak_memory_bytes':
+                    total[key] = max(total.get(key, 0), value)
+                else:
+                    total[key] = total.get(key, 0) + value
+
+    lines = []
+    for key, (kind, help_text) in metrics.items():
+        metric = f"{METRICS_PREFIX}_stage_{key}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for (source, stage), total in totals.items():
+            if key in total:
+                lines.append(f'{metric}{{input="{_label(source)}",stage="{_label(stage)}"}} {total[key]}')
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    temp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    os.replace(temp_path, target)
+    print(f"Метрики Prometheus сохранены: {path}")
@@ -0,0 +1,70 @@
+"""
+Ход обработки и отмена.
+
+ProgressReporter передается в MainProcessor и DataProcessor: на границах
+этапов вызывается update(этап, доля), а при установленном флаге отмены
+выбрасывается ProcessingCancelled. Отмена кооперативная - текущий этап
+(например, чтение файла) доводится до конца.
+"""
+import threading
+from typing import Callable, Optional
+
+ProgressCallback = Callable[[str, float], None]
+
+
+class ProcessingCancelled(Exception):
+    """Обработка отменена пользователем."""
+
+
+class ProgressReporter:
+    """Передает ход обработки в callback и проверяет флаг отмены."""
+
+    def __init__(
+            self,
+            callback: Optional[ProgressCallback] = None,
+            cancel_event: Optional[threading.Event] = None,
+            start: float = 0.0,
+            end: float = 1.0
+    ) -> None:
+        """
+        Args:
+            callback: Функция (название этапа, доля 0..1)
+            cancel_event: Флаг отмены
+            start: Доля общего хода, соответствующая началу этой части
+            end: Доля общего хода, соответствующая концу этой части
+        """
+        self.callback = callback
+        self.cancel_event = cancel_event
+        self.start = start
+        self.end = end
+
+    def check_cancelled(self) -> None:
+        """
+        Raises:
+            ProcessingCancelled: Если установлен флаг отмены
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProcessingCancelled("Обработка отменена")
+
+    def update(self, stage: str, fraction: float) -> None:
+        """
+        Сообщает о начале этапа.
+
+        Args:
+            stage: Название этапа для пользователя
+            fraction: Доля выполненной работы в пределах этой части (0..1)
+        """
+        self.check_cancelled()
+        if self.callback is not None:
+            self.callback(stage, self.start + (self.end - self.start) * min(max(fraction, 0.0), 1.0))
+
+    def finish(self, stage: str) -> None:
+        """Сообщает о завершении (без проверки отмены: результаты уже сохранены)."""
+        if self.callback is not None:
+            self.callback(stage, self.end)
+
+    def part(self, start: float, end: float) -> 'ProgressReporter':
+        """Часть общего хода: доли 0..1 части отображаются на start..end этого объекта."""
+        span = self.end - self.start
+        return ProgressReporter(self.callback, self.cancel_event,
+                                self.start + span * start, self.start + span * end)
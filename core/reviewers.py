@@ -0,0 +1,196 @@
+"""
+Индекс возможных проверяющих.
+
+Колонка 'Возможные проверяющие' разбирается один раз: имена из нее и из
+колонки 'Проверяющий' нормализуются и получают общие целочисленные коды
+(словарь проверяющих). По кодам строятся два сжатых индекса (CSR):
+проверяющий -> позиции работ, которые он может взять, и работа -> коды
+возможных проверяющих. Подсчеты по маскам (без проверяющего, просроченные)
+выполняются через np.bincount без циклов по строкам.
+
+recommend() предлагает проверяющих для работ без проверяющего: работы
+обходятся от самых старых, каждая достается наименее загруженному из ее
+возможных проверяющих, и его нагрузка сразу увеличивается.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Разделители имен в 'Возможные проверяющие'
+CANDIDATE_SEPARATORS = r'[,;\n]+'
+
+SUMMARY_COLUMNS = [
+    'Проверяющий', 'Назначено работ', 'Может взять',
+    'Может взять без проверяющего', 'Может взять просроченных без проверяющего'
+]
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Убирает лишние пробелы в именах; пустые строки заменяются на NA."""
+    names = names.astype('string').str.replace(r'\s+', ' ', regex=True).str.strip()
+    return names.mask(names == '')
+
+
+def reviewer_key(name: str) -> str:
+    """Ключ имени проверяющего (без учета регистра и лишних пробелов)."""
+    return ' '.join(str(name).split()).casefold()
+
+
+def _offsets(codes: np.ndarray, size: int) -> np.ndarray:
+    """Границы групп отсортированных кодов 0..size-1 (offsets[i]:offsets[i + 1])."""
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=size), out=offsets[1:])
+    return offsets
+
+
+class ReviewerIndex:
+    """Неизменяемый индекс: проверяющий <-> работы, которые он может взять."""
+
+    def __init__(self, base_df: pd.DataFrame) -> None:
+        """
+        Args:
+            base_df: DataFrame с колонками 'Проверяющий' и 'Возможные проверяющие'
+        """
+        self.size = len(base_df)
+        self.labels = base_df.index
+
+        empty = pd.Series(pd.NA, index=pd.RangeIndex(self.size), dtype='string')
+        candidates = base_df.get('Возможные проверяющие', empty).astype('string')
+        candidates.index = pd.RangeIndex(self.size)
+        names = normalize_names(candidates.str.split(CANDIDATE_SEPARATORS, regex=True).explode()).dropna()
+
+        assigned = base_df.get('Проверяющий', empty).astype('string')
+        assigned.index = pd.RangeIndex(self.size)
+        assigned = normalize_names(assigned).dropna()
+
+        # Общий словарь для возможных и назначенных проверяющих: одно имя - один код
+        all_names = pd.concat([names, assigned], ignore_index=True)
+        codes, keys = pd.factorize(all_names.str.casefold())
+        codes = codes.astype(np.int64)
+        _, first = np.unique(codes, return_index=True)
+        self.names: List[str] = all_names.to_numpy()[first].tolist()
+        self.codes: Dict[str, int] = {key: code for code, key in enumerate(keys)}
+        count = len(self.names)
+
+        self.assigned = np.full(self.size, -1, dtype=np.int64)
+        self.assigned[assigned.index.to_numpy()] = codes[len(names):]
+
+        # Пары (работа, проверяющий) без повторов, отсортированные по работе
+        pairs = np.unique(names.index.to_numpy(dtype=np.int64) * max(count, 1) + codes[:len(names)])
+        work_positions = pairs // max(count, 1)
+        self.work_candidates = pairs % max(count, 1)
+        self.work_offsets = _offsets(work_positions, self.size)
+
+        order = np.argsort(self.work_candidates, kind='stable')
+        self.reviewer_works = work_positions[order]
+        self.reviewer_offsets = _offsets(self.work_candidates, count)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def unassigned(self) -> np.ndarray:
+        """Маска работ без проверяющего."""
+        return self.assigned < 0
+
+    @property
+    def candidate_counts(self) -> np.ndarray:
+        """Количество возможных проверяющих у каждой работы."""
+        return np.diff(self.work_offsets)
+
+    def code(self, name: str) -> Optional[int]:
+        """Код проверяющего по имени (None, если имя не встречается)."""
+        return self.codes.get(reviewer_key(name))
+
+    def works_for(self, name: str, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Позиции работ, которые может взять проверяющий (с фильтром mask)."""
+        code = self.code(name)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        positions = self.reviewer_works[self.reviewer_offsets[code]:self.reviewer_offsets[code + 1]]
+        return positions if mask is None else positions[mask[positions]]
+
+    def candidates(self, position: int) -> List[str]:
+        """Возможные проверяющие работы по ее позиции."""
+        codes = self.work_candidates[self.work_offsets[position]:self.work_offsets[position + 1]]
+        return [self.names[code] for code in codes]
+
+    def eligible_counts(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Сколько работ (из mask) может взять каждый проверяющий; индекс - код."""
+        codes = self.work_candidates
+        if mask is not None:
+            codes = codes[np.repeat(mask, self.candidate_counts)]
+        return np.bincount(codes, minlength=len(self))
+
+    def assigned_counts(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Сколько работ (из mask) уже назначено каждому проверяющему; индекс - код."""
+        codes = self.assigned if mask is None else self.assigned[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self))
+
+    def uncovered(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Позиции работ без проверяющего, для которых нет ни одного возможного."""
+        missing = self.unassigned & (self.candidate_counts == 0)
+        if mask is not None:
+            missing &= mask
+        return np.flatnonzero(missing)
+
+    def summary(self, overdue: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Сводка по проверяющим: назначенные работы и работы, которые они могут взять.
+
+        Args:
+            overdue: Маска просроченных работ (без нее колонка просроченных нулевая)
+
+        Returns:
+            DataFrame SUMMARY_COLUMNS, отсортированный по работам без проверяющего
+        """
+        unassigned = self.unassigned
+        overdue_unassigned = unassigned & overdue if overdue is not None else np.zeros(self.size, dtype=bool)
+        summary = pd.DataFrame({
+            'Проверяющий': self.names,
+            'Назначено работ': self.assigned_counts(),
+            'Может взять': self.eligible_counts(),
+            'Может взять без проверяющего': self.eligible_counts(unassigned),
+            'Может взять просроченных без проверяющего': self.eligible_counts(overdue_unassigned),
+        }, columns=SUMMARY_COLUMNS)
+        return summary.sort_values(
+            ['Может взять просроченных без проверяющего', 'Может взять без проверяющего', 'Проверяющий'],
+            ascending=[False, False, True], ignore_index=True
+        )
+
+    def recommend(self, mask: np.ndarray, age: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Жадное распределение работ из mask по возможным проверяющим с учетом нагрузки.
+
+        Начальная нагрузка - количество уже назначенных работ ('Проверяющий').
+        Работы обходятся по убыванию age (при равенстве - по позиции), каждая
+        назначается проверяющему с наименьшей текущей нагрузкой среди ее
+        возможных (при равенстве - встретившемуся в выгрузке раньше).
+
+        Args:
+            mask: Маска работ для распределения (обычно - без проверяющего)
+            age: Возраст работ ('Дней на проверке'); пропуски считаются нулем
+
+        Returns:
+            (коды предложенных проверяющих, нагрузка проверяющего после назначения):
+            массивы длины size, -1 для работ вне mask или без возможных проверяющих
+        """
+        suggested = np.full(self.size, -1, dtype=np.int64)
+        load_after = np.full(self.size, -1, dtype=np.int64)
+
+        counts = self.candidate_counts
+        positions = np.flatnonzero(mask & (counts > 0))
+        age = np.nan_to_num(np.asarray(age, dtype=float)[positions], nan=0.0)
+        positions = positions[np.lexsort((positions, -age))]
+
+        # Цикл только по распределяемым работам; у каждой - несколько кандидатов
+        loads = self.assigned_counts().tolist()
+        candidates = self.work_candidates.tolist()
+        offsets = self.work_offsets.tolist()
+        for position in positions.tolist():
+            best = min(candidates[offsets[position]:offsets[position + 1]], key=loads.__getitem__)
+            loads[best] += 1
+            suggested[position] = best
+            load_after[position] = loads[best]
+        return suggested, load_after
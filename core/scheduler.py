@@ -0,0 +1,146 @@
+"""
+Планировщик отчетов.
+
+Задания описываются в config/schedule.yaml: какие отчеты формировать,
+в какие дни и с какого времени, с какими сроками и фильтрацией.
+"""
+from datetime import date, datetime, time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config.constants import REVIEW_DEADLINES
+from config.modules import SCHEDULE
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+REPORT_TYPES = ('diploma', 'homework', 'course', 'forecast', 'assignments', 'workload', 'aging')
+
+# Расписание по умолчанию повторяет прежнее поведение main.py:
+# в четверг - курсовые работы (и рекомендации проверяющих), в остальные дни - дипломы и домашние работы
+DEFAULT_JOBS = [
+    {'name': 'course_works', 'reports': ['course', 'assignments', 'forecast', 'workload', 'aging'],
+     'days': ['Thursday']},
+    {'name': 'diploma_and_homework', 'reports': ['diploma', 'homework', 'forecast', 'workload', 'aging'],
+     'days': [day for day in WEEKDAYS if day != 'Thursday']},
+]
+
+
+def shared_reports(jobs: Iterable['ScheduledJob']) -> Set[str]:
+    """Отчеты, которые входят в несколько из одновременно выполняемых заданий."""
+    counts = Counter(report for job in jobs for report in set(job.reports))
+    return {report for report, count in counts.items() if count > 1}
+
+
+class ScheduledJob:
+    """Задание расписания."""
+
+    def __init__(
+            self,
+            name: str,
+            reports: Iterable[str],
+            days: Optional[Iterable[str]] = None,
+            at: Optional[time] = None,
+            strict: bool = False,
+            thresholds: Optional[Dict[str, int]] = None,
+            forecast_horizon: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            name: Название задания
+            reports: Отчеты (diploma, homework, course, forecast, assignments, workload, aging)
+            days: Дни недели; None - каждый день
+            at: Время, не раньше которого задание выполняется; None - в любое время
+            strict: Строгая фильтрация (> срока) вместо нестрогой (>= срока)
+            thresholds: Переопределение сроков REVIEW_DEADLINES
+            forecast_horizon: Горизонт прогноза просрочки в рабочих днях
+        """
+        self.name = name
+        self.reports = [str(report).lower() for report in reports]
+        unknown = [report for report in self.reports if report not in REPORT_TYPES]
+        if unknown:
+            raise ValueError(f"Задание '{name}': неизвестные отчеты {unknown}")
+
+        self.days = None if days is None else {self._parse_weekday(day) for day in days}
+        self.at = at
+        self.strict = bool(strict)
+        self.thresholds = dict(thresholds or {})
+        unknown = [key for key in self.thresholds if key not in REVIEW_DEADLINES]
+        if unknown:
+            raise ValueError(f"Задание '{name}': неизвестные сроки {unknown}")
+        self.forecast_horizon = forecast_horizon
+
+    def __repr__(self) -> str:
+        return f"ScheduledJob({self.name!r}, reports={self.reports})"
+
+    @staticmethod
+    def _parse_weekday(day: Any) -> int:
+        """Переводит название дня недели (полное или сокращенное) в номер 0-6."""
+        name = str(day).strip().lower()
+        for number, weekday in enumerate(WEEKDAYS):
+            if weekday.lower() == name or (len(name) >= 3 and weekday.lower().startswith(name)):
+                return number
+        raise ValueError(f"Неизвестный день недели: {day}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScheduledJob':
+        """Создает задание из записи schedule.yaml."""
+        at = data.get('time')
+        if isinstance(at, int):
+            # YAML 1.1 читает ЧЧ:ММ без кавычек как число минут (09:00 -> 540)
+            at = time(at // 60, at % 60)
+        elif at is not None and not isinstance(at, time):
+            at = time.fromisoformat(str(at))
+        return cls(
+            name=data.get('name', 'job'),
+            reports=data.get('reports') or [],
+            days=data.get('days'),
+            at=at,
+            strict=data.get('strict', False),
+            thresholds=data.get('thresholds'),
+            forecast_horizon=data.get('forecast_horizon')
+        )
+
+    def deadline(self, key: str) -> int:
+        """Срок в рабочих днях с учетом переопределений задания."""
+        return int(self.thresholds.get(key, REVIEW_DEADLINES[key]))
+
+    def is_due(self, moment: datetime) -> bool:
+        """Проверяет, должно ли задание выполняться в указанный момент."""
+        if self.days is not None and moment.weekday() not in self.days:
+            return False
+        return self.at is None or moment.time() >= self.at
+
+
+class JobScheduler:
+    """Выбирает задания, которые нужно выполнить в данный момент."""
+
+    def __init__(self, definitions: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Args:
+            definitions: Содержимое schedule.yaml (по умолчанию из конфигурации)
+        """
+        definitions = definitions if definitions is not None else SCHEDULE
+        self.jobs: List[ScheduledJob] = [
+            ScheduledJob.from_dict(job) for job in (definitions.get('jobs') or DEFAULT_JOBS)
+        ]
+        self._last_run: Dict[str, date] = {}
+
+    def due_jobs(self, moment: datetime) -> List[ScheduledJob]:
+        """Задания, которые должны выполняться в момент moment."""
+        return [job for job in self.jobs if job.is_due(moment)]
+
+    def mark_run(self, jobs: Iterable[ScheduledJob], moment: datetime) -> None:
+        """Отмечает задания выполненными в день moment."""
+        for job in jobs:
+            self._last_run[job.name] = moment.date()
+
+    def pop_pending_jobs(self, moment: datetime) -> List[ScheduledJob]:
+        """
+        Задания по времени, которые наступили и еще не выполнялись сегодня.
+        Возвращенные задания сразу отмечаются выполненными.
+        """
+        pending = [
+            job for job in self.due_jobs(moment)
+            if job.at is not None and self._last_run.get(job.name) != moment.date()
+        ]
+        self.mark_run(pending, moment)
+        return pending
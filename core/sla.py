@@ -0,0 +1,149 @@
+"""
+Расчет SLA проверки в рабочих часах.
+
+В отличие от 'Дней на проверке', которые считаются по датам, здесь
+учитывается время отправки: прошедшее время измеряется в рабочих часах
+(окно рабочего дня из WORKING_HOURS) по производственному календарю строки.
+"""
+from datetime import datetime, time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import REVIEW_DEADLINES, WORKING_HOURS
+from core.calendars import CalendarRegistry, CompiledCalendar, get_calendar_registry
+
+
+class SLAEngine:
+    """
+    Векторный расчет прошедших рабочих часов и остатка до срока проверки.
+
+    Рабочее время до момента t считается как
+    (рабочие дни до даты t) * длина дня + время внутри окна, если день рабочий.
+    Разность двух таких значений - рабочие часы между моментами.
+    """
+
+    def __init__(
+            self,
+            calendar_registry: Optional[CalendarRegistry] = None,
+            work_start: Optional[time] = None,
+            work_end: Optional[time] = None
+    ) -> None:
+        """
+        Args:
+            calendar_registry: Реестр календарей (по умолчанию - общий)
+            work_start: Начало рабочего дня (по умолчанию из WORKING_HOURS)
+            work_end: Конец рабочего дня (по умолчанию из WORKING_HOURS)
+        """
+        self.calendars = calendar_registry or get_calendar_registry()
+        self.work_start = work_start or time.fromisoformat(WORKING_HOURS['START'])
+        self.work_end = work_end or time.fromisoformat(WORKING_HOURS['END'])
+
+        self._start_hours = self.work_start.hour + self.work_start.minute / 60
+        self._end_hours = self.work_end.hour + self.work_end.minute / 60
+        if self._end_hours <= self._start_hours:
+            raise ValueError("Конец рабочего дня должен быть позже начала")
+
+    @property
+    def hours_per_day(self) -> float:
+        """Длина рабочего дня в часах."""
+        return self._end_hours - self._start_hours
+
+    def _business_hours_until(self, calendar: CompiledCalendar, timestamps: pd.Series) -> np.ndarray:
+        """Рабочие часы от начала календаря до каждого момента."""
+        timestamps = pd.to_datetime(timestamps)
+        days = timestamps.dt.normalize()
+        hours_into_day = (timestamps - days).dt.total_seconds().to_numpy() / 3600
+        within_day = np.clip(hours_into_day - self._start_hours, 0, self.hours_per_day)
+        working = calendar.working_mask(days)
+        return calendar.working_days_before(days) * self.hours_per_day + np.where(working, within_day, 0.0)
+
+    def business_hours_between(self, df: pd.DataFrame, start_column: str, end: datetime) -> np.ndarray:
+        """
+        Считает рабочие часы от момента в колонке до end для всех строк.
+
+        Args:
+            df: DataFrame (календарь выбирается для каждой строки)
+            start_column: Колонка с моментом начала (datetime)
+            end: Момент окончания
+
+        Returns:
+            Массив рабочих часов (NaN для пустых моментов)
+        """
+        result = np.full(len(df), np.nan)
+        valid = df[start_column].notna().to_numpy()
+        if not valid.any():
+            return result
+
+        subset = df[valid]
+        starts = pd.to_datetime(subset[start_column])
+        first = min(starts.min().date(), end.date())
+        last = max(starts.max().date(), end.date())
+        names = self.calendars.calendar_names_for(subset).to_numpy()
+
+        hours = np.empty(len(subset))
+        for name in pd.unique(names):
+            mask = names == name
+            calendar = self.calendars.get(name, first, last)
+            group_starts = starts[mask]
+            end_value = self._business_hours_until(calendar, pd.Series([pd.Timestamp(end)]))[0]
+            hours[mask] = end_value - self._business_hours_until(calendar, group_starts)
+
+        result[valid] = np.maximum(hours, 0.0)
+        return result
+
+    def deadline_hours(self, deadline_types: pd.Series) -> np.ndarray:
+        """
+        Переводит сроки REVIEW_DEADLINES (в рабочих днях) в рабочие часы.
+
+        Args:
+            deadline_types: Ключи REVIEW_DEADLINES для строк (None - без срока)
+
+        Returns:
+            Массив сроков в рабочих часах (NaN, если срок не задан)
+        """
+        days = deadline_types.map(REVIEW_DEADLINES).astype(float).to_numpy()
+        return days * self.hours_per_day
+
+    def add_sla_columns(
+            self,
+            df: pd.DataFrame,
+            now: datetime,
+            start_column: str = 'Время отправки',
+            type_column: str = 'Тип срока'
+    ) -> pd.DataFrame:
+        """
+        Добавляет колонки 'Рабочих часов на проверке' и 'Часов до срока'.
+
+        Args:
+            df: DataFrame с моментом отправки и типом срока
+            now: Текущий момент
+            start_column: Колонка с моментом отправки
+            type_column: Колонка с ключом REVIEW_DEADLINES
+
+        Returns:
+            DataFrame с добавленными колонками
+        """
+        df = df.copy()
+        elapsed = self.business_hours_between(df, start_column, now)
+        df['Рабочих часов на проверке'] = np.round(elapsed, 2)
+        df['Часов до срока'] = np.round(self.deadline_hours(df[type_column]) - elapsed, 2)
+        return df
+
+    @staticmethod
+    def near_breach_mask(df: pd.DataFrame, hours: float) -> pd.Series:
+        """
+        Маска работ, которые еще не просрочены, но до срока осталось не больше hours.
+
+        Args:
+            df: DataFrame с колонкой 'Часов до срока'
+            hours: Порог в рабочих часах
+        """
+        remaining = df['Часов до срока']
+        return (remaining > 0) & (remaining <= hours)
+
+    @staticmethod
+    def breached_mask(df: pd.DataFrame) -> pd.Series:
+        """Маска работ, у которых срок в рабочих часах уже истек."""
+        return df['Часов до срока'] <= 0
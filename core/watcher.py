@@ -0,0 +1,87 @@
+"""
+Наблюдение за папкой с выгрузками.
+
+Используется дешевый опрос stat() без сторонних зависимостей: файл
+считается готовым, когда его размер и время изменения не меняются
+в течение settle_seconds (выгрузка полностью записана).
+"""
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+class FolderWatcher:
+    """Опрашивает папку и возвращает новые полностью записанные файлы."""
+
+    def __init__(
+            self,
+            folder: str,
+            patterns: Sequence[str] = ('*.xlsx', '*.xls'),
+            settle_seconds: float = 5.0
+    ) -> None:
+        """
+        Args:
+            folder: Папка для наблюдения
+            patterns: Шаблоны имен файлов
+            settle_seconds: Сколько секунд файл должен оставаться неизменным
+        """
+        self.folder = Path(folder)
+        self.patterns = tuple(patterns)
+        self.settle_seconds = settle_seconds
+        # path -> (размер, mtime_ns, момент последнего изменения)
+        self._pending: Dict[Path, Tuple[int, int, float]] = {}
+        self._done: Set[Tuple[Path, int, int]] = set()
+
+    def _candidates(self) -> List[Path]:
+        """Файлы в папке, подходящие под шаблоны (без временных файлов Excel)."""
+        files = set()
+        for pattern in self.patterns:
+            files.update(self.folder.glob(pattern))
+        return sorted(f for f in files if f.is_file() and not f.name.startswith(('~$', '.')))
+
+    def poll(self, now: Optional[float] = None) -> List[Path]:
+        """
+        Проверяет папку один раз.
+
+        Args:
+            now: Текущее время (time.monotonic), для тестов можно передать явно
+
+        Returns:
+            Список файлов, готовых к обработке
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        seen = set()
+
+        for path in self._candidates():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Файл удален или недоступен между glob и stat
+            seen.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+
+            if (path, *signature) in self._done:
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[:2] != signature:
+                self._pending[path] = (*signature, now)
+                continue
+
+            if stat.st_size > 0 and now - pending[2] >= self.settle_seconds:
+                ready.append(path)
+
+        # Забываем файлы, которые исчезли из папки
+        for path in list(self._pending):
+            if path not in seen:
+                del self._pending[path]
+        self._done = {item for item in self._done if item[0] in seen}
+
+        return ready
+
+    def mark_done(self, path: Path) -> None:
+        """Отмечает файл обработанным (повторно он вернется только после изменения)."""
+        pending = self._pending.pop(path, None)
+        if pending is not None:
+            self._done.add((path, pending[0], pending[1]))
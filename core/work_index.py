@@ -0,0 +1,181 @@
+"""
+Индекс работ в памяти для быстрых ответов на запросы координаторов.
+
+Индекс строится один раз по обогащенному base_df: строки заранее
+переводятся в JSON-совместимые словари, а для coord_id, проверяющих,
+модулей и студентов строятся словари ключ -> позиции строк, а для
+проверяющих (взятые и возможные работы) - ReviewerIndex. Сводки по возрасту работ
+(aging_pivot) считаются вместе с индексом.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import REVIEW_DEADLINES
+from config.config_loader import normalize_key
+from core.age_stats import AGING_GROUPINGS, aging_pivot
+from core.reviewers import ReviewerIndex
+
+# Колонки, которые возвращаются в ответах
+INDEX_COLUMNS = [
+    'Модуль', 'Название задания', 'Ссылка на работу в админке',
+    'Ссылка на работу в ЛК эксперта', 'ID студента', 'Отправлена', 'Срок проверки',
+    'Проверяющий', 'Возможные проверяющие', 'Дней на проверке', 'Тип задания',
+    'coord_id', 'Профессия', 'Ведущий координатор'
+]
+
+
+def _json_value(value: Any) -> Any:
+    """Переводит значение ячейки в JSON-совместимый вид."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if value is pd.NaT:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _group_positions(keys: pd.Series) -> Dict[str, np.ndarray]:
+    """Строит словарь ключ -> массив позиций строк (пустые ключи пропускаются)."""
+    codes, uniques = pd.factorize(keys)
+    if not len(uniques):
+        return {}
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    bounds = np.searchsorted(sorted_codes, np.arange(len(uniques) + 1))
+    return {
+        str(key): order[bounds[i]:bounds[i + 1]]
+        for i, key in enumerate(uniques)
+    }
+
+
+def _id_keys(ids: pd.Series) -> pd.Series:
+    """Приводит идентификаторы к строкам без '.0' у чисел, прочитанных как float."""
+    numeric = pd.to_numeric(ids, errors='coerce')
+    is_integer = numeric.notna() & (numeric % 1 == 0)
+    keys = ids.astype('string').str.strip()
+    keys[is_integer] = numeric[is_integer].astype('int64').astype('string')
+    return keys
+
+
+def overdue_mask(
+        base_df: pd.DataFrame,
+        deadlines: Optional[Dict[str, int]] = None,
+        strict_filter: bool = False
+) -> np.ndarray:
+    """
+    Просроченные работы по REVIEW_DEADLINES, как в отчетах.
+
+    Args:
+        base_df: DataFrame с колонками 'Тип срока' и 'Дней на проверке'
+        deadlines: Переопределение сроков REVIEW_DEADLINES
+        strict_filter: Если True - просрочка при > срока, иначе при >= срока
+    """
+    if 'Тип срока' not in base_df.columns:
+        return np.zeros(len(base_df), dtype=bool)
+    limits = base_df['Тип срока'].map({**REVIEW_DEADLINES, **(deadlines or {})})
+    days = base_df['Дней на проверке']
+    overdue = days > limits if strict_filter else days >= limits
+    return overdue.fillna(False).to_numpy(dtype=bool)
+
+
+class WorkIndex:
+    """Неизменяемый индекс работ; новый индекс строится целиком и подменяет старый."""
+
+    def __init__(self, base_df: pd.DataFrame, source: Optional[str] = None) -> None:
+        """
+        Args:
+            base_df: Обогащенный DataFrame из DataProcessor
+            source: Источник данных (путь к выгрузке) для информации
+        """
+        self.source = source
+        self.built_at = datetime.now()
+        self.size = len(base_df)
+
+        columns = [col for col in INDEX_COLUMNS if col in base_df.columns]
+        self.records: List[Dict[str, Any]] = [
+            {col: _json_value(value) for col, value in zip(columns, row)}
+            for row in base_df[columns].itertuples(index=False, name=None)
+        ]
+
+        self.reviewers = ReviewerIndex(base_df)
+        self.unassigned = self.reviewers.unassigned
+        self.overdue = overdue_mask(base_df)
+
+        self.by_coordinator = _group_positions(_id_keys(base_df['coord_id']))
+        # Взятые работы - по кодам ReviewerIndex (имя без учета регистра и лишних пробелов),
+        # как в /eligible, рекомендациях и отчете о нагрузке
+        assigned = self.reviewers.assigned
+        order = np.argsort(assigned, kind='stable')
+        bounds = np.searchsorted(assigned[order], np.arange(len(self.reviewers) + 1))
+        self.by_reviewer: Dict[int, np.ndarray] = {
+            code: order[bounds[code]:bounds[code + 1]] for code in range(len(self.reviewers))
+        }
+        self.by_module = _group_positions(base_df['Базовый_модуль'].map(normalize_key))
+        self.by_student = _group_positions(_id_keys(base_df['ID студента']))
+        self.aging: Dict[str, List[Dict[str, Any]]] = {
+            by: aging_pivot(base_df, by).to_dict('records') for by in AGING_GROUPINGS
+        }
+
+    def _select(self, positions: Optional[np.ndarray], mask: Optional[np.ndarray] = None,
+                limit: Optional[int] = None) -> Dict[str, Any]:
+        """Формирует ответ по позициям строк."""
+        if positions is None:
+            positions = np.empty(0, dtype=np.int64)
+        if mask is not None:
+            positions = positions[mask[positions]]
+        total = len(positions)
+        if limit is not None:
+            positions = positions[:limit]
+        return {'count': total, 'items': [self.records[i] for i in positions]}
+
+    def overdue_for_coordinator(self, coord_id: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Просроченные работы координатора."""
+        return self._select(self.by_coordinator.get(str(coord_id).strip()), self.overdue, limit)
+
+    def unassigned_for_module(self, module: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Работы без проверяющего по базовому модулю."""
+        return self._select(self.by_module.get(normalize_key(module)), self.unassigned, limit)
+
+    def works_for_student(self, student_id: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Все работы студента."""
+        return self._select(self.by_student.get(str(student_id).strip()), None, limit)
+
+    def works_for_reviewer(self, reviewer: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Работы, взятые проверяющим."""
+        return self._select(self.by_reviewer.get(self.reviewers.code(reviewer)), None, limit)
+
+    def eligible_for_reviewer(self, reviewer: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Работы без проверяющего, которые может взять проверяющий (сначала просроченные)."""
+        positions = self.reviewers.works_for(reviewer, self.unassigned)
+        positions = positions[np.argsort(~self.overdue[positions], kind='stable')]
+        return self._select(positions, None, limit)
+
+    def aging_summary(self, by: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Сводка по возрасту работ по разрезу AGING_GROUPINGS (строка итогов - отдельно).
+
+        Raises:
+            ValueError: Если разрез неизвестен
+        """
+        if by not in self.aging:
+            raise ValueError(f"Неизвестный разрез: {by} (доступны {list(self.aging)})")
+        *rows, total = self.aging[by]
+        return {'count': len(rows), 'items': rows[:limit] if limit is not None else rows, 'total': total}
+
+    def info(self) -> Dict[str, Any]:
+        """Сведения об индексе."""
+        return {
+            'source': self.source,
+            'built_at': self.built_at.isoformat(timespec='seconds'),
+            'rows': self.size,
+            'overdue': int(self.overdue.sum()),
+            'unassigned': int(self.unassigned.sum()),
+            'reviewers': len(self.reviewers),
+            'unassigned_without_candidates': len(self.reviewers.uncovered()),
+        }
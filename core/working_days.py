@@ -214,7 +214,7 @@ def create_calculator(holidays, extra_days) -> WorkingDaysCalculator:
 
 def test_all_methods():
     """Тестирование всех методов калькулятора"""
-    calc = create_calculator()
+    calc = create_calculator(holidays, extra_days)
 
     print("ТЕСТИРОВАНИЕ ВСЕХ МЕТОДОВ КАЛЬКУЛЯТОРА:")
     print("=" * 50)
@@ -261,7 +261,7 @@ def test_all_methods():
 
 def demonstrate_calculate_method():
     """Демонстрация работы метода calculate"""
-    calc = create_calculator()
+    calc = create_calculator(holidays, extra_days)
 
     print("\nДЕМОНСТРАЦИЯ МЕТОДА calculate():")
     print("=" * 40)
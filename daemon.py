@@ -0,0 +1,188 @@
+"""
+Режим службы: наблюдение за папкой с выгрузками и обработка новых файлов.
+
+В отличие от одноразового main.main(), процесс остается запущенным:
+конфигурация, индексы координаторов и календари загружаются один раз,
+а при появлении новой выгрузки выполняется только ее обработка.
+"""
+import argparse
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from config.constants import (
+    DEFAULT_ARCHIVE_FOLDER, DEFAULT_OUTPUT_FOLDER, DEFAULT_input_FOLDER,
+    WATCH_POLL_INTERVAL, WATCH_SETTLE_SECONDS
+)
+from config.modules import CONFIG_MANAGER
+from core.calendars import get_calendar_registry
+from core.scheduler import JobScheduler
+from core.watcher import FolderWatcher
+from main import MainProcessor
+
+
+class WorkAnalysisDaemon:
+    """Служба, обрабатывающая новые выгрузки из папки наблюдения."""
+
+    def __init__(
+            self,
+            input_folder: str = DEFAULT_input_FOLDER,
+            output_folder: str = DEFAULT_OUTPUT_FOLDER,
+            archive_folder: Optional[str] = DEFAULT_ARCHIVE_FOLDER,
+            poll_interval: float = WATCH_POLL_INTERVAL,
+            settle_seconds: float = WATCH_SETTLE_SECONDS,
+            on_processed: Optional[Callable[[pd.DataFrame, Path], None]] = None
+    ) -> None:
+        """
+        Args:
+            input_folder: Папка, в которую попадают выгрузки
+            output_folder: Папка для отчетов
+            archive_folder: Куда переносить обработанные файлы (None - оставить на месте)
+            poll_interval: Интервал опроса папки в секундах
+            settle_seconds: Сколько секунд файл должен быть неизменным перед обработкой
+            on_processed: Вызывается с base_df и путем к выгрузке после успешной обработки
+        """
+        self.output_folder = Path(output_folder)
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        self.archive_folder = Path(archive_folder) if archive_folder else None
+        self.poll_interval = poll_interval
+        self.watcher = FolderWatcher(input_folder, settle_seconds=settle_seconds)
+        self.scheduler = JobScheduler()
+        self.last_export: Optional[Path] = None
+        self.on_processed = on_processed
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        """Заранее загружает индексы конфигурации и компилирует календарь по умолчанию."""
+        self.calendar_registry = get_calendar_registry()
+        self.calendar_registry.get()
+        CONFIG_MANAGER.get_lookup_indexes()
+        print("Конфигурация и календари загружены")
+
+    def process_file(self, file_path: Path) -> bool:
+        """
+        Обрабатывает одну выгрузку.
+
+        Returns:
+            True при успешной обработке
+        """
+        started = time.perf_counter()
+        print(f"Новая выгрузка: {file_path}")
+        try:
+            processor = self._run_pipeline(file_path)
+        except Exception as e:
+            print(f"Ошибка обработки {file_path}: {type(e).__name__}: {e}")
+            return False
+        finally:
+            self.watcher.mark_done(file_path)
+
+        base_df = processor.data_processor.base_df if processor.data_processor else None
+        if processor.data_processor is not None and base_df is None:
+            # Поврежденная или недописанная выгрузка остается на месте и не становится last_export;
+            # после изменения файла наблюдатель предложит ее снова
+            print(f"Ошибка обработки {file_path}: не удалось прочитать выгрузку")
+            return False
+
+        print(f"Выгрузка обработана за {time.perf_counter() - started:.1f} с")
+        self.last_export = self._archive(file_path)
+
+        if self.on_processed is not None and base_df is not None:
+            self.on_processed(base_df, self.last_export)
+        return True
+
+    def _run_pipeline(self, file_path: Path, jobs=None) -> MainProcessor:
+        """Запускает MainProcessor с общими календарями и планировщиком."""
+        processor = MainProcessor(
+            input_file=str(file_path),
+            output_folder=str(self.output_folder),
+            calendar_registry=self.calendar_registry,
+            scheduler=self.scheduler
+        )
+        processor.execute(jobs)
+        return processor
+
+    def run_scheduled_jobs(self) -> None:
+        """Выполняет задания по времени, наступившие с момента последнего опроса."""
+        # Без выгрузки задания остаются в ожидании и выполнятся с первой новой выгрузкой
+        if self.last_export is None or not self.last_export.exists():
+            return
+        pending = self.scheduler.pop_pending_jobs(datetime.now())
+        if not pending:
+            return
+        try:
+            self._run_pipeline(self.last_export, pending)
+        except Exception as e:
+            print(f"Ошибка выполнения заданий по расписанию: {type(e).__name__}: {e}")
+
+    def _archive(self, file_path: Path) -> Path:
+        """
+        Переносит обработанную выгрузку в архив (вместо удаления).
+
+        Returns:
+            Новый путь к выгрузке
+        """
+        if self.archive_folder is None:
+            return file_path
+        try:
+            self.archive_folder.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            target = self.archive_folder / f"{file_path.stem}_{timestamp}{file_path.suffix}"
+            shutil.move(str(file_path), str(target))
+            return target
+        except OSError as e:
+            print(f"Не удалось перенести {file_path} в архив: {e}")
+            return file_path
+
+    def run_once(self) -> int:
+        """
+        Один цикл опроса.
+
+        Returns:
+            Количество обработанных файлов
+        """
+        processed = 0
+        for file_path in self.watcher.poll():
+            processed += self.process_file(file_path)
+        self.run_scheduled_jobs()
+        return processed
+
+    def run_forever(self) -> None:
+        """Запускает бесконечный цикл опроса (остановка - Ctrl+C)."""
+        print(f"Наблюдение за папкой {self.watcher.folder} (интервал {self.poll_interval} с)")
+        try:
+            while True:
+                self.run_once()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Служба остановлена")
+
+
+def main() -> None:
+    """Точка входа службы."""
+    parser = argparse.ArgumentParser(description="Служба обработки выгрузок Work Analysis")
+    parser.add_argument('--input-folder', default=DEFAULT_input_FOLDER, help="Папка с выгрузками")
+    parser.add_argument('--output-folder', default=DEFAULT_OUTPUT_FOLDER, help="Папка для отчетов")
+    parser.add_argument('--archive-folder', default=DEFAULT_ARCHIVE_FOLDER,
+                        help="Папка для обработанных выгрузок")
+    parser.add_argument('--no-archive', action='store_true', help="Не переносить обработанные файлы")
+    parser.add_argument('--interval', type=float, default=WATCH_POLL_INTERVAL, help="Интервал опроса, с")
+    parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS,
+                        help="Время неизменности файла перед обработкой, с")
+    args = parser.parse_args()
+
+    daemon = WorkAnalysisDaemon(
+        input_folder=args.input_folder,
+        output_folder=args.output_folder,
+        archive_folder=None if args.no_archive else args.archive_folder,
+        poll_interval=args.interval,
+        settle_seconds=args.settle
+    )
+    daemon.run_forever()
+
+
+if __name__ == '__main__':
+    main()
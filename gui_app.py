@@ -1,8 +1,33 @@
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from main import MainProcessor
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
+from main import run_input
 import os  # Добавляем импорт для открытия папки
-from config.constants import DEFAULT_OUTPUT_FOLDER
+from config.constants import DEFAULT_OUTPUT_FOLDER, GUI_MAX_WORKERS
+from core.progress import ProgressReporter
+
+# Интервал опроса очереди сообщений от фоновой обработки, мс
+POLL_INTERVAL_MS = 100
+
+# Шаблон выгрузок при добавлении папки
+EXCEL_PATTERN = '*.xls*'
+
+STATUS_LABELS = {
+    'queued': 'В очереди',
+    'running': 'Обработка',
+    'ok': 'Готово',
+    'error': 'Ошибка',
+    'cancelled': 'Отменено',
+}
+
+
+def output_folder_for(file_path) -> str:
+    """Папка отчетов выгрузки: result_files/<имя выгрузки> (и для одной, и для нескольких)."""
+    return str(Path(DEFAULT_OUTPUT_FOLDER) / Path(file_path).stem)
 
 
 class AppGUI(tk.Tk):
@@ -10,45 +35,221 @@ class AppGUI(tk.Tk):
         super().__init__()
 
         self.title('Обработчик заданий студентов')
-        self.geometry('400x250')  # Немного увеличили высоту окна для размещения новой кнопки
+        self.geometry('640x520')  # Место для очереди выгрузок, индикатора хода и кнопки отмены
+
+        # Сообщения от фоновой обработки: ('progress', этап, доля), ('running', файл), ('file', файл, итог).
+        # Окно читает их в UI-потоке через after()
+        self.messages = queue.Queue()
+        self.worker = None
+        self.executor = None
+        self.futures = {}
+        self.results = {}
+        self.batch_started = 0.0
+        self.cancel_event = threading.Event()
 
         # Метка заголовка
         label_title = tk.Label(self, text="Обработчик заданий студентов", font=("Arial Bold", 18))
         label_title.pack(pady=10)
 
-        # Поле выбора файла
-        self.file_entry = tk.Entry(self, width=50)
-        self.file_entry.pack(padx=10, pady=10)
+        # Очередь выгрузок: статус, время обработки и количество работ по каждому файлу
+        self.files_view = ttk.Treeview(self, columns=('status', 'seconds', 'rows'), height=8)
+        self.files_view.heading('#0', text='Файл')
+        self.files_view.heading('status', text='Статус')
+        self.files_view.heading('seconds', text='Время, с')
+        self.files_view.heading('rows', text='Работ')
+        self.files_view.column('#0', width=330)
+        self.files_view.column('status', width=110)
+        self.files_view.column('seconds', width=80, anchor=tk.E)
+        self.files_view.column('rows', width=80, anchor=tk.E)
+        self.files_view.pack(padx=10, pady=5, fill=tk.X)
+
+        files_buttons = tk.Frame(self)
+        files_buttons.pack(pady=5)
+        self.button_add_files = tk.Button(files_buttons, text='Добавить файлы', command=self.add_files)
+        self.button_add_files.pack(side=tk.LEFT, padx=5)
+        self.button_add_folder = tk.Button(files_buttons, text='Добавить папку', command=self.add_folder)
+        self.button_add_folder.pack(side=tk.LEFT, padx=5)
+        self.button_clear = tk.Button(files_buttons, text='Очистить список', command=self.clear_files)
+        self.button_clear.pack(side=tk.LEFT, padx=5)
 
-        button_browse = tk.Button(self, text='Выбрать файл', command=self.browse_file)
-        button_browse.pack(pady=5)
+        # Кнопки запуска и отмены обработки
+        buttons = tk.Frame(self)
+        buttons.pack(pady=10)
+        self.button_process = tk.Button(buttons, text='Запустить обработку', command=self.start_processing)
+        self.button_process.pack(side=tk.LEFT, padx=5)
+        self.button_cancel = tk.Button(buttons, text='Отменить', command=self.cancel_processing,
+                                       state=tk.DISABLED)
+        self.button_cancel.pack(side=tk.LEFT, padx=5)
 
-        # Кнопка запуска обработки
-        button_process = tk.Button(self, text='Запустить обработку', command=self.start_processing)
-        button_process.pack(pady=10)
+        # Индикатор хода обработки и название текущего этапа
+        self.progress_bar = ttk.Progressbar(self, length=560, mode='determinate', maximum=100)
+        self.progress_bar.pack(pady=5)
+        self.stage_label = tk.Label(self, text="")
+        self.stage_label.pack()
 
         # Новая кнопка для открытия папки с результатами
         button_open_output = tk.Button(self, text='Открыть папку с результатами', command=self.open_output_folder)
         button_open_output.pack(pady=10)
 
-    def browse_file(self):
-        file_path = filedialog.askopenfilename(filetypes=(("Excel files", "*.xls*"), ("All files", "*.*")))
-        if file_path:
-            self.file_entry.delete(0, tk.END)
-            self.file_entry.insert(0, file_path)
+    def add_files(self):
+        file_paths = filedialog.askopenfilenames(filetypes=(("Excel files", "*.xls*"), ("All files", "*.*")))
+        for file_path in file_paths:
+            self._add_file(file_path)
+
+    def add_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            for file_path in sorted(Path(folder).glob(EXCEL_PATTERN)):
+                # Временные файлы открытых книг Excel (~$...) пропускаем
+                if not file_path.name.startswith('~$'):
+                    self._add_file(str(file_path))
+
+    def _add_file(self, file_path):
+        """Добавляет выгрузку в очередь (путь - идентификатор строки, повторы пропускаются)."""
+        file_path = str(Path(file_path).resolve())
+        if self.is_busy() or self.files_view.exists(file_path):
+            return
+        self.files_view.insert('', tk.END, iid=file_path, text=Path(file_path).name,
+                               values=(STATUS_LABELS['queued'], '', ''))
+
+    def clear_files(self):
+        if not self.is_busy():
+            self.files_view.delete(*self.files_view.get_children())
+
+    def is_busy(self):
+        return (self.worker is not None and self.worker.is_alive()) or bool(self.futures)
 
     def start_processing(self):
-        input_file = self.file_entry.get()
-        if not input_file.strip():
+        files = list(self.files_view.get_children())
+        if not files:
             messagebox.showwarning("Предупреждение", "Файл не выбран!")
             return
+        if self.is_busy():
+            return
 
+        for file_path in files:
+            self._set_status(file_path, 'queued')
+        self.results = {}
+        self.cancel_event.clear()
+        self.batch_started = time.perf_counter()
+        self.progress_bar['value'] = 0
+        self.stage_label.config(text="Запуск...")
+        self._set_controls(busy=True)
+
+        if len(files) == 1:
+            # Одна выгрузка - в фоновом потоке с ходом по этапам и отменой после текущего этапа
+            self.worker = threading.Thread(target=self._run_processing, args=(files[0],), daemon=True)
+            self.worker.start()
+        else:
+            # Несколько выгрузок - параллельно в процессах
+            workers = max(1, min(GUI_MAX_WORKERS, os.cpu_count() or 1, len(files)))
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+            for file_path in files:
+                future = self.executor.submit(run_input, file_path, output_folder_for(file_path))
+                self.futures[future] = file_path
+                future.add_done_callback(self._on_file_done)
+            self.executor.shutdown(wait=False)
+            self.stage_label.config(text=f"Обработка {len(files)} выгрузок ({workers} процессов)")
+        self.after(POLL_INTERVAL_MS, self._poll_messages)
+
+    def _run_processing(self, input_file):
+        """Выполняется в фоновом потоке: виджеты Tk здесь не трогаем, только очередь."""
+        progress = ProgressReporter(
+            callback=lambda stage, fraction: self.messages.put(('progress', stage, fraction)),
+            cancel_event=self.cancel_event
+        )
+        self.messages.put(('running', input_file))
+        summary = run_input(input_file, output_folder_for(input_file), progress=progress)
+        self.messages.put(('file', input_file, summary))
+
+    def _on_file_done(self, future):
+        """Вызывается потоком пула процессов: итог передается в окно через очередь."""
+        file_path = self.futures[future]
+        if future.cancelled():
+            summary = {'status': 'cancelled', 'rows': 0, 'seconds': None, 'error': None}
+        elif future.exception() is not None:
+            summary = {'status': 'error', 'rows': 0, 'seconds': None, 'error': str(future.exception())}
+        else:
+            summary = future.result()
+        self.messages.put(('file', file_path, summary))
+
+    def _poll_messages(self):
+        """Забирает сообщения фоновой обработки и обновляет окно (UI-поток)."""
         try:
-            processor = MainProcessor(input_file=input_file)
-            processor.execute()
-            messagebox.showinfo("Готово", "Обработка завершена успешно!")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Возникла ошибка: {e}")
+            while True:
+                message = self.messages.get_nowait()
+                if message[0] == 'progress':
+                    _, stage, fraction = message
+                    self.progress_bar['value'] = fraction * 100
+                    self.stage_label.config(text=stage)
+                elif message[0] == 'running':
+                    self._set_status(message[1], 'running')
+                else:
+                    _, file_path, summary = message
+                    self.results[file_path] = summary
+                    self._set_status(file_path, summary['status'], summary.get('seconds'), summary.get('rows'))
+        except queue.Empty:
+            pass
+
+        if self.futures:
+            # Пул сообщает только о завершении; начатые выгрузки отмечаются по состоянию задач
+            for future, file_path in self.futures.items():
+                if future.running() and file_path not in self.results:
+                    self._set_status(file_path, 'running')
+            self.progress_bar['value'] = len(self.results) / len(self.futures) * 100
+            if not self.cancel_event.is_set():
+                self.stage_label.config(text=f"Обработано {len(self.results)} из {len(self.futures)}")
+
+        if len(self.results) < (len(self.futures) or 1):
+            self.after(POLL_INTERVAL_MS, self._poll_messages)
+            return
+
+        self.futures = {}
+        self.executor = None
+        self._set_controls(busy=False)
+        self._show_results(time.perf_counter() - self.batch_started)
+
+    def _show_results(self, elapsed):
+        """Итоговое сообщение по всем выгрузкам очереди."""
+        failed = [f"{Path(file_path).name}: {summary['error']}"
+                  for file_path, summary in self.results.items() if summary['status'] == 'error']
+        warnings = [f"{Path(file_path).name}: {warning}"
+                    for file_path, summary in self.results.items() for warning in summary.get('warnings', ())]
+
+        if failed:
+            self.stage_label.config(text="Ошибка")
+            messagebox.showerror("Ошибка", "Возникла ошибка:\n" + "\n".join(failed))
+        elif any(summary['status'] == 'cancelled' for summary in self.results.values()):
+            self.stage_label.config(text="Отменено")
+            messagebox.showinfo("Отменено", "Обработка отменена")
+        else:
+            self.stage_label.config(text=f"Готово за {elapsed:.1f} с")
+            text = "Обработка завершена успешно!"
+            if warnings:
+                text += "\n\nПредупреждения:\n" + "\n".join(warnings)
+            messagebox.showinfo("Готово", text)
+
+    def _set_status(self, file_path, status, seconds=None, rows=None):
+        self.files_view.item(file_path, values=(
+            STATUS_LABELS[status],
+            '' if seconds is None else f"{seconds:.1f}",
+            rows or '',
+        ))
+
+    def _set_controls(self, busy):
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.button_process, self.button_add_files, self.button_add_folder, self.button_clear):
+            button.config(state=state)
+        self.button_cancel.config(state=tk.NORMAL if busy else tk.DISABLED)
+
+    def cancel_processing(self):
+        # Отмена срабатывает на границе этапов: текущий этап (например, чтение файла) завершится.
+        # В пуле процессов отменяются выгрузки из очереди, начатые доводятся до конца
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+        self.button_cancel.config(state=tk.DISABLED)
+        self.stage_label.config(text="Отмена после текущего этапа...")
 
     def open_output_folder(self):
         # Получаем путь к папке вывода
@@ -60,4 +261,4 @@ class AppGUI(tk.Tk):
 # Запуск приложения
 if __name__ == "__main__":
     app = AppGUI()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
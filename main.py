@@ -1,17 +1,51 @@
 """
 Основной модуль для запуска обработки данных о заданиях студентов.
 """
+import argparse
+import cProfile
+import glob
 import os
+import pstats
 import shutil
+import sys
+import time as timer
+from concurrent.futures import ProcessPoolExecutor
 from functools import wraps
-from datetime import datetime
+from datetime import datetime, time
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
-from config.constants import DEFAULT_OUTPUT_FOLDER, DEFAULT_INPUT_FILE, DEFAULT_input_FOLDER
+from config.constants import (
+    DEFAULT_OUTPUT_FOLDER, DEFAULT_INPUT_FILE, DEFAULT_input_FOLDER, DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS,
+    DUPLICATE_POLICIES, DUPLICATE_POLICY, FORECAST_HORIZON_DAYS
+)
+from core.calendars import CalendarRegistry
 from core.create_dataframes import DataProcessor
+from core.events import EVENTS, REPORT_WRITTEN, WARNING, EventLog
+from core.instrumentation import INSTRUMENTATION, write_json_report, write_prometheus_textfile
+from core.progress import ProcessingCancelled, ProgressReporter
+from core.scheduler import REPORT_TYPES, JobScheduler, ScheduledJob, shared_reports
 from models.course import CourseWorksProcessor
 from models.diploma import process_diploma_works
 from models.homework import process_unverified_works
+from models.forecast import process_forecast
+from models.assignments import process_assignments
+from models.workload import process_workload
+from models.aging import process_aging
+from models.utils import save_table
+
+# Названия отчетов для индикатора хода обработки
+REPORT_LABELS = {
+    'diploma': "Отчет по дипломным работам",
+    'homework': "Отчет по домашним работам",
+    'course': "Отчеты по курсовым работам",
+    'forecast': "Прогноз просрочки",
+    'assignments': "Рекомендации проверяющих",
+    'workload': "Нагрузка проверяющих",
+    'aging': "Сводка по возрасту работ",
+}
+# Доля общего хода, отведенная подготовке данных (остальное - отчеты)
+DATA_PROGRESS_SHARE = 0.6
 
 
 def clean_folders_decorator():
@@ -67,18 +101,38 @@ def clean_folders_decorator():
 class MainProcessor:
     """Основной класс для управления процессом обработки данных."""
 
-    def __init__(self, input_file: str = None, output_folder: str = None):
+    def __init__(self, input_file: str = None, output_folder: str = None,
+                 calendar_registry: CalendarRegistry = None, scheduler: JobScheduler = None,
+                 as_of: Optional[datetime] = None, output_format: str = DEFAULT_OUTPUT_FORMAT,
+                 progress: Optional[ProgressReporter] = None,
+                 duplicate_policy: Optional[str] = DUPLICATE_POLICY):
         """
         Инициализация процессора.
 
         Args:
             input_file: Путь к входному файлу
             output_folder: Папка для сохранения результатов
+            calendar_registry: Реестр календарей (для повторного использования между запусками)
+            scheduler: Планировщик отчетов (по умолчанию - из config/schedule.yaml)
+            as_of: Момент, на который формируются отчеты (по умолчанию - текущий)
+            output_format: Формат табличных отчетов (xlsx или csv)
+            progress: Ход обработки и флаг отмены (для GUI)
+            duplicate_policy: Какую из повторных строк оставлять ('latest', 'earliest'); None - все
         """
         self.input_file_path = Path(input_file or DEFAULT_INPUT_FILE)
         self.output_folder = Path(output_folder or DEFAULT_OUTPUT_FOLDER)
-        self.today_date = datetime.now().strftime("%Y-%m-%d")
-        self.day_name = datetime.now().strftime('%A')
+        self.calendar_registry = calendar_registry
+        self.scheduler = scheduler or JobScheduler()
+        # Момент запуска фиксируется один раз, чтобы запуск около полуночи был согласован
+        self.as_of = as_of
+        self.run_datetime = as_of or datetime.now()
+        self.report_date = self.run_datetime.date()
+        self.output_format = output_format
+        self.progress = progress or ProgressReporter()
+        self.duplicate_policy = duplicate_policy
+        self.today_date = self.run_datetime.strftime("%Y-%m-%d")
+        self.day_name = self.run_datetime.strftime('%A')
+        self.data_processor = None
 
     def validate_input_file(self) -> bool:
         """
@@ -102,14 +156,37 @@ class MainProcessor:
         """
         print(f"Обработка данных за {self.today_date}")
 
-        processor = DataProcessor(str(self.input_file_path))
+        processor = DataProcessor(
+            str(self.input_file_path),
+            calendar_registry=self.calendar_registry,
+            current_datetime=self.run_datetime,
+            progress=self.progress.part(0.0, DATA_PROGRESS_SHARE),
+            duplicate_policy=self.duplicate_policy
+        )
+        if self.as_of is not None:
+            # Работы, отправленные после as_of, в отчеты на эту дату не попадают
+            processor = processor.as_of(self.as_of)
         base_df, diploma_df, homework_df, course_df = processor.process_all()
+        self.data_processor = processor
+        self._save_duplicates()
 
         # Вывод статистики
         self._print_statistics(base_df, diploma_df, homework_df, course_df)
 
         return base_df, diploma_df, homework_df, course_df
 
+    def _save_duplicates(self) -> None:
+        """Сохраняет удаленные повторные строки (Повторы_<дата>), если они были."""
+        duplicates_df = self.data_processor.duplicates_df if self.data_processor is not None else None
+        if duplicates_df is None or duplicates_df.empty:
+            return
+
+        output_path = self.output_folder / f"Повторы_{self.today_date}.{self.output_format}"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        save_table(duplicates_df, output_path, self.output_format)
+        EVENTS.emit(REPORT_WRITTEN, 'duplicates', path=str(output_path), rows=len(duplicates_df))
+        print(f"Создан файл: {output_path}")
+
     def _print_statistics(self, base_df, diploma_df, homework_df, course_df) -> None:
         """Выводит статистику по обработанным данным."""
         print(f"Найдено записей:")
@@ -119,77 +196,423 @@ class MainProcessor:
         print(f"  - Курсовые: {len(course_df) if course_df is not None else 0}")
         print(f"Сегодня: {self.today_date} ({self.day_name})")
 
-    def run_thursday_processing(self, course_df) -> None:
-        """Запускает обработку для четверга."""
-        print("Четверг - обработка курсовых работ")
-        processor = CourseWorksProcessor()
-        processor.process_course_works(course_df, str(self.output_folder), strict_filter=False)
-
-    def run_regular_processing(self, diploma_df, homework_df) -> None:
-        """Запускает регулярную обработку (все дни кроме четверга)."""
-        print("Обработка дипломных и домашних работ")
-
-        # Обработка дипломных работ
-        self._process_diploma_works(diploma_df)
-
-        # Обработка домашних работ
-        self._process_homework_works(homework_df)
-
-        # Обработка курсовых работ
-        # self._process_course_works(course_df)
-
-    def _process_diploma_works(self, diploma_df) -> None:
+    def _process_diploma_works(self, diploma_df, output_folder: Optional[Path] = None) -> None:
         """Обрабатывает дипломные работы."""
         if diploma_df is not None and not diploma_df.empty:
-            process_diploma_works(diploma_df, str(self.output_folder))
+            process_diploma_works(diploma_df, str(output_folder or self.output_folder), self.report_date,
+                                  self.output_format)
         else:
             print("Нет данных по дипломным работам для обработки")
 
-    def _process_homework_works(self, homework_df) -> None:
+    def _process_homework_works(self, homework_df, output_folder: Optional[Path] = None) -> None:
         """Обрабатывает домашние работы."""
         if homework_df is not None and not homework_df.empty:
-            process_unverified_works(homework_df, str(self.output_folder))
+            process_unverified_works(homework_df, str(output_folder or self.output_folder), self.report_date,
+                                     self.output_format)
         else:
             print("Нет данных по домашним работам для обработки")
 
-    def _process_course_works(self, course_df) -> None:
+    def _process_forecast(self, job: Optional[ScheduledJob] = None, output_folder: Optional[Path] = None) -> None:
+        """Формирует прогноз работ, которые станут просроченными в ближайшие рабочие дни."""
+        if self.data_processor is None or self.data_processor.base_df is None:
+            print("Нет данных для прогноза просрочки")
+            return
+
+        kwargs = {}
+        if job is not None:
+            kwargs = {'strict_filter': job.strict, 'deadlines': job.thresholds}
+            if job.forecast_horizon is not None:
+                kwargs['horizon_days'] = job.forecast_horizon
+
+        forecast_df = self.data_processor.create_forecast_df(**kwargs)
+        if forecast_df is not None:
+            process_forecast(forecast_df, str(output_folder or self.output_folder), self.report_date,
+                             self.output_format, kwargs.get('horizon_days', FORECAST_HORIZON_DAYS))
+
+    def _process_assignments(self, output_folder: Optional[Path] = None):
+        """Предлагает проверяющих для работ без проверяющего с учетом их нагрузки."""
+        if self.data_processor is None or self.data_processor.base_df is None:
+            print("Нет данных для рекомендаций проверяющих")
+            return None
+
+        return process_assignments(
+            self.data_processor.base_df,
+            self.data_processor.get_reviewer_index(),
+            str(output_folder or self.output_folder),
+            self.report_date,
+            self.output_format
+        )
+
+    def _process_workload(self, job: Optional[ScheduledJob] = None, output_folder: Optional[Path] = None) -> None:
+        """Формирует сводку нагрузки проверяющих, координаторов и профессий."""
+        if self.data_processor is None or self.data_processor.base_df is None:
+            print("Нет данных для отчета о нагрузке")
+            return
+
+        kwargs = {}
+        if job is not None:
+            kwargs = {'strict_filter': job.strict, 'deadlines': job.thresholds}
+        process_workload(self.data_processor.base_df, str(output_folder or self.output_folder),
+                         self.report_date, self.output_format,
+                         reviewer_index=self.data_processor.get_reviewer_index(), **kwargs)
+
+    def _process_aging(self, output_folder: Optional[Path] = None) -> None:
+        """Сохраняет сводку по возрасту работ (координаторы и ведущие координаторы)."""
+        if self.data_processor is None or self.data_processor.base_df is None:
+            print("Нет данных для сводки по возрасту работ")
+            return
+
+        process_aging(self.data_processor.get_aging_pivot, str(output_folder or self.output_folder),
+                      self.report_date, self.output_format)
+
+    def _process_course_works(self, course_df, job: Optional[ScheduledJob] = None,
+                              output_folder: Optional[Path] = None) -> None:
         """Обрабатывает курсовые работы."""
         if course_df is not None and not course_df.empty:
-            processor = CourseWorksProcessor()
-            processor.process_course_works(course_df, str(self.output_folder))
+            if job is None:
+                processor = CourseWorksProcessor(report_date=self.report_date, output_format=self.output_format)
+                processor.process_course_works(course_df, str(output_folder or self.output_folder))
+            else:
+                processor = CourseWorksProcessor(
+                    deadline=job.deadline('COURSE_PROJECT'),
+                    report_date=self.report_date,
+                    output_format=self.output_format
+                )
+                processor.process_course_works(course_df, str(output_folder or self.output_folder),
+                                               strict_filter=job.strict)
         else:
             print("Нет данных по курсовым работам для обработки")
 
-    def execute(self) -> None:
-        """Основной метод выполнения обработки."""
+    def run_job(self, job: ScheduledJob, progress: Optional[ProgressReporter] = None,
+                shared: Iterable[str] = ()) -> None:
+        """
+        Выполняет задание расписания на уже подготовленных данных.
+
+        Args:
+            job: Задание расписания
+            progress: Часть общего хода обработки, отведенная заданию
+            shared: Отчеты, которые входят и в другие задания этого запуска
+                    (см. shared_reports); они сохраняются в подпапку <папка>/<имя задания>,
+                    чтобы задания с разными сроками не перезаписывали файлы друг друга
+        """
+        print(f"Задание '{job.name}': {', '.join(job.reports)}")
+        processor = self.data_processor
+        progress = progress or ProgressReporter()
+
+        for number, report in enumerate(job.reports):
+            progress.update(REPORT_LABELS[report], number / len(job.reports))
+            folder = self.output_folder / job.name if report in shared else None
+            with EVENTS.stage(f'report.{report}') as stage:
+                if report == 'diploma':
+                    self._process_diploma_works(processor.diploma_df, folder)
+                    report_df = processor.diploma_df
+                elif report == 'homework':
+                    report_df = processor.create_homework_df(
+                        strict_filter=job.strict,
+                        min_days=job.deadline('HOMEWORK')
+                    )
+                    self._process_homework_works(report_df, folder)
+                elif report == 'course':
+                    self._process_course_works(processor.course_df, job, folder)
+                    report_df = processor.course_df
+                elif report == 'assignments':
+                    report_df = self._process_assignments(folder)
+                elif report == 'workload':
+                    self._process_workload(job, folder)
+                    report_df = processor.base_df
+                elif report == 'aging':
+                    self._process_aging(folder)
+                    report_df = processor.base_df
+                else:
+                    self._process_forecast(job, folder)
+                    report_df = processor.forecast_df
+                stage.rows = len(report_df) if report_df is not None else 0
+
+    def execute(self, jobs: Optional[List[ScheduledJob]] = None) -> None:
+        """
+        Основной метод выполнения обработки.
+
+        Args:
+            jobs: Задания для выполнения. По умолчанию - задания расписания,
+                  наступившие на момент запуска.
+        """
         if not self.validate_input_file():
             return
 
-        try:
-            # Обработка данных
-            base_df, diploma_df, homework_df, course_df = self.process_data()
+        if jobs is None:
+            jobs = self.scheduler.due_jobs(self.run_datetime)
+        if not jobs:
+            print(f"Нет заданий по расписанию на {self.today_date} ({self.day_name})")
+            return
 
-            # Запуск соответствующей обработки в зависимости от дня недели
-            if self.day_name == 'Thursday':
-                self.run_thursday_processing(course_df)
-            else:
-                self.run_regular_processing(diploma_df, homework_df)
-                # self.run_regular_processing(diploma_df, homework_df, course_df)
+        try:
+            with EVENTS.stage('run'):
+                # Обработка данных выполняется один раз для всех заданий
+                self.process_data()
+                if self.data_processor.base_df is None:
+                    # Задания остаются невыполненными: выгрузку не удалось прочитать
+                    print(f"Не удалось подготовить данные из {self.input_file_path}")
+                    return
+
+                total = sum(len(job.reports) for job in jobs) or 1
+                done = 0
+                shared = shared_reports(jobs)
+                for job in jobs:
+                    share = len(job.reports) / total
+                    start = DATA_PROGRESS_SHARE + (1 - DATA_PROGRESS_SHARE) * done / total
+                    self.run_job(job, self.progress.part(start, start + (1 - DATA_PROGRESS_SHARE) * share), shared)
+                    done += len(job.reports)
+            self.scheduler.mark_run(jobs, self.run_datetime)
+            self.progress.finish("Готово")
 
             print("Обработка завершена успешно!")
 
+        except ProcessingCancelled:
+            print("Обработка отменена")
+            raise
         except Exception as e:
             print(f"Произошла ошибка при обработке: {e}")
             raise
+        finally:
+            # Подписчики с пакетной доставкой получают остаток событий
+            EVENTS.flush()
+
+def parse_as_of(value: str) -> datetime:
+    """
+    Разбирает дату или дату со временем (ISO).
+
+    Для даты без времени берется конец дня: отчет формируется
+    по состоянию на конец указанного дня.
+    """
+    moment = datetime.fromisoformat(value.strip())
+    if len(value.strip()) <= 10:
+        moment = datetime.combine(moment.date(), time(23, 59, 59))
+    return moment
+
+
+def expand_inputs(patterns: List[str]) -> List[Path]:
+    """Раскрывает пути и шаблоны (glob) во входные файлы без повторов."""
+    files = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            files.setdefault(Path(match).resolve(), Path(match))
+    return list(files.values())
+
+
+def run_input(
+        input_file: str,
+        output_folder: str,
+        as_of: Optional[datetime] = None,
+        reports: Optional[List[str]] = None,
+        strict: bool = False,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        profile: bool = False,
+        instrument: bool = False,
+        trace_memory: bool = True,
+        what_if: Optional[List[int]] = None,
+        duplicate_policy: Optional[str] = DUPLICATE_POLICY,
+        progress: Optional[ProgressReporter] = None
+) -> Dict[str, Any]:
+    """
+    Обрабатывает одну выгрузку (выполняется в том числе в отдельном процессе).
+
+    Args:
+        input_file: Путь к выгрузке
+        output_folder: Папка для отчетов
+        as_of: Момент, на который формируются отчеты
+        reports: Отчеты; None - по расписанию schedule.yaml
+        strict: Строгая фильтрация (> срока)
+        output_format: Формат табличных отчетов
+        profile: Сохранить профиль cProfile в папку отчетов
+        instrument: Собрать этапы обработки (время, CPU, строки, память) в summary['spans']
+        trace_memory: Измерять пик памяти этапов (tracemalloc заметно замедляет обработку)
+        what_if: Пороги в днях для таблицы "что если" (summary['what_if']: работ >= N и > N по типам)
+        duplicate_policy: Какую из повторных строк оставлять ('latest', 'earliest'); None - все
+        progress: Ход обработки и флаг отмены (только в том же процессе, например в GUI)
+
+    Returns:
+        Итог обработки для сводки (в том числе сохраненные файлы и предупреждения)
+    """
+    started = timer.perf_counter()
+    processor = MainProcessor(input_file, output_folder, as_of=as_of, output_format=output_format,
+                              progress=progress, duplicate_policy=duplicate_policy)
+
+    if reports:
+        jobs = [ScheduledJob('cli', reports, strict=strict)]
+    else:
+        jobs = processor.scheduler.due_jobs(processor.run_datetime)
+        for job in jobs:
+            job.strict = job.strict or strict
+
+    summary = {'input': input_file, 'status': 'ok', 'rows': 0,
+               'reports': sorted({report for job in jobs for report in job.reports}), 'error': None}
+    profiler = cProfile.Profile() if profile else None
+    event_log = EVENTS.subscribe(EventLog(), kinds=(REPORT_WRITTEN, WARNING))
+    if instrument:
+        INSTRUMENTATION.enable(trace_memory)
+    try:
+        if profiler is not None:
+            profiler.enable()
+        if not processor.validate_input_file():
+            summary['status'] = 'error'
+            summary['error'] = "Файл не найден"
+        else:
+            Path(output_folder).mkdir(parents=True, exist_ok=True)
+            processor.execute(jobs)
+            if jobs and (processor.data_processor is None or processor.data_processor.base_df is None):
+                summary['status'] = 'error'
+                summary['error'] = "Не удалось прочитать выгрузку"
+            elif processor.data_processor is not None:
+                summary['rows'] = len(processor.data_processor.base_df)
+                if what_if:
+                    summary['what_if'] = processor.data_processor.get_age_stats().sweep(what_if).to_dict('records')
+    except ProcessingCancelled:
+        summary['status'] = 'cancelled'
+    except Exception as e:
+        summary['status'] = 'error'
+        summary['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        EVENTS.unsubscribe(event_log)
+        summary['written'] = [event.data['path'] for event in event_log.of_kind(REPORT_WRITTEN)]
+        summary['warnings'] = [event.data['message'] for event in event_log.of_kind(WARNING)]
+        if instrument:
+            summary['spans'] = INSTRUMENTATION.disable()
+        if profiler is not None:
+            profiler.disable()
+            profile_path = Path(output_folder) / f"profile_{Path(input_file).stem}.prof"
+            profiler.dump_stats(str(profile_path))
+            pstats.Stats(str(profile_path)).sort_stats('cumulative').print_stats(15)
+            summary['profile'] = str(profile_path)
+
+    summary['seconds'] = round(timer.perf_counter() - started, 2)
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Обработка выгрузок Work Analysis. Без аргументов - обработка "
+                    f"{DEFAULT_INPUT_FILE} по расписанию с очисткой папок."
+    )
+    parser.add_argument('inputs', nargs='*', help="Выгрузки или шаблоны (glob), например 'exports/*.xlsx'")
+    parser.add_argument('-o', '--output-folder', default=DEFAULT_OUTPUT_FOLDER, help="Папка для отчетов")
+    parser.add_argument('-r', '--reports', nargs='+', choices=REPORT_TYPES,
+                        help="Отчеты (по умолчанию - по расписанию config/schedule.yaml)")
+    parser.add_argument('--as-of', type=parse_as_of,
+                        help="Дата отчетов (ГГГГ-ММ-ДД или ГГГГ-ММ-ДДTЧЧ:ММ), по умолчанию - сейчас")
+    parser.add_argument('--strict', action='store_true', help="Строгая фильтрация (> срока вместо >= срока)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Количество процессов для нескольких выгрузок")
+    parser.add_argument('-f', '--format', dest='output_format', choices=OUTPUT_FORMATS,
+                        default=DEFAULT_OUTPUT_FORMAT, help="Формат табличных отчетов")
+    parser.add_argument('--profile', action='store_true',
+                        help="Профилировать обработку (cProfile, файл profile_<выгрузка>.prof)")
+    parser.add_argument('--run-report', metavar='PATH',
+                        help="Сохранить этапы обработки (время, CPU, строки, пик памяти) в JSON")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="Сохранить метрики этапов в textfile для node_exporter (.prom)")
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help="Не измерять пик памяти этапов (без накладных расходов tracemalloc)")
+    parser.add_argument('--duplicates', choices=DUPLICATE_POLICIES + ('keep',), default=DUPLICATE_POLICY or 'keep',
+                        help="Повторные строки одной работы: оставить последнюю (latest) или первую (earliest) "
+                             "отправку, keep - не удалять. Удаленные строки - в файле Повторы_<дата>")
+    parser.add_argument('--what-if', nargs='+', type=int, metavar='N',
+                        help="Показать, сколько работ каждого типа было бы просрочено при сроке N дней "
+                             "(>= N и > N)")
+    return parser
+
+
+def print_summary(results: List[Dict[str, Any]], elapsed: float) -> None:
+    """Выводит сводку по всем выгрузкам."""
+    print("=" * 50)
+    print("Сводка:")
+    for result in results:
+        line = f"  [{result['status']}] {result['input']}: {result['rows']} работ, {result['seconds']} с"
+        if result['reports']:
+            line += f", отчеты: {', '.join(result['reports'])}"
+        print(line)
+        if result['error']:
+            print(f"      ошибка: {result['error']}")
+        if result.get('written'):
+            print(f"      файлов: {len(result['written'])}")
+        for warning in result.get('warnings', ()):
+            print(f"      предупреждение: {warning}")
+        if result.get('profile'):
+            print(f"      профиль: {result['profile']}")
+        if result.get('what_if'):
+            print("      что если (работ с возрастом >= N и > N рабочих дней):")
+            columns = list(result['what_if'][0])
+            print("        " + "  ".join(columns))
+            for row in result['what_if']:
+                print("        " + "  ".join(f"{row[column]:>{len(column)}}" for column in columns))
+    failed = sum(result['status'] != 'ok' for result in results)
+    print(f"Выгрузок: {len(results)}, с ошибками: {failed}, общее время: {elapsed:.1f} с")
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    """
+    Обрабатывает выгрузки из командной строки (без очистки папок).
+
+    Returns:
+        Код возврата: 0 - все выгрузки обработаны, 1 - есть ошибки
+    """
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print(f"Не найдено ни одной выгрузки по шаблонам: {args.inputs}")
+        return 1
+
+    started = timer.perf_counter()
+    instrument = bool(args.run_report or args.prometheus)
+    output_folder = Path(args.output_folder)
+    tasks = []
+    for input_file in inputs:
+        # При нескольких выгрузках отчеты каждой сохраняются в отдельную подпапку
+        folder = output_folder / input_file.stem if len(inputs) > 1 else output_folder
+        tasks.append((str(input_file), str(folder), args.as_of, args.reports,
+                      args.strict, args.output_format, args.profile, instrument, not args.no_trace_memory,
+                      args.what_if, None if args.duplicates == 'keep' else args.duplicates))
+
+    workers = max(1, min(args.workers, len(tasks)))
+    if workers == 1:
+        results = [run_input(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_input, *zip(*tasks)))
+
+    print_summary(results, timer.perf_counter() - started)
+    if args.run_report:
+        write_json_report(args.run_report, results)
+    if args.prometheus:
+        write_prometheus_textfile(args.prometheus, results)
+    return int(any(result['status'] != 'ok' for result in results))
+
 
 @clean_folders_decorator()
-def main():
+def run_default():
     """
-    Основная функция для запуска обработки.
+    Обработка по умолчанию: DEFAULT_INPUT_FILE по расписанию с очисткой папок.
     """
     processor = MainProcessor()
     processor.execute()
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Основная функция для запуска обработки.
+
+    Args:
+        argv: Аргументы командной строки (по умолчанию sys.argv[1:])
+
+    Returns:
+        Код возврата
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_default()
+        return 0
+    return run_cli(build_parser().parse_args(argv))
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Модуль для формирования сводки по возрасту работ (координаторы и ведущие координаторы).
+"""
+import pandas as pd
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config.constants import DEFAULT_OUTPUT_FORMAT
+from core.age_stats import AGING_GROUPINGS
+from core.events import REPORT_WRITTEN, emit
+from models.utils import save_tables
+
+
+class AgingProcessor:
+    """
+    Класс для сохранения сводки: координатор (ведущий координатор) x
+    интервал возраста AGE_BUCKETS x тип работы, с итогами.
+    """
+
+    def __init__(
+            self,
+            date_format: str = "%Y-%m-%d",
+            report_date: Optional[date] = None,
+            output_format: str = DEFAULT_OUTPUT_FORMAT
+    ):
+        """
+        Args:
+            date_format: Формат даты для именования файлов
+            report_date: Дата отчета для имени файла (по умолчанию - текущая)
+            output_format: Формат файла (xlsx или csv)
+        """
+        self.date_format = date_format
+        self.report_date = report_date
+        self.output_format = output_format
+
+    def process_aging(
+            self,
+            get_pivot: Callable[[str], pd.DataFrame],
+            output_folder: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Сохраняет сводки по всем разрезам AGING_GROUPINGS.
+
+        Args:
+            get_pivot: Функция разрез -> сводка (обычно DataProcessor.get_aging_pivot, с кэшем)
+            output_folder: Папка для сохранения
+
+        Returns:
+            Словарь лист -> сводка
+
+        Raises:
+            IOError: При ошибках сохранения файла
+        """
+        tables = {sheet: get_pivot(by) for by, (_, sheet) in AGING_GROUPINGS.items()}
+        self._save(tables, output_folder)
+        return tables
+
+    def _save(self, tables: Dict[str, pd.DataFrame], output_folder: Optional[str] = None) -> None:
+        """
+        Сохраняет сводки.
+
+        Raises:
+            IOError: При ошибках сохранения
+        """
+        today_date = (self.report_date or date.today()).strftime(self.date_format)
+        output_filename = f"Возраст_работ_{today_date}.{self.output_format}"
+        output_path = Path(output_folder) / output_filename if output_folder else Path(output_filename)
+
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # В xlsx все листы в одном файле; в строках события - строки первого листа
+            for path, table in zip(save_tables(tables, output_path, self.output_format), tables.values()):
+                emit(REPORT_WRITTEN, 'aging', path=str(path), rows=len(table))
+                print(f"Файл успешно сохранён: {path}")
+        except Exception as e:
+            raise IOError(f"Ошибка при сохранении файла: {e}")
+
+
+def process_aging(
+        get_pivot: Callable[[str], pd.DataFrame],
+        output_folder: Optional[str] = None,
+        report_date: Optional[date] = None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
+) -> Dict[str, pd.DataFrame]:
+    """
+    Основная функция сохранения сводки по возрасту работ.
+
+    Args:
+        get_pivot: Функция разрез -> сводка (DataProcessor.get_aging_pivot)
+        output_folder: Папка для сохранения
+        report_date: Дата отчета для имени файла
+        output_format: Формат файла (xlsx или csv)
+
+    Returns:
+        Словарь лист -> сводка
+    """
+    processor = AgingProcessor(report_date=report_date, output_format=output_format)
+    return processor.process_aging(get_pivot, output_folder)
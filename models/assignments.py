@@ -0,0 +1,175 @@
+"""
+Модуль для формирования рекомендаций проверяющих для работ без проверяющего.
+"""
+import pandas as pd
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config.constants import DEADLINE_TYPE_NAMES, DEFAULT_OUTPUT_FORMAT
+from config.modules import SELF_ASSIGNMENT_MODULES
+from core.events import REPORT_WRITTEN, WARNING, emit
+from core.get_coordinators import coordinator_names
+from core.reviewers import ReviewerIndex
+from models.utils import save_table
+
+
+class AssignmentProcessor:
+    """
+    Класс для распределения работ без проверяющего по возможным проверяющим.
+
+    Работы из SELF_ASSIGNMENT_MODULES не распределяются (как и в отчете
+    "Курсовые без проверяющих"): их проверяющие берут сами.
+    """
+
+    RESULT_COLUMNS = [
+        'Рекомендуемый проверяющий',
+        'Работ у проверяющего с учетом рекомендаций',
+        'Тип работы',
+        'Координатор',
+        'Модуль',
+        'Название задания',
+        'Ссылка на работу в админке',
+        'Ссылка на работу в ЛК эксперта',
+        'ID студента',
+        'Отправлена',
+        'Срок проверки',
+        'Возможные проверяющие',
+        'Дней на проверке',
+    ]
+
+    def __init__(
+            self,
+            date_format: str = "%Y-%m-%d",
+            report_date: Optional[date] = None,
+            output_format: str = DEFAULT_OUTPUT_FORMAT
+    ):
+        """
+        Args:
+            date_format: Формат даты для именования файлов
+            report_date: Дата отчета для имени файла (по умолчанию - текущая)
+            output_format: Формат файла (xlsx или csv)
+        """
+        self.date_format = date_format
+        self.report_date = report_date
+        self.output_format = output_format
+        self.self_assignment_modules = set(SELF_ASSIGNMENT_MODULES)
+
+    def process_assignments(
+            self,
+            base_df: pd.DataFrame,
+            reviewer_index: ReviewerIndex,
+            output_folder: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Распределяет работы без проверяющего и сохраняет рекомендации.
+
+        Args:
+            base_df: Обогащенный DataFrame из DataProcessor
+            reviewer_index: Индекс возможных проверяющих по тому же base_df
+            output_folder: Папка для сохранения файла
+
+        Returns:
+            Подготовленный DataFrame (сначала самые старые работы)
+
+        Raises:
+            TypeError: Если base_df не является DataFrame
+            IOError: При ошибках сохранения файла
+        """
+        if not isinstance(base_df, pd.DataFrame):
+            raise TypeError("base_df должен быть объектом pandas.DataFrame")
+
+        report_df = self._prepare_dataframe(base_df, reviewer_index)
+        self._save_to_file(report_df, output_folder)
+
+        without_candidates = int((report_df['Рекомендуемый проверяющий'] == '').sum())
+        if without_candidates:
+            emit(WARNING, 'assignments_without_candidates', rows=without_candidates,
+                 message=f"Работ без проверяющего и без возможных проверяющих: {without_candidates}")
+        return report_df
+
+    def _prepare_dataframe(self, base_df: pd.DataFrame, reviewer_index: ReviewerIndex) -> pd.DataFrame:
+        """
+        Выбирает работы без проверяющего и добавляет рекомендованного проверяющего.
+
+        Args:
+            base_df: Исходный DataFrame
+            reviewer_index: Индекс возможных проверяющих
+
+        Returns:
+            DataFrame для сохранения
+        """
+        mask = reviewer_index.unassigned
+        if 'Базовый_модуль' in base_df.columns:
+            mask = mask & ~base_df['Базовый_модуль'].isin(self.self_assignment_modules).to_numpy()
+
+        age = base_df['Дней на проверке'].to_numpy(dtype=float)
+        suggested, load_after = reviewer_index.recommend(mask, age)
+
+        positions = np.flatnonzero(mask)
+        # Сначала самые старые работы - в том же порядке, в котором они распределялись
+        positions = positions[np.lexsort((positions, -np.nan_to_num(age[positions], nan=0.0)))]
+
+        df = base_df.iloc[positions].copy()
+        names = np.array(reviewer_index.names + [''], dtype=object)
+        df['Рекомендуемый проверяющий'] = names[suggested[positions]]
+        df['Работ у проверяющего с учетом рекомендаций'] = np.where(
+            load_after[positions] >= 0, load_after[positions], pd.NA
+        )
+        df['Тип работы'] = df['Тип срока'].map(DEADLINE_TYPE_NAMES)
+
+        df['Координатор'] = coordinator_names(df['coord_id'])
+
+        available_columns = [col for col in self.RESULT_COLUMNS if col in df.columns]
+        return df[available_columns]
+
+    def _save_to_file(self, df: pd.DataFrame, output_folder: Optional[str] = None) -> None:
+        """
+        Сохраняет DataFrame в файл.
+
+        Args:
+            df: DataFrame для сохранения
+            output_folder: Папка для сохранения
+
+        Raises:
+            IOError: При ошибках сохранения
+        """
+        today_date = (self.report_date or date.today()).strftime(self.date_format)
+        output_filename = f"Рекомендации_проверяющих_{today_date}.{self.output_format}"
+        output_path = Path(output_folder) / output_filename if output_folder else Path(output_filename)
+
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            save_table(df, output_path, self.output_format)
+            emit(REPORT_WRITTEN, 'assignments', path=str(output_path), rows=len(df))
+            print(f"Файл успешно сохранён: {output_path}")
+            print(f"Рекомендованы проверяющие для {int((df['Рекомендуемый проверяющий'] != '').sum())} "
+                  f"из {len(df)} работ без проверяющего")
+        except Exception as e:
+            raise IOError(f"Ошибка при сохранении файла: {e}")
+
+
+def process_assignments(
+        base_df: pd.DataFrame,
+        reviewer_index: ReviewerIndex,
+        output_folder: Optional[str] = None,
+        report_date: Optional[date] = None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
+) -> pd.DataFrame:
+    """
+    Основная функция формирования рекомендаций проверяющих.
+
+    Args:
+        base_df: Обогащенный DataFrame из DataProcessor
+        reviewer_index: Индекс возможных проверяющих по тому же base_df
+        output_folder: Папка для сохранения
+        report_date: Дата отчета для имени файла
+        output_format: Формат файла (xlsx или csv)
+
+    Returns:
+        Подготовленный DataFrame
+    """
+    processor = AssignmentProcessor(report_date=report_date, output_format=output_format)
+    return processor.process_assignments(base_df, reviewer_index, output_folder)
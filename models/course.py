@@ -4,13 +4,15 @@
 import pandas as pd
 from datetime import date, datetime
 from pathlib import Path
-from typing import Set
+from typing import Optional, Set
 import time
 
 from config.modules import DIPLOMA_MODULES, SELF_ASSIGNMENT_MODULES, COORDINATORS
-from config.constants import REVIEW_DEADLINES
+from config.constants import DEFAULT_OUTPUT_FORMAT, REVIEW_DEADLINES
+from core.events import REPORT_WRITTEN, WARNING, emit
 from core.get_coordinators import get_coordinator_name
 from core.get_module import get_base_module
+from models.utils import save_table
 
 
 class CourseWorksProcessor:
@@ -19,11 +21,21 @@ class CourseWorksProcessor:
     Использует уже подготовленные данные из DataProcessor.
     """
 
-    def __init__(self):
+    def __init__(self, deadline: Optional[int] = None, report_date: Optional[date] = None,
+                 output_format: str = DEFAULT_OUTPUT_FORMAT):
+        """
+        Args:
+            deadline: Срок проверки курсовых в рабочих днях
+                      (по умолчанию REVIEW_DEADLINES['COURSE_PROJECT'])
+            report_date: Дата отчета для имен файлов (по умолчанию - текущая)
+            output_format: Формат таблицы просроченных работ (xlsx или csv)
+        """
         self.diploma_modules: Set[str] = set(DIPLOMA_MODULES)
         self.self_assignment_modules: Set[str] = set(SELF_ASSIGNMENT_MODULES)
         self.coordinators = COORDINATORS
-        self.deadline_cor = REVIEW_DEADLINES['COURSE_PROJECT']
+        self.deadline_cor = deadline if deadline is not None else REVIEW_DEADLINES['COURSE_PROJECT']
+        self.report_date = report_date
+        self.output_format = output_format
 
     def process_course_works(self, course_df: pd.DataFrame, output_folder: str, strict_filter: bool = False) -> None:
         """
@@ -95,7 +107,7 @@ class CourseWorksProcessor:
                 coordinators_without_reviewers[coordinator_name].append(row)
 
             # Создаем файлы
-            today_str = date.today().strftime("%Y-%m-%d")
+            today_str = (self.report_date or date.today()).strftime("%Y-%m-%d")
             output_path = Path(output_folder)
 
             # Файл с работами без проверяющих
@@ -115,6 +127,7 @@ class CourseWorksProcessor:
                 else:
                     f.write("Нет работ без проверяющих\n")
                     print("Нет работ без проверяющих")
+            emit(REPORT_WRITTEN, 'course_no_reviewers', path=str(no_reviewers_file), rows=len(no_reviewer_df))
 
             # Файл с неизвестными координаторами
             if unknown_coordinators:
@@ -123,6 +136,10 @@ class CourseWorksProcessor:
                     for coord_id in unknown_coordinators:
                         f.write(f"{coord_id}\n")
                 print(f"Создан файл: {unknown_coords_file}")
+                emit(REPORT_WRITTEN, 'course_unknown_coordinators', path=str(unknown_coords_file),
+                     rows=len(unknown_coordinators))
+                emit(WARNING, 'course_unknown_coordinators', values=sorted(unknown_coordinators),
+                     message=f"Курсовые без проверяющих у неизвестных координаторов: {len(unknown_coordinators)}")
 
         except Exception as e:
             print(f"Ошибка при создании файла 'Курсовые без проверяющих': {e}")
@@ -149,7 +166,7 @@ class CourseWorksProcessor:
                 overdue_coordinators.add(coordinator_name)
 
             # Создаем файл
-            today_str = date.today().strftime("%Y-%m-%d")
+            today_str = (self.report_date or date.today()).strftime("%Y-%m-%d")
             output_path = Path(output_folder)
 
             coords_file = output_path / f'Координаторы_просроченных_курсовых_работ_{today_str}.txt'
@@ -162,6 +179,7 @@ class CourseWorksProcessor:
                 else:
                     f.write("Нет координаторов с просроченными работами\n")
                     print("Нет координаторов с просроченными работами")
+            emit(REPORT_WRITTEN, 'course_overdue_coordinators', path=str(coords_file), rows=len(overdue_coordinators))
 
         except Exception as e:
             print(f"Ошибка при создании файла координаторов просроченных работ: {e}")
@@ -189,6 +207,7 @@ class CourseWorksProcessor:
                 'Ссылка на работу в ЛК эксперта',
                 'ID студента',
                 'Отправлена',
+                'Срок проверки',
                 'Проверяющий',
                 'Возможные проверяющие',
                 'Дней на проверке',
@@ -197,9 +216,9 @@ class CourseWorksProcessor:
             # Проверяем наличие всех нужных колонок
             available_columns = [col for col in result_columns if col in overdue_df.columns]
 
-            today_str = date.today().strftime("%Y-%m-%d")
+            today_str = (self.report_date or date.today()).strftime("%Y-%m-%d")
             output_path = Path(output_folder)
-            excel_file = output_path / f'Просроченные_курсовые_{today_str}.xlsx'
+            excel_file = output_path / f'Просроченные_курсовые_{today_str}.{self.output_format}'
 
             if len(overdue_df) > 0:
                 # Используем только доступные колонки
@@ -219,6 +238,7 @@ class CourseWorksProcessor:
                 empty_df = pd.DataFrame(columns=result_columns)
                 self._save_dataframe_safe(empty_df, excel_file)
                 print(f"Создан пустой файл: {excel_file}")
+            emit(REPORT_WRITTEN, 'course_overdue', path=str(excel_file), rows=len(overdue_df))
 
         except Exception as e:
             print(f"Ошибка при создании файла просроченных работ: {e}")
@@ -262,7 +282,7 @@ class CourseWorksProcessor:
                 # Создаем папку если она не существует
                 file_path.parent.mkdir(parents=True, exist_ok=True)
 
-                df.to_excel(file_path, index=False, engine='openpyxl')
+                save_table(df, file_path, self.output_format)
                 break
 
             except PermissionError:
@@ -271,9 +291,9 @@ class CourseWorksProcessor:
                 else:
                     # Генерируем уникальное имя файла
                     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                    backup_filename = f"Просроченные_курсовые_{timestamp}.xlsx"
+                    backup_filename = f"Просроченные_курсовые_{timestamp}.{self.output_format}"
                     backup_path = file_path.parent / backup_filename
-                    df.to_excel(backup_path, index=False, engine='openpyxl')
+                    save_table(df, backup_path, self.output_format)
                     print(f"Файл сохранен с альтернативным именем: {backup_path}")
                     break
 
@@ -2,8 +2,13 @@ import pandas as pd
 from datetime import datetime, date
 import os
 
+from config.constants import DEFAULT_OUTPUT_FORMAT
+from core.events import REPORT_WRITTEN, emit
+from models.utils import save_table
 
-def process_diploma_works(diploma_df, output_folder=None):
+
+def process_diploma_works(diploma_df, output_folder=None, report_date=None,
+                          output_format=DEFAULT_OUTPUT_FORMAT):
     """
     Обрабатывает DataFrame с дипломными работами и сохраняет в Excel-файл.
 
@@ -11,7 +16,9 @@ def process_diploma_works(diploma_df, output_folder=None):
         diploma_df (pd.DataFrame): Исходный DataFrame с данными о дипломных работах
         output_folder (str, optional): Папка для сохранения файла.
             Если None — сохраняется в текущую директорию.
-
+        report_date (date, optional): Дата отчета для имени файла.
+            Если None — текущая дата.
+        output_format (str, optional): Формат файла (xlsx или csv).
 
     Returns:
         pd.DataFrame: Обработанный DataFrame (без столбца 'Возможные проверяющие')
@@ -30,9 +37,9 @@ def process_diploma_works(diploma_df, output_folder=None):
     # else:
     #     print("Столбец 'Возможные проверяющие' не найден — пропуск удаления.")
 
-    # Формирование имени файла с текущей датой
-    today_date = datetime.now().strftime("%Y-%m-%d")
-    output_filename = f"Дипломные_работы_{today_date}.xlsx"
+    # Формирование имени файла с датой отчета
+    today_date = (report_date or date.today()).strftime("%Y-%m-%d")
+    output_filename = f"Дипломные_работы_{today_date}.{output_format}"
 
     # Определение полного пути для сохранения
     if output_folder:
@@ -43,9 +50,10 @@ def process_diploma_works(diploma_df, output_folder=None):
     else:
         output_path = output_filename
 
-    # Сохранение в Excel
+    # Сохранение файла
     try:
-        diploma_df.to_excel(output_path, index=False, engine='openpyxl')
+        save_table(diploma_df, output_path, output_format)
+        emit(REPORT_WRITTEN, 'diploma', path=str(output_path), rows=len(diploma_df))
         print(f"Файл успешно сохранён: {output_path}")
         print(f"Сохранено {len(diploma_df)} записей")
     except Exception as e:
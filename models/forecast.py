@@ -0,0 +1,147 @@
+"""
+Модуль для формирования прогноза просрочки ("под риском завтра").
+"""
+import pandas as pd
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from config.constants import DEADLINE_TYPE_NAMES, DEFAULT_OUTPUT_FORMAT, FORECAST_HORIZON_DAYS
+from core.get_coordinators import coordinator_names
+from core.events import REPORT_WRITTEN, emit
+from models.utils import save_table
+
+
+class ForecastProcessor:
+    """
+    Класс для сохранения списка работ, которые станут просроченными
+    в ближайшие рабочие дни.
+    """
+
+    RESULT_COLUMNS = [
+        'Тип работы',
+        'Координатор',
+        'Модуль',
+        'Название задания',
+        'Ссылка на работу в админке',
+        'Ссылка на работу в ЛК эксперта',
+        'ID студента',
+        'Отправлена',
+        'Срок проверки',
+        'Проверяющий',
+        'Возможные проверяющие',
+        'Дней на проверке',
+    ]
+
+    def __init__(
+            self,
+            horizon_days: int = FORECAST_HORIZON_DAYS,
+            date_format: str = "%Y-%m-%d",
+            report_date: Optional[date] = None,
+            output_format: str = DEFAULT_OUTPUT_FORMAT
+    ):
+        """
+        Args:
+            horizon_days: Горизонт прогноза в рабочих днях (кроме FORECAST_HORIZON_DAYS - в имени файла)
+            date_format: Формат даты для именования файлов
+            report_date: Дата отчета для имени файла (по умолчанию - текущая)
+            output_format: Формат файла (xlsx или csv)
+        """
+        self.horizon_days = horizon_days
+        self.date_format = date_format
+        self.report_date = report_date
+        self.output_format = output_format
+
+    def process_forecast(
+            self,
+            forecast_df: pd.DataFrame,
+            output_folder: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Подготавливает и сохраняет прогноз просрочки в Excel-файл.
+
+        Args:
+            forecast_df: DataFrame из DataProcessor.create_forecast_df
+            output_folder: Папка для сохранения файла
+
+        Returns:
+            Подготовленный DataFrame
+
+        Raises:
+            TypeError: Если forecast_df не является DataFrame
+            IOError: При ошибках сохранения файла
+        """
+        if not isinstance(forecast_df, pd.DataFrame):
+            raise TypeError("forecast_df должен быть объектом pandas.DataFrame")
+
+        report_df = self._prepare_dataframe(forecast_df)
+        self._save_to_excel(report_df, output_folder)
+        return report_df
+
+    def _prepare_dataframe(self, forecast_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Добавляет тип работы и имя координатора, оставляет колонки отчета.
+
+        Args:
+            forecast_df: Исходный DataFrame
+
+        Returns:
+            DataFrame для сохранения
+        """
+        df = forecast_df.copy()
+        df['Тип работы'] = df['Тип срока'].map(DEADLINE_TYPE_NAMES)
+
+        df['Координатор'] = coordinator_names(df['coord_id'])
+
+        available_columns = [col for col in self.RESULT_COLUMNS if col in df.columns]
+        return df[available_columns]
+
+    def _save_to_excel(self, df: pd.DataFrame, output_folder: Optional[str] = None) -> None:
+        """
+        Сохраняет DataFrame в Excel файл.
+
+        Args:
+            df: DataFrame для сохранения
+            output_folder: Папка для сохранения
+
+        Raises:
+            IOError: При ошибках сохранения
+        """
+        today_date = (self.report_date or date.today()).strftime(self.date_format)
+        # Прогноз с другим горизонтом не должен читаться как "под риском завтра"
+        horizon = f"{self.horizon_days}_раб_дн_" if self.horizon_days != FORECAST_HORIZON_DAYS else ""
+        output_filename = f"Риск_просрочки_{horizon}{today_date}.{self.output_format}"
+        output_path = Path(output_folder) / output_filename if output_folder else Path(output_filename)
+
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            save_table(df, output_path, self.output_format)
+            emit(REPORT_WRITTEN, 'forecast', path=str(output_path), rows=len(df))
+            print(f"Файл успешно сохранён: {output_path}")
+            print(f"Сохранено {len(df)} записей под риском просрочки ({self.horizon_days} раб. дн.)")
+        except Exception as e:
+            raise IOError(f"Ошибка при сохранении файла: {e}")
+
+
+def process_forecast(
+        forecast_df: pd.DataFrame,
+        output_folder: Optional[str] = None,
+        report_date: Optional[date] = None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        horizon_days: int = FORECAST_HORIZON_DAYS
+) -> pd.DataFrame:
+    """
+    Основная функция сохранения прогноза просрочки.
+
+    Args:
+        forecast_df: DataFrame с работами под риском
+        output_folder: Папка для сохранения
+        report_date: Дата отчета для имени файла
+        output_format: Формат файла (xlsx или csv)
+        horizon_days: Горизонт, с которым построен forecast_df (DataProcessor.create_forecast_df)
+
+    Returns:
+        Подготовленный DataFrame
+    """
+    processor = ForecastProcessor(horizon_days=horizon_days, report_date=report_date, output_format=output_format)
+    return processor.process_forecast(forecast_df, output_folder)
@@ -2,11 +2,13 @@
 Модуль для обработки домашних работ.
 """
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
-from config.constants import REVIEW_DEADLINES
+from config.constants import DEFAULT_OUTPUT_FORMAT, REVIEW_DEADLINES
+from core.events import REPORT_WRITTEN, emit
+from models.utils import save_table
 
 
 class HomeworkProcessor:
@@ -17,15 +19,21 @@ class HomeworkProcessor:
     def __init__(
             self,
             deadline_hw: Optional[int] = None,
-            date_format: str = "%Y-%m-%d"
+            date_format: str = "%Y-%m-%d",
+            report_date: Optional[date] = None,
+            output_format: str = DEFAULT_OUTPUT_FORMAT
     ):
         """
         Args:
             deadline_hw: Дедлайн для домашних работ в рабочих днях
             date_format: Формат даты для именования файлов
+            report_date: Дата отчета для имени файла (по умолчанию - текущая)
+            output_format: Формат файла (xlsx или csv)
         """
         self.deadline_hw = deadline_hw or REVIEW_DEADLINES['HOMEWORK']
         self.date_format = date_format
+        self.report_date = report_date
+        self.output_format = output_format
 
     def process_unverified_works(
             self,
@@ -119,7 +127,8 @@ class HomeworkProcessor:
             # Создаем папку если она не существует
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            df.to_excel(output_path, index=False, engine='openpyxl')
+            save_table(df, output_path, self.output_format)
+            emit(REPORT_WRITTEN, 'homework', path=str(output_path), rows=len(df))
             print(f"Файл успешно сохранён: {output_path}")
             print(f"Сохранено {len(df)} записей")
         except Exception as e:
@@ -135,8 +144,8 @@ class HomeworkProcessor:
         Returns:
             Полный путь к файлу
         """
-        today_date = datetime.now().strftime(self.date_format)
-        output_filename = f"Непроверенные_ДЗ_{today_date}.xlsx"
+        today_date = (self.report_date or date.today()).strftime(self.date_format)
+        output_filename = f"Непроверенные_ДЗ_{today_date}.{self.output_format}"
 
         if output_folder:
             output_path = Path(output_folder)
@@ -147,7 +156,9 @@ class HomeworkProcessor:
 
 def process_unverified_works(
         homework_df: pd.DataFrame,
-        output_folder: Optional[str] = None
+        output_folder: Optional[str] = None,
+        report_date: Optional[date] = None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
 ) -> pd.DataFrame:
     """
     Основная функция обработки домашних работ.
@@ -155,11 +166,13 @@ def process_unverified_works(
     Args:
         homework_df: DataFrame с домашними работами
         output_folder: Папка для сохранения
+        report_date: Дата отчета для имени файла
+        output_format: Формат файла (xlsx или csv)
 
     Returns:
         Обработанный DataFrame
     """
-    processor = HomeworkProcessor()
+    processor = HomeworkProcessor(report_date=report_date, output_format=output_format)
     return processor.process_unverified_works(homework_df, output_folder)
 
 
@@ -1,10 +1,15 @@
 """
-Утилиты для работы с конфигурационными данными.
+Утилиты для работы с конфигурационными данными и сохранения отчетов.
 """
+from pathlib import Path
+from typing import Dict, List
 
+import pandas as pd
+
+from config.config_loader import normalize_key
+from config.constants import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS
 from config.modules import (
-    BLOCK_TO_PROFESSION,
-    LEAD_COORDINATORS_TO_PROFESSION,
+    CONFIG_MANAGER,
     LEAD_COORDINATOR_TO_BLOCKS,
     PROFESSION_TO_BLOCKS
 )
@@ -12,19 +17,17 @@ from config.modules import (
 
 def get_profession_for_block(block: str) -> str:
     """Получает профессию для блока."""
-    return BLOCK_TO_PROFESSION.get(block)
+    return CONFIG_MANAGER.get_lookup_indexes()['BLOCK_TO_PROFESSION'].get(normalize_key(block))
 
 
 def get_lead_coordinator_for_block(block: str) -> str:
     """Получает ведущего координатора для блока."""
-    profession = get_profession_for_block(block)
-    if not profession:
-        return None
+    return CONFIG_MANAGER.get_lookup_indexes()['BLOCK_TO_LEAD'].get(normalize_key(block))
+
 
-    for lead, professions in LEAD_COORDINATORS_TO_PROFESSION.items():
-        if profession in professions:
-            return lead
-    return None
+def get_lead_coordinator_for_profession(profession: str) -> str:
+    """Получает ведущего координатора для профессии."""
+    return CONFIG_MANAGER.get_lookup_indexes()['PROFESSION_TO_LEAD'].get(normalize_key(profession))
 
 
 def get_blocks_for_lead_coordinator(lead_name: str) -> list:
@@ -34,4 +37,44 @@ def get_blocks_for_lead_coordinator(lead_name: str) -> list:
 
 def get_blocks_for_profession(profession: str) -> list:
     """Получает все блоки для профессии."""
-    return PROFESSION_TO_BLOCKS.get(profession, [])
\ No newline at end of file
+    return PROFESSION_TO_BLOCKS.get(profession, [])
+
+
+def save_table(df: pd.DataFrame, path: Path, output_format: str = DEFAULT_OUTPUT_FORMAT) -> None:
+    """
+    Сохраняет табличный отчет в xlsx или csv (UTF-8 с BOM, чтобы Excel открывал кириллицу).
+
+    Raises:
+        ValueError: Если формат не поддерживается
+    """
+    if output_format == 'xlsx':
+        df.to_excel(path, index=False, engine='openpyxl')
+    elif output_format == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        raise ValueError(f"Неподдерживаемый формат отчета: {output_format} (доступны {OUTPUT_FORMATS})")
+
+
+def save_tables(tables: Dict[str, pd.DataFrame], path: Path,
+                output_format: str = DEFAULT_OUTPUT_FORMAT) -> List[Path]:
+    """
+    Сохраняет несколько таблиц: в xlsx - листами одной книги,
+    в csv - отдельными файлами <имя>_<лист>.csv.
+
+    Returns:
+        Пути сохраненных файлов
+
+    Raises:
+        ValueError: Если формат не поддерживается
+    """
+    if output_format == 'xlsx':
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            for sheet, df in tables.items():
+                df.to_excel(writer, sheet_name=sheet, index=False)
+        return [path]
+    paths = []
+    for sheet, df in tables.items():
+        sheet_path = path.with_name(f"{path.stem}_{sheet}{path.suffix}")
+        save_table(df, sheet_path, output_format)
+        paths.append(sheet_path)
+    return paths
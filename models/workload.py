@@ -0,0 +1,204 @@
+"""
+Модуль для формирования отчета о нагрузке проверяющих и возрасте работ.
+"""
+import pandas as pd
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.constants import AGE_BUCKETS, DEADLINE_TYPE_NAMES, DEFAULT_OUTPUT_FORMAT
+from core.age_stats import age_bucket_codes
+from core.events import REPORT_WRITTEN, emit
+from core.get_coordinators import coordinator_names
+from core.reviewers import ReviewerIndex, normalize_names
+from core.work_index import overdue_mask
+from models.utils import save_tables
+
+# Лист отчета -> название колонки группы
+GROUPINGS = {
+    'Проверяющие': 'Проверяющий',
+    'Координаторы': 'Координатор',
+    'Профессии': 'Профессия',
+}
+
+# Подписи для строк без значения группы
+MISSING_LABELS = {
+    'Проверяющий': 'Без проверяющего',
+    'Координатор': 'Не указан',
+    'Профессия': 'Не определена',
+}
+
+
+class WorkloadProcessor:
+    """
+    Класс для сводки по проверяющим, координаторам и профессиям:
+    работы на проверке, просроченные по типам, медиана и максимум
+    'Дней на проверке' и распределение работ по возрасту (AGE_BUCKETS).
+    """
+
+    def __init__(
+            self,
+            date_format: str = "%Y-%m-%d",
+            report_date: Optional[date] = None,
+            output_format: str = DEFAULT_OUTPUT_FORMAT,
+            strict_filter: bool = False,
+            deadlines: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            date_format: Формат даты для именования файлов
+            report_date: Дата отчета для имени файла (по умолчанию - текущая)
+            output_format: Формат файла (xlsx или csv)
+            strict_filter: Если True - просрочка при > срока, иначе при >= срока
+            deadlines: Переопределение сроков REVIEW_DEADLINES
+        """
+        self.date_format = date_format
+        self.report_date = report_date
+        self.output_format = output_format
+        self.strict_filter = strict_filter
+        self.deadlines = deadlines
+
+    def process_workload(
+            self,
+            base_df: pd.DataFrame,
+            output_folder: Optional[str] = None,
+            reviewer_index: Optional[ReviewerIndex] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Строит сводки и сохраняет их (xlsx - листами одной книги, csv - отдельными файлами).
+
+        Args:
+            base_df: Обогащенный DataFrame из DataProcessor
+            output_folder: Папка для сохранения
+            reviewer_index: Индекс проверяющих по тому же base_df (по умолчанию строится заново)
+
+        Returns:
+            Словарь лист -> сводка
+
+        Raises:
+            TypeError: Если base_df не является DataFrame
+            IOError: При ошибках сохранения файла
+        """
+        if not isinstance(base_df, pd.DataFrame):
+            raise TypeError("base_df должен быть объектом pandas.DataFrame")
+
+        tables = self.build_tables(base_df, reviewer_index)
+        self._save(tables, output_folder)
+        return tables
+
+    def build_tables(
+            self,
+            base_df: pd.DataFrame,
+            reviewer_index: Optional[ReviewerIndex] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Считает сводки по всем группировкам GROUPINGS.
+
+        Показатели строк (просрочка по типам, интервал возраста) считаются
+        один раз, затем для каждой группировки - один groupby по кодам группы.
+        Проверяющие группируются по кодам ReviewerIndex (без учета регистра
+        и лишних пробелов), как в /eligible и рекомендациях проверяющих.
+        """
+        if reviewer_index is None:
+            reviewer_index = ReviewerIndex(base_df)
+        days = base_df['Дней на проверке'].to_numpy(dtype=float)
+        overdue = overdue_mask(base_df, self.deadlines, self.strict_filter)
+        deadline_types = base_df['Тип срока'].to_numpy(dtype=object)
+
+        columns = {'days': days, 'overdue': overdue}
+        for deadline_type, name in DEADLINE_TYPE_NAMES.items():
+            columns[f'Просрочено: {name}'] = overdue & (deadline_types == deadline_type)
+        buckets = age_bucket_codes(days)
+        for number, (label, _) in enumerate(AGE_BUCKETS):
+            columns[f'Дней {label}'] = buckets == number
+        metrics = pd.DataFrame(columns)
+
+        aggregations = {
+            'Работ на проверке': ('days', 'size'),
+            'Просрочено всего': ('overdue', 'sum'),
+            **{column: (column, 'sum') for column in metrics.columns if column not in ('days', 'overdue')},
+            'Медиана дней на проверке': ('days', 'median'),
+            'Максимум дней на проверке': ('days', 'max'),
+        }
+
+        tables = {}
+        for sheet, group_column in GROUPINGS.items():
+            labels = self._group_labels(base_df, group_column, reviewer_index)
+            codes, uniques = pd.factorize(labels)
+            table = metrics.groupby(codes, sort=False).agg(**aggregations)
+            table.insert(0, group_column, uniques.take(table.index))
+            tables[sheet] = table.sort_values(
+                ['Просрочено всего', 'Работ на проверке', group_column],
+                ascending=[False, False, True], ignore_index=True
+            )
+        return tables
+
+    @staticmethod
+    def _group_labels(base_df: pd.DataFrame, group_column: str, reviewer_index: ReviewerIndex) -> pd.Series:
+        """Значения группы для каждой строки (пропуски - подпись из MISSING_LABELS)."""
+        if group_column == 'Проверяющий':
+            # Код -1 (без проверяющего) указывает на последний элемент - подпись пропуска
+            names = np.array(reviewer_index.names + [MISSING_LABELS[group_column]], dtype=object)
+            return pd.Series(names[reviewer_index.assigned], index=base_df.index)
+        if group_column == 'Координатор':
+            labels = coordinator_names(base_df['coord_id'])
+        elif group_column in base_df.columns:
+            labels = base_df[group_column]
+        else:
+            labels = pd.Series(pd.NA, index=base_df.index)
+        return normalize_names(labels).fillna(MISSING_LABELS[group_column])
+
+    def _save(self, tables: Dict[str, pd.DataFrame], output_folder: Optional[str] = None) -> None:
+        """
+        Сохраняет сводки.
+
+        Raises:
+            IOError: При ошибках сохранения
+        """
+        today_date = (self.report_date or date.today()).strftime(self.date_format)
+        output_filename = f"Нагрузка_проверяющих_{today_date}.{self.output_format}"
+        output_path = Path(output_folder) / output_filename if output_folder else Path(output_filename)
+
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # В xlsx все листы в одном файле; в строках события - строки первого листа
+            for path, table in zip(save_tables(tables, output_path, self.output_format), tables.values()):
+                emit(REPORT_WRITTEN, 'workload', path=str(path), rows=len(table))
+                print(f"Файл успешно сохранён: {path}")
+        except Exception as e:
+            raise IOError(f"Ошибка при сохранении файла: {e}")
+
+
+def process_workload(
+        base_df: pd.DataFrame,
+        output_folder: Optional[str] = None,
+        report_date: Optional[date] = None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        strict_filter: bool = False,
+        deadlines: Optional[Dict[str, int]] = None,
+        reviewer_index: Optional[ReviewerIndex] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Основная функция формирования отчета о нагрузке проверяющих.
+
+    Args:
+        base_df: Обогащенный DataFrame из DataProcessor
+        output_folder: Папка для сохранения
+        report_date: Дата отчета для имени файла
+        output_format: Формат файла (xlsx или csv)
+        strict_filter: Если True - просрочка при > срока, иначе при >= срока
+        deadlines: Переопределение сроков REVIEW_DEADLINES
+        reviewer_index: Индекс проверяющих по тому же base_df (DataProcessor.get_reviewer_index)
+
+    Returns:
+        Словарь лист -> сводка
+    """
+    processor = WorkloadProcessor(
+        report_date=report_date,
+        output_format=output_format,
+        strict_filter=strict_filter,
+        deadlines=deadlines
+    )
+    return processor.process_workload(base_df, output_folder, reviewer_index)
@@ -0,0 +1,202 @@
+"""
+Локальная служба запросов к индексу работ.
+
+Служба держит в памяти WorkIndex по последней обработанной выгрузке и
+отвечает на HTTP GET-запросы в формате JSON без повторного запуска
+Excel-конвейера. Новые выгрузки обрабатывает WorkAnalysisDaemon в
+отдельном потоке; после обработки индекс строится заново и подменяется
+одним присваиванием, поэтому запросы всегда видят целостный индекс.
+
+Запросы:
+    /info                          - сведения об индексе
+    /overdue?coord_id=<id>         - просроченные работы координатора
+    /unassigned?module=<модуль>    - работы без проверяющего по модулю
+    /student?id=<id>               - работы студента
+    /reviewer?name=<имя>           - работы проверяющего
+    /eligible?name=<имя>           - работы без проверяющего, которые он может взять
+    /aging?by=coordinator|lead     - сводка по возрасту работ (координаторы или ведущие)
+Во всех запросах можно передать limit=<n>.
+"""
+import argparse
+import asyncio
+import json
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from config.constants import (
+    DEFAULT_ARCHIVE_FOLDER, DEFAULT_OUTPUT_FOLDER, DEFAULT_input_FOLDER,
+    QUERY_SERVICE_HOST, QUERY_SERVICE_PORT, WATCH_POLL_INTERVAL, WATCH_SETTLE_SECONDS
+)
+from core.create_dataframes import DataProcessor
+from core.work_index import WorkIndex
+from daemon import WorkAnalysisDaemon
+
+# Маршрут -> (метод WorkIndex, обязательный параметр запроса)
+ROUTES = {
+    '/overdue': ('overdue_for_coordinator', 'coord_id'),
+    '/unassigned': ('unassigned_for_module', 'module'),
+    '/student': ('works_for_student', 'id'),
+    '/reviewer': ('works_for_reviewer', 'name'),
+    '/eligible': ('eligible_for_reviewer', 'name'),
+    '/aging': ('aging_summary', 'by'),
+}
+
+
+class QueryService:
+    """HTTP-служба запросов поверх WorkIndex."""
+
+    def __init__(
+            self,
+            daemon: WorkAnalysisDaemon,
+            host: str = QUERY_SERVICE_HOST,
+            port: int = QUERY_SERVICE_PORT
+    ) -> None:
+        """
+        Args:
+            daemon: Служба обработки выгрузок, после которой обновляется индекс
+            host: Адрес (по умолчанию только localhost)
+            port: Порт
+        """
+        self.daemon = daemon
+        self.daemon.on_processed = self.publish
+        self.host = host
+        self.port = port
+        self.index: Optional[WorkIndex] = None
+
+    def publish(self, base_df: pd.DataFrame, source: Optional[Path] = None) -> None:
+        """Строит новый индекс и подменяет текущий."""
+        index = WorkIndex(base_df, str(source) if source else None)
+        self.index = index  # Подмена одной ссылкой: запросы видят старый или новый индекс целиком
+        print(f"Индекс обновлен: {index.size} работ ({source})")
+
+    def load_latest(self) -> None:
+        """Строит индекс по последней выгрузке из архива (при старте службы)."""
+        folder = self.daemon.archive_folder
+        if folder is None or not folder.exists():
+            return
+        exports = sorted(
+            (f for pattern in self.daemon.watcher.patterns for f in folder.glob(pattern)),
+            key=lambda f: f.stat().st_mtime
+        )
+        if not exports:
+            return
+        processor = DataProcessor(str(exports[-1]), calendar_registry=self.daemon.calendar_registry)
+        base_df = processor.create_base_df()
+        if base_df is not None:
+            self.publish(base_df, exports[-1])
+
+    def answer(self, target: str) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """
+        Формирует ответ на запрос.
+
+        Args:
+            target: Путь запроса с параметрами
+
+        Returns:
+            HTTP-статус и тело ответа
+        """
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        index = self.index  # Одно чтение ссылки на весь запрос
+
+        if url.path in ('/', '/info', '/health'):
+            return HTTPStatus.OK, {'ready': index is not None, **(index.info() if index else {})}
+        if url.path not in ROUTES:
+            return HTTPStatus.NOT_FOUND, {'error': f"Неизвестный запрос: {url.path}"}
+        if index is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "Индекс еще не построен"}
+
+        method, param = ROUTES[url.path]
+        if not params.get(param):
+            return HTTPStatus.BAD_REQUEST, {'error': f"Не указан параметр {param}"}
+        limit = params.get('limit')
+        if limit is not None and not limit.isdigit():
+            return HTTPStatus.BAD_REQUEST, {'error': "limit должен быть неотрицательным целым"}
+
+        try:
+            return HTTPStatus.OK, getattr(index, method)(params[param], int(limit) if limit else None)
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обрабатывает одно HTTP-соединение."""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # Заголовки не используются
+
+            if len(request_line) < 2:
+                status, body = HTTPStatus.BAD_REQUEST, {'error': "Некорректный запрос"}
+            elif request_line[0] != 'GET':
+                status, body = HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Поддерживается только GET"}
+            else:
+                status, body = self.answer(request_line[1])
+
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + payload
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass  # Клиент уже закрыл соединение
+
+    async def _watch(self) -> None:
+        """Опрашивает папку с выгрузками, не блокируя обработку запросов."""
+        while True:
+            try:
+                await asyncio.to_thread(self.daemon.run_once)
+            except Exception as e:
+                print(f"Ошибка опроса папки: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.daemon.poll_interval)
+
+    async def serve(self) -> None:
+        """Запускает HTTP-сервер и наблюдение за папкой."""
+        await asyncio.to_thread(self.load_latest)
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"Служба запросов: http://{self.host}:{self.port}/info")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._watch())
+
+
+def main() -> None:
+    """Точка входа службы запросов."""
+    parser = argparse.ArgumentParser(description="Служба запросов Work Analysis")
+    parser.add_argument('--host', default=QUERY_SERVICE_HOST, help="Адрес сервера")
+    parser.add_argument('--port', type=int, default=QUERY_SERVICE_PORT, help="Порт сервера")
+    parser.add_argument('--input-folder', default=DEFAULT_input_FOLDER, help="Папка с выгрузками")
+    parser.add_argument('--output-folder', default=DEFAULT_OUTPUT_FOLDER, help="Папка для отчетов")
+    parser.add_argument('--archive-folder', default=DEFAULT_ARCHIVE_FOLDER,
+                        help="Папка для обработанных выгрузок")
+    parser.add_argument('--interval', type=float, default=WATCH_POLL_INTERVAL, help="Интервал опроса, с")
+    parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS,
+                        help="Время неизменности файла перед обработкой, с")
+    args = parser.parse_args()
+
+    daemon = WorkAnalysisDaemon(
+        input_folder=args.input_folder,
+        output_folder=args.output_folder,
+        archive_folder=args.archive_folder,
+        poll_interval=args.interval,
+        settle_seconds=args.settle
+    )
+    try:
+        asyncio.run(QueryService(daemon, args.host, args.port).serve())
+    except KeyboardInterrupt:
+        print("Служба остановлена")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,376 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import yaml
 import json
+import hashlib
 import os
+import queue
+import re
 import sys
+import threading
+from bisect import bisect_left
+from datetime import date
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+# Текст временного дочернего узла: дети узла вставляются в дерево только при раскрытии
+PLACEHOLDER_TEXT = "..."
+
+# Подсветка синтаксиса выполняется через HIGHLIGHT_DELAY_MS после последнего изменения
+# и только для видимых строк, которые еще не подсвечены или были изменены
+HIGHLIGHT_DELAY_MS = 150
+HIGHLIGHT_TAGS = ('key', 'string', 'number', 'boolean', 'null')
+
+# Ключ YAML (в том числе элемента списка "- key: value") и начало значения элемента списка
+KEY_PATTERN = re.compile(r'^\s*(?:-\s+)?((?:"[^"]*"|\'[^\']*\'|[^\s#:\'"][^:#]*?))\s*:(?=\s|$)')
+LIST_ITEM_PATTERN = re.compile(r'^\s*-(?=\s|$)')
+# Значения: строки в кавычках, числа, логические значения и null (YAML 1.1, как в yaml.safe_load)
+VALUE_TOKEN_PATTERN = re.compile(
+    r'(?P<string>"(?:[^"\\]|\\.)*"?|\'(?:[^\']|\'\')*\'?)'
+    r'|(?P<number>(?<![\w.])[-+]?(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))'
+    r'|(?P<boolean>\b(?:true|True|TRUE|false|False|FALSE|yes|Yes|YES|no|No|NO|on|On|ON|off|Off|OFF)\b)'
+    r'|(?P<null>(?<!\w)(?:null|Null|NULL|~)(?!\w))'
+)
+# Комментарий - "#" в начале строки или после пробела, вне кавычек
+COMMENT_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\']|\'\')*\'|(?P<comment>(?<!\S)#)')
+
+# Поиск: задержка после ввода и наибольшее количество узлов, раскрываемых при фильтрации
+SEARCH_DELAY_MS = 200
+MAX_REVEALED_MATCHES = 200
+TERM_PATTERN = re.compile(r'\w+')
+
+# Интервал опроса результатов фонового потока (загрузка, сохранение, валидация), мс
+POLL_INTERVAL_MS = 100
+# Наибольшее количество сообщений валидации в окне
+MAX_VALIDATION_MESSAGES = 30
+
+
+def path_sort_key(parts):
+    """Ключ сортировки путей: индексы списков - как числа, ключи - как строки"""
+    return [(0, part, '') if isinstance(part, int) else (1, 0, str(part)) for part in parts]
+
+
+class ConfigSearchIndex:
+    """
+    Обратный индекс конфигурации для поиска и карта путей.
+
+    Для каждого пути хранятся его части (ключи и индексы) и родитель,
+    поэтому поиск значения по пути не разбирает строку. Слова ключа и
+    скалярного значения узла индексируются в нижнем регистре. Узел найден,
+    если сам содержит слово запроса (как начало слова), а остальные слова
+    есть в нем или в его предках - так запрос может включать путь.
+    """
+
+    def __init__(self):
+        self.parts: Dict[str, Tuple] = {}
+        self.parents: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.path_terms: Dict[str, Set[str]] = {}
+        self.terms: Dict[str, Set[str]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+
+    def build(self, data):
+        """Полное построение индекса"""
+        self.parts.clear()
+        self.parents.clear()
+        self.children.clear()
+        self.path_terms.clear()
+        self.terms.clear()
+        self._sorted_terms = None
+        self._add('root', (), None, data)
+
+    def update_subtree(self, path, value):
+        """Переиндексация узла и его потомков после изменения значения"""
+        if path not in self.parts:
+            return
+        parts, parent = self.parts[path], self.parents[path]
+        self.remove_subtree(path)
+        self._add(path, parts, parent, value)
+
+    def remove_subtree(self, path):
+        """Удаление узла и его потомков из индекса"""
+        if path not in self.parts:
+            return
+        parent = self.parents[path]
+        if parent is not None:
+            self.children[parent].remove(path)
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            stack.extend(self.children.pop(current, ()))
+            for term in self.path_terms.pop(current, ()):
+                paths = self.terms[term]
+                paths.discard(current)
+                if not paths:
+                    del self.terms[term]
+                    self._sorted_terms = None
+            del self.parts[current]
+            del self.parents[current]
+
+    def _add(self, path, parts, parent, value):
+        """Индексация узла и его потомков (обход без рекурсии)"""
+        stack = [(path, parts, parent, value)]
+        while stack:
+            path, parts, parent, value = stack.pop()
+            self.parts[path] = parts
+            self.parents[path] = parent
+            self.children[path] = []
+            if parent is not None:
+                self.children[parent].append(path)
+
+            text = '' if not parts else str(parts[-1])
+            if value is not None and not isinstance(value, (dict, list)):
+                text = f"{text} {value}"
+            terms = set(TERM_PATTERN.findall(text.lower()))
+            self.path_terms[path] = terms
+            for term in terms:
+                if term not in self.terms:
+                    self.terms[term] = set()
+                    self._sorted_terms = None
+                self.terms[term].add(path)
+
+            prefix = '' if path == 'root' else path
+            if isinstance(value, dict):
+                children = [(f"{prefix}.{key}" if prefix else str(key), key, child)
+                            for key, child in value.items()]
+            elif isinstance(value, list):
+                children = [(f"{prefix}[{i}]", i, child) for i, child in enumerate(value)]
+            else:
+                children = []
+            # В обратном порядке, чтобы дети попадали в children[path] в порядке документа
+            for child_path, part, child in reversed(children):
+                stack.append((child_path, parts + (part,), path, child))
+
+    def ancestors(self, path):
+        """Пути предков узла от корня"""
+        result = []
+        parent = self.parents.get(path)
+        while parent is not None:
+            result.append(parent)
+            parent = self.parents.get(parent)
+        return result[::-1]
+
+    def find_word(self, word):
+        """Узлы, содержащие слово, начинающееся с word (диапазон отсортированных слов)"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.terms)
+        paths = set()
+        position = bisect_left(self._sorted_terms, word)
+        while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(word):
+            paths |= self.terms[self._sorted_terms[position]]
+            position += 1
+        return paths
+
+    def search(self, query):
+        """Пути найденных узлов в порядке путей"""
+        words = set(TERM_PATTERN.findall(query.lower()))
+        if not words:
+            return []
+        found = [self.find_word(word) for word in words]
+        if not all(found):
+            return []
+
+        result = []
+        for path in set().union(*found):
+            chain = {path, *self.ancestors(path)}
+            if all(not paths.isdisjoint(chain) for paths in found):
+                result.append(path)
+        return sorted(result, key=lambda path: path_sort_key(self.parts[path]))
+
+
+class ConfigValidator:
+    """
+    Проверка схемы конфигураций work_analysis (coordinators.yaml, professions.yaml,
+    module.yaml, dates.json) с кэшем результатов по разделам верхнего уровня.
+
+    После изменений проверяются только разделы, отмеченные mark_dirty.
+    Проверки связанных разделов (праздники и переносы, профессии ведущих
+    координаторов) повторяются при изменении любого из них.
+    """
+
+    # Разделы других конфигураций проекта (calendars.yaml, schedule.yaml) - без проверки схемы
+    OTHER_SECTIONS = ('default', 'calendars', 'span_years', 'assignment', 'jobs')
+    LINKED_CHECKS = {
+        'dates_linked': ('holidays', 'extra_days'),
+        'lead_professions_linked': ('lead_coordinators_to_profession', 'profession_to_blocks'),
+    }
+
+    def __init__(self):
+        self.section_checks = {
+            'coordinators': self.check_coordinators,
+            'lead_coordinators_to_profession': self.check_name_lists,
+            'profession_to_blocks': self.check_profession_blocks,
+            'diploma_modules': self.check_modules,
+            'self_assignment_modules': self.check_modules,
+            'holidays': self.check_dates,
+            'extra_days': self.check_dates,
+        }
+        self.results: Dict[str, List[Tuple[str, str]]] = {}
+        self.dirty: Optional[Set[str]] = None
+
+    def mark_dirty(self, section=None):
+        """Отмечает раздел (None - весь документ) для повторной проверки"""
+        if section is None or self.dirty is None:
+            self.dirty = None
+        else:
+            self.dirty.add(str(section))
+
+    def validate(self, data):
+        """
+        Проверяет измененные разделы.
+
+        Returns:
+            (ошибки, предупреждения, количество проверенных разделов)
+        """
+        if not isinstance(data, dict):
+            self.results = {}
+            self.dirty = None
+            return ["Конфигурация должна быть словарем"], [], 0
+
+        sections = {str(key): value for key, value in data.items()}
+        dirty = set(sections) if self.dirty is None else self.dirty & set(sections)
+        # Результаты удаленных разделов больше не нужны
+        for key in list(self.results):
+            if key not in sections and not key.startswith('~'):
+                del self.results[key]
+
+        for key in dirty:
+            check = self.section_checks.get(key)
+            if check is not None:
+                self.results[key] = check(key, sections[key])
+            elif key in self.OTHER_SECTIONS:
+                self.results[key] = []
+            else:
+                self.results[key] = [('warning', f"{key}: неизвестный раздел")]
+
+        changed = set(sections) if self.dirty is None else self.dirty
+        for name, linked in self.LINKED_CHECKS.items():
+            if self.dirty is None or changed & set(linked):
+                self.results[f'~{name}'] = getattr(self, f'check_{name}')(sections)
+        self.dirty = set()
+
+        messages = [message for key in sorted(self.results) for message in self.results[key]]
+        if not set(sections) & (set(self.section_checks) | set(self.OTHER_SECTIONS)):
+            messages.append(('warning', "Нет разделов конфигурации work_analysis "
+                                        "(coordinators, profession_to_blocks, diploma_modules, holidays, ...)"))
+        errors = [text for level, text in messages if level == 'error']
+        warnings = [text for level, text in messages if level == 'warning']
+        return errors, warnings, len(dirty)
+
+    @staticmethod
+    def check_coordinators(key, value):
+        """coordinators: ID координатора (число) -> имя"""
+        if not isinstance(value, dict):
+            return [('error', f"{key}: должен быть словарем ID -> имя")]
+        issues = []
+        names = {}
+        for coord_id, name in value.items():
+            if isinstance(coord_id, bool) or not str(coord_id).strip().isdigit():
+                issues.append(('error', f"{key}.{coord_id}: ID координатора должен быть числом"))
+            if not isinstance(name, str) or not name.strip():
+                issues.append(('error', f"{key}.{coord_id}: не указано имя координатора"))
+            elif name.strip() in names:
+                issues.append(('warning', f"{key}.{coord_id}: имя '{name}' уже указано для {names[name.strip()]}"))
+            else:
+                names[name.strip()] = coord_id
+        return issues
+
+    @staticmethod
+    def check_name_lists(key, value):
+        """Словарь имя -> список непустых строк"""
+        if not isinstance(value, dict):
+            return [('error', f"{key}: должен быть словарем")]
+        issues = []
+        for name, items in value.items():
+            if not isinstance(items, list):
+                issues.append(('error', f"{key}.{name}: должен быть списком"))
+                continue
+            for i, item in enumerate(items):
+                if not isinstance(item, str) or not item.strip():
+                    issues.append(('error', f"{key}.{name}[{i}]: должна быть непустая строка"))
+        return issues
+
+    @classmethod
+    def check_profession_blocks(cls, key, value):
+        """profession_to_blocks: профессия -> блоки (блок должен относиться к одной профессии)"""
+        issues = cls.check_name_lists(key, value)
+        if not isinstance(value, dict):
+            return issues
+        owners = {}
+        for profession, blocks in value.items():
+            for block in blocks if isinstance(blocks, list) else ():
+                block_key = str(block).strip().casefold()
+                if block_key in owners and owners[block_key] != profession:
+                    issues.append(('warning', f"{key}.{profession}: блок '{block}' уже указан "
+                                              f"для профессии {owners[block_key]} (будет использована последняя)"))
+                owners[block_key] = profession
+        return issues
+
+    @staticmethod
+    def check_modules(key, value):
+        """Список модулей: непустые строки без повторов"""
+        if not isinstance(value, list):
+            return [('error', f"{key}: должен быть списком модулей")]
+        issues = []
+        seen = set()
+        for i, module in enumerate(value):
+            if not isinstance(module, str) or not module.strip():
+                issues.append(('error', f"{key}[{i}]: должна быть непустая строка"))
+            elif module in seen:
+                issues.append(('warning', f"{key}[{i}]: модуль '{module}' указан повторно"))
+            else:
+                seen.add(module)
+        return issues
+
+    @staticmethod
+    def parse_date(value):
+        """Дата из строки ГГГГ-ММ-ДД (или уже разобранная YAML); None, если формат неверный"""
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value))
+        except ValueError:
+            return None
+
+    @classmethod
+    def check_dates(cls, key, value):
+        """holidays / extra_days: даты ГГГГ-ММ-ДД без повторов"""
+        if not isinstance(value, list):
+            return [('error', f"{key}: должен быть списком дат ГГГГ-ММ-ДД")]
+        issues = []
+        seen = set()
+        for i, item in enumerate(value):
+            parsed = cls.parse_date(item)
+            if parsed is None:
+                issues.append(('error', f"{key}[{i}]: '{item}' - не дата в формате ГГГГ-ММ-ДД"))
+            elif parsed in seen:
+                issues.append(('warning', f"{key}[{i}]: дата {parsed} указана повторно"))
+            else:
+                seen.add(parsed)
+        return issues
+
+    @classmethod
+    def check_dates_linked(cls, sections):
+        """Дата не может быть одновременно праздником и рабочим днем-переносом"""
+        holidays, extra_days = sections.get('holidays'), sections.get('extra_days')
+        if not isinstance(holidays, list) or not isinstance(extra_days, list):
+            return []
+        both = {cls.parse_date(item) for item in holidays} & {cls.parse_date(item) for item in extra_days}
+        both.discard(None)
+        return [('error', f"Дата {day} указана и в holidays, и в extra_days") for day in sorted(both)]
+
+    @staticmethod
+    def check_lead_professions_linked(sections):
+        """Профессии ведущих координаторов должны быть в profession_to_blocks (если он в этом же файле)"""
+        leads, professions = sections.get('lead_coordinators_to_profession'), sections.get('profession_to_blocks')
+        if not isinstance(leads, dict) or not isinstance(professions, dict):
+            return []
+        known = {str(profession).strip().casefold() for profession in professions}
+        return [
+            ('warning', f"lead_coordinators_to_profession.{lead}: профессия '{profession}' "
+                        f"отсутствует в profession_to_blocks")
+            for lead, items in leads.items() if isinstance(items, list)
+            for profession in items if str(profession).strip().casefold() not in known
+        ]
 
 
 class ConfigEditorGUI:
@@ -17,6 +383,33 @@ class ConfigEditorGUI:
         # Текущий файл
         self.current_file = None
         self.config_data = {}
+        self.highlight_job = None
+
+        # Узлы дерева, дети которых уже вставлены (остальные содержат только заглушку)
+        self.loaded_items = set()
+
+        # Поиск: индекс, узлы дерева по путям, найденные пути и скрытые фильтром узлы
+        self.search_index = ConfigSearchIndex()
+        self.path_items = {}
+        self.search_job = None
+        self.search_matches = []
+        self.search_matched = set()
+        self.search_position = -1
+        self.search_visible = None
+        self.item_paths = {}
+        self.detached_items = {}
+        self.partial_items = set()
+
+        # Фоновый поток: загрузка, сохранение и валидация выполняются по очереди,
+        # результаты обрабатываются в UI-потоке через after()
+        self.jobs = queue.Queue()
+        self.job_results = queue.Queue()
+        self.pending_jobs = 0
+        threading.Thread(target=self.worker_loop, daemon=True).start()
+
+        # Хэши содержимого сохраненных/загруженных файлов (неизмененный файл не перезаписывается)
+        self.saved_hashes = {}
+        self.validator = ConfigValidator()
 
         # Стили
         self.setup_styles()
@@ -90,18 +483,32 @@ class ConfigEditorGUI:
         nav_frame = ttk.LabelFrame(parent, text="Структура конфигурации", padding="5")
         nav_frame.grid(row=1, column=0, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
 
+        # Поиск по ключам, значениям и путям: дерево фильтруется при вводе,
+        # Enter - следующее совпадение, Escape - сброс
+        search_frame = ttk.Frame(nav_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, pady=(0, 5), sticky=(tk.W, tk.E))
+        ttk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=25)
+        self.search_entry.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        self.search_label = ttk.Label(search_frame, text="")
+        self.search_label.pack(side=tk.LEFT, padx=2)
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        self.search_entry.bind('<Return>', lambda event: self.jump_to_match(self.search_position + 1))
+        self.search_entry.bind('<Escape>', lambda event: self.search_var.set(""))
+
         # Дерево конфигурации
         self.tree = ttk.Treeview(nav_frame, show="tree", height=30)
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # Полоса прокрутки для дерева
         tree_scroll = ttk.Scrollbar(nav_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        tree_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        tree_scroll.grid(row=1, column=1, sticky=(tk.N, tk.S))
         self.tree.configure(yscrollcommand=tree_scroll.set)
 
         # Кнопки навигации
         nav_buttons_frame = ttk.Frame(nav_frame)
-        nav_buttons_frame.grid(row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E))
+        nav_buttons_frame.grid(row=2, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E))
 
         ttk.Button(nav_buttons_frame, text="Развернуть все",
                    command=lambda: self.expand_tree(True)).pack(side=tk.LEFT, padx=2)
@@ -110,6 +517,7 @@ class ConfigEditorGUI:
 
         # События дерева
         self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<<TreeviewOpen>>', self.on_tree_open)
         self.tree.bind('<Double-Button-1>', self.on_tree_double_click)
 
     def setup_editor(self, parent):
@@ -163,6 +571,10 @@ class ConfigEditorGUI:
         self.status_label = ttk.Label(self.statusbar, text="Готов", anchor=tk.W)
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
+        # Индикатор фоновой операции (загрузка, сохранение, валидация)
+        self.progress_bar = ttk.Progressbar(self.statusbar, mode='indeterminate', length=120)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+
         self.file_label = ttk.Label(self.statusbar, text="Файл не выбран", anchor=tk.E)
         self.file_label.pack(side=tk.RIGHT)
 
@@ -173,9 +585,15 @@ class ConfigEditorGUI:
         self.text_editor.tag_config('number', foreground='orange')
         self.text_editor.tag_config('boolean', foreground='purple')
         self.text_editor.tag_config('null', foreground='red')
+        # Служебный тег строк, подсветка которых актуальна (теги перемещаются вместе с текстом)
+        self.text_editor.tag_config('highlighted')
 
-        # Привязка события для обновления подсветки
-        self.text_editor.bind('<KeyRelease>', self.update_syntax_highlighting)
+        # Изменение текста помечает строки у курсора; изменение видимой области
+        # (прокрутка, вставка текста, размер окна) запускает отложенную подсветку
+        self.text_editor.bind('<KeyRelease>', self.on_editor_key)
+        self.text_editor.bind('<<Paste>>', lambda event: self.text_editor.after_idle(self.invalidate_highlighting),
+                              add='+')
+        self.text_editor.configure(yscrollcommand=self.on_editor_scroll)
 
     def create_tooltip(self, widget, text):
         """Создание всплывающей подсказки"""
@@ -214,45 +632,156 @@ class ConfigEditorGUI:
         if file_path:
             self.load_file(file_path)
 
-    def load_file(self, file_path):
-        """Загрузка файла"""
+    def worker_loop(self):
+        """Фоновый поток: выполняет задания по очереди"""
+        while True:
+            work, on_done = self.jobs.get()
+            try:
+                result, error = work(), None
+            except Exception as e:
+                result, error = None, e
+            self.job_results.put((on_done, result, error))
+
+    def run_in_background(self, message, work, on_done):
+        """
+        Выполняет work() в фоновом потоке, затем on_done(результат, ошибка) в UI-потоке.
+        Пока задание выполняется, показывается индикатор и блокируется изменение данных.
+        """
+        self.pending_jobs += 1
+        if self.pending_jobs == 1:
+            self.progress_bar.start(10)
+            self.root.after(POLL_INTERVAL_MS, self.poll_jobs)
+        self.update_status(message)
+        self.jobs.put((work, on_done))
+
+    def poll_jobs(self):
+        """Обрабатывает завершенные фоновые задания (UI-поток)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Определение типа файла
-            if file_path.endswith(('.yaml', '.yml')):
-                self.config_data = yaml.safe_load(content) or {}
-            elif file_path.endswith('.json'):
-                self.config_data = json.loads(content)
-            else:
-                messagebox.showerror("Ошибка", "Неподдерживаемый формат файла")
-                return
+            while True:
+                on_done, result, error = self.job_results.get_nowait()
+                self.pending_jobs -= 1
+                if self.pending_jobs == 0:
+                    self.progress_bar.stop()
+                on_done(result, error)
+        except queue.Empty:
+            pass
+        if self.pending_jobs:
+            self.root.after(POLL_INTERVAL_MS, self.poll_jobs)
+
+    def check_idle(self):
+        """Изменять данные можно только без фоновых заданий (они читают config_data)"""
+        if self.pending_jobs:
+            self.update_status("Дождитесь завершения фоновой операции")
+            return False
+        return True
+
+    @staticmethod
+    def serialize(data, file_path):
+        """Текст файла конфигурации в формате по расширению"""
+        if file_path.endswith('.json'):
+            return json.dumps(data, indent=2, ensure_ascii=False)
+        return yaml.dump(data, allow_unicode=True, sort_keys=False)
+
+    @staticmethod
+    def content_hash(content):
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def read_config(cls, file_path):
+        """
+        Чтение и разбор файла, построение индекса поиска (в фоновом потоке).
 
-            self.current_file = file_path
-            self.update_tree_view()
-            self.update_status(f"Файл загружен: {os.path.basename(file_path)}")
-            self.file_label.config(text=file_path)
+        Returns:
+            (данные, индекс, хэш содержимого в том виде, в каком его запишет сохранение)
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if file_path.endswith(('.yaml', '.yml')):
+            data = yaml.safe_load(content) or {}
+        else:
+            data = json.loads(content)
 
-            # Сохранение последнего файла
-            self.save_last_file(file_path)
+        index = ConfigSearchIndex()
+        index.build(data)
+        return data, index, cls.content_hash(cls.serialize(data, file_path))
 
-        except yaml.YAMLError as e:
-            messagebox.showerror("Ошибка YAML", f"Ошибка парсинга YAML:\n{str(e)}")
-        except json.JSONDecodeError as e:
-            messagebox.showerror("Ошибка JSON", f"Ошибка парсинга JSON:\n{str(e)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить файл:\n{str(e)}")
+    @classmethod
+    def write_config(cls, file_path, data, previous_hash):
+        """
+        Атомарное сохранение (временный файл и замена) в фоновом потоке.
+        Если содержимое не изменилось с последней загрузки/сохранения, файл не перезаписывается.
 
-    def save_file(self):
-        """Сохранение текущего файла"""
-        if not self.current_file:
-            self.save_file_as()
+        Returns:
+            (хэш содержимого, был ли файл записан)
+        """
+        content = cls.serialize(data, file_path)
+        new_hash = cls.content_hash(content)
+        target = Path(file_path)
+        if new_hash == previous_hash and target.exists():
+            return new_hash, False
+
+        temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, target)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        return new_hash, True
+
+    def load_file(self, file_path):
+        """Загрузка файла (чтение и разбор - в фоновом потоке)"""
+        if not file_path.endswith(('.yaml', '.yml', '.json')):
+            messagebox.showerror("Ошибка", "Неподдерживаемый формат файла")
+            return
+
+        self.run_in_background(
+            f"Загрузка: {os.path.basename(file_path)}...",
+            lambda: self.read_config(file_path),
+            lambda result, error: self.on_file_loaded(file_path, result, error)
+        )
+
+    def on_file_loaded(self, file_path, result, error):
+        """Показ загруженного файла (UI-поток)"""
+        if isinstance(error, yaml.YAMLError):
+            messagebox.showerror("Ошибка YAML", f"Ошибка парсинга YAML:\n{str(error)}")
+            return
+        if isinstance(error, json.JSONDecodeError):
+            messagebox.showerror("Ошибка JSON", f"Ошибка парсинга JSON:\n{str(error)}")
             return
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить файл:\n{str(error)}")
+            return
+
+        self.config_data, self.search_index, content_hash = result
+        self.saved_hashes[os.path.abspath(file_path)] = content_hash
+        self.validator = ConfigValidator()
 
-        self.save_to_file(self.current_file)
+        self.current_file = file_path
+        self.update_tree_view(build_index=False)
+        self.update_status(f"Файл загружен: {os.path.basename(file_path)}")
+        self.file_label.config(text=file_path)
 
-    def save_file_as(self):
+        # Сохранение последнего файла
+        self.save_last_file(file_path)
+
+    def save_file(self, on_saved=None):
+        """
+        Сохранение текущего файла.
+
+        Returns:
+            True, если сохранение запущено
+        """
+        if not self.current_file:
+            return self.save_file_as(on_saved)
+
+        return self.save_to_file(self.current_file, on_saved)
+
+    def save_file_as(self, on_saved=None):
         """Сохранение файла как..."""
         if not self.current_file:
             default_name = "config.yaml"
@@ -269,69 +798,261 @@ class ConfigEditorGUI:
             ]
         )
 
-        if file_path:
-            self.save_to_file(file_path)
+        if not file_path:
+            return False
+
+        def on_file_saved():
             self.current_file = file_path
             self.file_label.config(text=file_path)
+            if on_saved is not None:
+                on_saved()
 
-    def save_to_file(self, file_path):
-        """Сохранение данных в файл"""
-        try:
-            # Получение полных данных
-            full_data = self.get_full_config_data()
-
-            # Определение формата
-            if file_path.endswith('.json'):
-                content = json.dumps(full_data, indent=2, ensure_ascii=False)
-            else:
-                content = yaml.dump(full_data, allow_unicode=True, sort_keys=False)
-
-            # Сохранение
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            self.update_status(f"Файл сохранен: {os.path.basename(file_path)}")
+        return self.save_to_file(file_path, on_file_saved)
 
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
+    def save_to_file(self, file_path, on_saved=None):
+        """Сохранение данных в файл (сериализация и запись - в фоновом потоке)"""
+        # Получение полных данных
+        full_data = self.get_full_config_data()
+        key = os.path.abspath(file_path)
+        previous_hash = self.saved_hashes.get(key)
 
-    def update_tree_view(self):
-        """Обновление дерева конфигурации"""
-        # Очистка дерева
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        def on_done(result, error):
+            if error is not None:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{str(error)}")
+                return
+            self.saved_hashes[key], written = result
+            if written:
+                self.update_status(f"Файл сохранен: {os.path.basename(file_path)}")
+            else:
+                self.update_status(f"Изменений нет, файл не перезаписан: {os.path.basename(file_path)}")
+            if on_saved is not None:
+                on_saved()
+
+        self.run_in_background(
+            f"Сохранение: {os.path.basename(file_path)}...",
+            lambda: self.write_config(file_path, full_data, previous_hash),
+            on_done
+        )
+        return True
+
+    def update_tree_view(self, build_index=True):
+        """Обновление дерева конфигурации (вставляются только элементы верхнего уровня)"""
+        # Очистка дерева: удаление корня удаляет все поддерево одной командой
+        self.tree.delete(*self.tree.get_children())
+        self.loaded_items.clear()
+        self.path_items.clear()
+        self.item_paths.clear()
+        self.detached_items.clear()
+        self.partial_items.clear()
+        if build_index:
+            self.search_index.build(self.config_data)
 
         # Добавление корневого элемента
         root_item = self.tree.insert('', 'end', text="Конфигурация",
                                      values=["root"], open=True)
+        self.path_items["root"] = root_item
+        self.item_paths[root_item] = "root"
 
-        # Рекурсивное добавление элементов
-        self.add_tree_items(root_item, self.config_data)
+        self.populate_children(root_item)
+        if self.search_var.get().strip():
+            self.apply_search()
 
-    def add_tree_items(self, parent_item, data, path=""):
-        """Рекурсивное добавление элементов в дерево"""
+    def add_tree_items(self, parent_item, data, path="", only=None):
+        """
+        Добавление дочерних элементов одного уровня (вложенные - при раскрытии узла).
+        only - пути, которые нужно вставить (остальные пропускаются при фильтрации поиска).
+        """
         if isinstance(data, dict):
-            for key, value in data.items():
-                item_path = f"{path}.{key}" if path else key
-                item_id = self.tree.insert(
-                    parent_item, 'end',
-                    text=str(key),
-                    values=[item_path, type(value).__name__]
-                )
-
-                if isinstance(value, (dict, list)):
-                    self.add_tree_items(item_id, value, item_path)
+            children = ((str(key), f"{path}.{key}" if path else key, value) for key, value in data.items())
         elif isinstance(data, list):
-            for i, value in enumerate(data):
-                item_path = f"{path}[{i}]"
-                item_id = self.tree.insert(
-                    parent_item, 'end',
-                    text=f"[{i}]",
-                    values=[item_path, type(value).__name__]
-                )
+            children = ((f"[{i}]", f"{path}[{i}]", value) for i, value in enumerate(data))
+        else:
+            return
 
-                if isinstance(value, (dict, list)):
-                    self.add_tree_items(item_id, value, item_path)
+        for text, item_path, value in children:
+            if only is not None and item_path not in only:
+                continue
+            item_id = self.tree.insert(
+                parent_item, 'end',
+                text=text,
+                values=[item_path, type(value).__name__]
+            )
+            self.path_items[item_path] = item_id
+            self.item_paths[item_id] = item_path
+
+            if isinstance(value, (dict, list)) and value:
+                # Заглушка показывает значок раскрытия, не вставляя вложенную структуру
+                self.tree.insert(item_id, 'end', text=PLACEHOLDER_TEXT)
+
+    def populate_children(self, item_id):
+        """Вставляет детей узла вместо заглушки (один раз, до следующего обновления узла)"""
+        if item_id in self.loaded_items:
+            return
+        self.tree.delete(*self.tree.get_children(item_id))
+        item_path = self.tree.item(item_id, 'values')[0]
+        value = self.get_value_by_path(item_path)
+        if self.search_visible is not None and item_path not in self.search_matched:
+            # При фильтрации вставляются только совпадения и их предки; после сброса
+            # фильтра узел заполняется заново
+            self.add_tree_items(item_id, value, "" if item_path == "root" else item_path,
+                                only=self.search_visible)
+            self.partial_items.add(item_id)
+        else:
+            self.add_tree_items(item_id, value, "" if item_path == "root" else item_path)
+        self.loaded_items.add(item_id)
+
+    def on_tree_open(self, event):
+        """Заполнение узла при раскрытии"""
+        item_id = self.tree.focus()
+        if item_id:
+            self.populate_children(item_id)
+
+    def refresh_subtree(self, item_id):
+        """
+        Обновление только поддерева узла после изменения его значения.
+        Раскрытые ранее вложенные узлы снова раскрываются (и заполняются).
+        """
+        open_paths = self.get_open_paths(item_id)
+        item_path = self.tree.item(item_id, 'values')[0]
+        value = self.get_value_by_path(item_path)
+        self.search_index.update_subtree(item_path, value)
+
+        self.forget_loaded(item_id)
+        self.tree.delete(*self.tree.get_children(item_id))
+        self.tree.item(item_id, values=[item_path, type(value).__name__])
+        if isinstance(value, (dict, list)) and value:
+            self.tree.insert(item_id, 'end', text=PLACEHOLDER_TEXT)
+            if self.tree.item(item_id, 'open'):
+                self.reopen_paths(item_id, open_paths)
+        else:
+            self.tree.item(item_id, open=False)
+
+    def schedule_search(self):
+        """Откладывает поиск до паузы во вводе"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """Поиск по индексу и фильтрация дерева: остаются совпадения и их предки"""
+        self.search_job = None
+        query = self.search_var.get()
+        self.clear_filter(repopulate=not query.strip())
+        self.search_matches = self.search_index.search(query)
+        self.search_matched = set(self.search_matches)
+        self.search_position = -1
+        if not query.strip():
+            self.search_label.config(text="")
+            return
+
+        self.search_label.config(text=f"Найдено: {len(self.search_matches)}")
+        visible = set(self.search_matched)
+        for path in self.search_matches:
+            visible.update(self.search_index.ancestors(path))
+        self.search_visible = visible
+
+        root_item = self.path_items.get("root")
+        if root_item is not None:
+            self.filter_tree(root_item)
+        # Совпадения во вложенных узлах показываются раскрытием их предков
+        for path in self.search_matches[:MAX_REVEALED_MATCHES]:
+            self.reveal_path(path)
+        if self.search_matches:
+            self.jump_to_match(0)
+
+    def filter_tree(self, item_id):
+        """Скрывает в заполненных узлах элементы без совпадений"""
+        if item_id not in self.loaded_items:
+            return
+        if self.item_paths.get(item_id) in self.search_matched:
+            # Поддерево найденного узла показывается целиком
+            return
+        children = self.tree.get_children(item_id)
+        shown = [child for child in children if self.item_paths.get(child) in self.search_visible]
+        if len(shown) < len(children):
+            # Один вызов set_children вместо detach для каждого скрываемого элемента
+            self.detached_items[item_id] = children
+            self.tree.set_children(item_id, *shown)
+        for child in shown:
+            self.filter_tree(child)
+
+    def clear_filter(self, repopulate=True):
+        """
+        Возвращает скрытые фильтром элементы на прежние места.
+        Узлы, заполненные при фильтрации только совпадениями, при repopulate заполняются
+        полностью; иначе (следующий запрос при вводе) возвращаются к заглушке.
+        """
+        self.search_visible = None
+        for item_id, children in self.detached_items.items():
+            if self.tree.exists(item_id):
+                original = set(children)
+                added = [child for child in self.tree.get_children(item_id) if child not in original]
+                self.tree.set_children(item_id, *[child for child in children if self.tree.exists(child)], *added)
+        self.detached_items.clear()
+
+        for item_id in list(self.partial_items):
+            if not self.tree.exists(item_id) or item_id not in self.loaded_items:
+                continue
+            if repopulate:
+                open_paths = self.get_open_paths(item_id)
+                self.forget_loaded(item_id)
+                self.reopen_paths(item_id, open_paths)
+            else:
+                self.forget_loaded(item_id)
+                self.tree.delete(*self.tree.get_children(item_id))
+                self.tree.insert(item_id, 'end', text=PLACEHOLDER_TEXT)
+                self.tree.item(item_id, open=False)
+        self.partial_items.clear()
+
+    def reveal_path(self, path):
+        """Раскрывает предков узла (заполняя их) и возвращает его элемент дерева"""
+        for ancestor in self.search_index.ancestors(path):
+            ancestor_item = self.path_items.get(ancestor)
+            if ancestor_item is None or not self.tree.exists(ancestor_item):
+                return None
+            self.populate_children(ancestor_item)
+            self.tree.item(ancestor_item, open=True)
+        item_id = self.path_items.get(path)
+        return item_id if item_id is not None and self.tree.exists(item_id) else None
+
+    def jump_to_match(self, position):
+        """Выделяет совпадение с номером position (по кругу)"""
+        if not self.search_matches:
+            return
+        self.search_position = position % len(self.search_matches)
+        item_id = self.reveal_path(self.search_matches[self.search_position])
+        if item_id is not None:
+            self.tree.selection_set(item_id)
+            self.tree.focus(item_id)
+            self.tree.see(item_id)
+        self.search_label.config(
+            text=f"Найдено: {len(self.search_matches)} ({self.search_position + 1})"
+        )
+
+    def get_open_paths(self, item_id):
+        """Пути раскрытых вложенных узлов (только уже заполненных)"""
+        open_paths = set()
+        for child in self.tree.get_children(item_id):
+            if child in self.loaded_items and self.tree.item(child, 'open'):
+                open_paths.add(self.tree.item(child, 'values')[0])
+                open_paths |= self.get_open_paths(child)
+        return open_paths
+
+    def reopen_paths(self, item_id, open_paths):
+        """Заполняет узел и раскрывает его детей из open_paths"""
+        self.populate_children(item_id)
+        for child in self.tree.get_children(item_id):
+            if self.tree.item(child, 'values')[0] in open_paths:
+                self.tree.item(child, open=True)
+                self.reopen_paths(child, open_paths)
+
+    def forget_loaded(self, item_id):
+        """Убирает узел и заполненных потомков из loaded_items"""
+        if item_id not in self.loaded_items:
+            return
+        self.loaded_items.discard(item_id)
+        for child in self.tree.get_children(item_id):
+            self.forget_loaded(child)
 
     def on_tree_select(self, event):
         """Обработка выбора элемента в дереве"""
@@ -362,6 +1083,7 @@ class ConfigEditorGUI:
 
         # Сохранение текущего пути
         self.current_path = item_path
+        self.current_item = item_id
 
     def on_tree_double_click(self, event):
         """Обработка двойного клика по элементу дерева"""
@@ -369,12 +1091,17 @@ class ConfigEditorGUI:
         if item_id:
             self.tree.item(item_id, open=not self.tree.item(item_id, 'open'))
 
+    def get_path_parts(self, path):
+        """Части пути из индекса (разбор строки - только для путей вне индекса)"""
+        parts = self.search_index.parts.get(path)
+        return list(parts) if parts is not None else self.parse_path(path)
+
     def get_value_by_path(self, path):
         """Получение значения по пути"""
         if path == "root":
             return self.config_data
 
-        parts = self.parse_path(path)
+        parts = self.get_path_parts(path)
         current = self.config_data
 
         try:
@@ -422,6 +1149,8 @@ class ConfigEditorGUI:
         if not hasattr(self, 'current_path'):
             messagebox.showwarning("Предупреждение", "Сначала выберите элемент")
             return
+        if not self.check_idle():
+            return
 
         try:
             new_value_text = self.text_editor.get(1.0, tk.END).strip()
@@ -439,9 +1168,13 @@ class ConfigEditorGUI:
 
             # Обновление значения в структуре данных
             self.set_value_by_path(self.current_path, new_value)
+            self.mark_edited(self.current_path)
 
-            # Обновление дерева
-            self.refresh_view()
+            # Обновление только поддерева измененного элемента
+            if self.current_item is not None and self.tree.exists(self.current_item):
+                self.refresh_subtree(self.current_item)
+            else:
+                self.refresh_view()
 
             self.update_status("Изменения применены")
 
@@ -454,7 +1187,7 @@ class ConfigEditorGUI:
             self.config_data = value
             return
 
-        parts = self.parse_path(path)
+        parts = self.get_path_parts(path)
         current = self.config_data
 
         # Навигация к родительскому элементу
@@ -488,6 +1221,8 @@ class ConfigEditorGUI:
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите родительский элемент")
             return
+        if not self.check_idle():
+            return
 
         parent_id = selection[0]
         parent_path = self.tree.item(parent_id, 'values')[0]
@@ -515,6 +1250,8 @@ class ConfigEditorGUI:
             if not key:
                 messagebox.showerror("Ошибка", "Введите ключ")
                 return
+            if not self.check_idle():
+                return
 
             try:
                 # Преобразование значения
@@ -536,8 +1273,11 @@ class ConfigEditorGUI:
                         messagebox.showerror("Ошибка", "Для списка укажите числовой индекс")
                         return
 
-                # Обновление представления
-                self.refresh_view()
+                # Обновление поддерева родительского элемента
+                self.mark_edited(parent_path)
+                self.refresh_subtree(parent_id)
+                self.populate_children(parent_id)
+                self.tree.item(parent_id, open=True)
                 dialog.destroy()
 
             except Exception as e:
@@ -559,6 +1299,8 @@ class ConfigEditorGUI:
         if item_path == "root":
             messagebox.showwarning("Предупреждение", "Нельзя удалить корневой элемент")
             return
+        if not self.check_idle():
+            return
 
         # Подтверждение удаления
         if not messagebox.askyesno("Подтверждение",
@@ -566,7 +1308,7 @@ class ConfigEditorGUI:
             return
 
         try:
-            parts = self.parse_path(item_path)
+            parts = self.get_path_parts(item_path)
             current = self.config_data
 
             # Навигация к родительскому элементу
@@ -582,70 +1324,80 @@ class ConfigEditorGUI:
                 del current[last_part]
             elif isinstance(last_part, int):
                 del current[last_part]
+            self.mark_edited(item_path)
 
-            # Обновление представления
-            self.refresh_view()
+            # Обновление дерева: ключ словаря удаляется из дерева,
+            # у списка индексы следующих элементов сдвигаются - обновляется родитель
+            parent_id = self.tree.parent(item_id)
+            if isinstance(last_part, int):
+                self.refresh_subtree(parent_id)
+            else:
+                self.search_index.remove_subtree(item_path)
+                self.forget_loaded(item_id)
+                self.tree.delete(item_id)
             self.update_status(f"Элемент '{item_path}' удален")
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось удалить элемент:\n{str(e)}")
 
     def validate_config(self):
-        """Валидация конфигурации"""
-        try:
-            # Базовая валидация
-            if not isinstance(self.config_data, dict):
-                raise ValueError("Конфигурация должна быть словарем")
+        """Валидация конфигурации (в фоновом потоке, только измененные разделы)"""
+        data = self.config_data
 
-            # Проверка обязательных полей для work_analysis
-            required_sections = ['database', 'paths', 'analysis']
-            for section in required_sections:
-                if section not in self.config_data:
-                    messagebox.showwarning("Предупреждение",
-                                           f"Отсутствует раздел: {section}")
+        def on_done(result, error):
+            if error is not None:
+                messagebox.showerror("Ошибка валидации", str(error))
+                return
+            errors, warnings, checked = result
+            self.update_status(f"Конфигурация проверена (проверено разделов: {checked})")
+            if errors:
+                messagebox.showerror("Ошибка валидации", self.format_messages(errors + warnings))
+            elif warnings:
+                messagebox.showwarning("Предупреждение", self.format_messages(warnings))
+            else:
+                messagebox.showinfo("Валидация", "Конфигурация валидна")
 
-            # Проверка типов данных
-            self.validate_types(self.config_data)
+        self.run_in_background("Валидация...", lambda: self.validator.validate(data), on_done)
 
-            messagebox.showinfo("Валидация", "Конфигурация валидна")
-            self.update_status("Конфигурация проверена")
+    @staticmethod
+    def format_messages(messages):
+        """Текст сообщений валидации для окна (не более MAX_VALIDATION_MESSAGES)"""
+        text = "\n".join(messages[:MAX_VALIDATION_MESSAGES])
+        if len(messages) > MAX_VALIDATION_MESSAGES:
+            text += f"\n... и еще {len(messages) - MAX_VALIDATION_MESSAGES}"
+        return text
 
-        except Exception as e:
-            messagebox.showerror("Ошибка валидации", str(e))
-
-    def validate_types(self, data, path=""):
-        """Рекурсивная проверка типов данных"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
-                self.validate_types(value, current_path)
-        elif isinstance(data, list):
-            for i, value in enumerate(data):
-                current_path = f"{path}[{i}]"
-                self.validate_types(value, current_path)
+    def mark_edited(self, path):
+        """Отмечает раздел верхнего уровня, содержащий path, для повторной валидации"""
+        parts = self.get_path_parts(path) if path != "root" else []
+        self.validator.mark_dirty(parts[0] if parts else None)
 
     def expand_tree(self, expand=True):
         """Развернуть/свернуть все узлы дерева"""
         for item in self.tree.get_children():
-            if expand:
-                self.tree.item(item, open=True)
-                self.expand_children(item, expand)
-            else:
-                self.tree.item(item, open=False)
+            self.tree.item(item, open=expand)
+            self.expand_children(item, expand)
 
     def expand_children(self, parent, expand=True):
-        """Рекурсивное развертывание/свертывание дочерних элементов"""
+        """
+        Рекурсивное развертывание/свертывание дочерних элементов.
+        При развертывании узлы заполняются; при свертывании обходятся только заполненные.
+        """
+        if expand:
+            self.populate_children(parent)
+        elif parent not in self.loaded_items:
+            return
         for child in self.tree.get_children(parent):
-            if expand:
-                self.tree.item(child, open=True)
-                self.expand_children(child, expand)
-            else:
-                self.tree.item(child, open=False)
+            if not self.tree.get_children(child):
+                continue
+            self.tree.item(child, open=expand)
+            self.expand_children(child, expand)
 
     def undo_changes(self):
         """Отмена последнего изменения в редакторе"""
         try:
             self.text_editor.edit_undo()
+            self.invalidate_highlighting()
             self.update_status("Изменение отменено")
         except:
             messagebox.showinfo("Информация", "Нет изменений для отмены")
@@ -663,28 +1415,88 @@ class ConfigEditorGUI:
                 self.text_editor.insert(1.0, display_value)
             self.update_status("Изменения сброшены")
 
-    def update_syntax_highlighting(self, event=None):
-        """Обновление подсветки синтаксиса"""
-        # Базовая реализация подсветки
-        content = self.text_editor.get(1.0, tk.END)
-
-        # Очистка всех тегов
-        for tag in ['key', 'string', 'number', 'boolean', 'null']:
-            self.text_editor.tag_remove(tag, 1.0, tk.END)
+    def on_editor_key(self, event=None):
+        """Помечает для подсветки строку курсора и предыдущую (Enter/Backspace меняют обе)"""
+        line = int(self.text_editor.index(tk.INSERT).split('.')[0])
+        self.invalidate_highlighting(max(line - 1, 1), line)
+
+    def on_editor_scroll(self, first, last):
+        """Изменилась видимая область редактора"""
+        self.text_editor.vbar.set(first, last)
+        self.schedule_highlighting()
+
+    def invalidate_highlighting(self, first_line=None, last_line=None):
+        """Помечает строки (по умолчанию - все) для повторной подсветки"""
+        start = f"{first_line}.0" if first_line else "1.0"
+        end = f"{last_line}.0 lineend +1c" if last_line else tk.END
+        self.text_editor.tag_remove('highlighted', start, end)
+        self.schedule_highlighting()
+
+    def schedule_highlighting(self):
+        """Откладывает подсветку до паузы в наборе (повторный вызов переносит срок)"""
+        if self.highlight_job is not None:
+            self.root.after_cancel(self.highlight_job)
+        self.highlight_job = self.root.after(HIGHLIGHT_DELAY_MS, self.update_syntax_highlighting)
 
-        # Простая подсветка (можно расширить)
-        lines = content.split('\n')
-        line_start = 1.0
-
-        for line in lines:
-            # Подсветка ключей в YAML
-            if ':' in line:
-                key_end = line.find(':')
-                self.text_editor.tag_add('key',
-                                         f"{line_start}+0c",
-                                         f"{line_start}+{key_end}c")
+    def update_syntax_highlighting(self, event=None):
+        """Подсветка видимых строк, которые еще не подсвечены или изменены"""
+        self.highlight_job = None
+        first = int(self.text_editor.index("@0,0").split('.')[0])
+        last = int(self.text_editor.index(f"@0,{self.text_editor.winfo_height()}").split('.')[0])
+
+        for line in range(first, last + 1):
+            if 'highlighted' not in self.text_editor.tag_names(f"{line}.0"):
+                self.highlight_line(line)
+
+    def highlight_line(self, line):
+        """Подсветка одной строки: ключ и значения по регулярным выражениям"""
+        start = f"{line}.0"
+        end = f"{line}.0 lineend"
+        text = self.text_editor.get(start, end)
+        for tag in HIGHLIGHT_TAGS:
+            self.text_editor.tag_remove(tag, start, end)
+
+        for tag, tag_start, tag_end in self.tokenize_line(text):
+            self.text_editor.tag_add(tag, f"{line}.{tag_start}", f"{line}.{tag_end}")
+        self.text_editor.tag_add('highlighted', start, f"{end} +1c")
+
+    @staticmethod
+    def tokenize_line(text):
+        """Фрагменты строки YAML для подсветки: (тег, начало, конец)"""
+        tokens = []
+        value_start = 0
+        key_match = KEY_PATTERN.match(text)
+        if key_match:
+            tokens.append(('key', key_match.start(1), key_match.end(1)))
+            value_start = key_match.end()
+        else:
+            item_match = LIST_ITEM_PATTERN.match(text)
+            if item_match:
+                value_start = item_match.end()
 
-            line_start = self.text_editor.index(f"{line_start}+1line")
+        value_end = next(
+            (match.start() for match in COMMENT_PATTERN.finditer(text, value_start) if match.group('comment')),
+            len(text)
+        )
+        value = text[value_start:value_end]
+        scalar = value.strip()
+        if not scalar:
+            return tokens
+
+        offset = value_start + len(value) - len(value.lstrip())
+        token_match = VALUE_TOKEN_PATTERN.fullmatch(scalar)
+        if token_match:
+            # Значение целиком - одно число, логическое значение, null или строка в кавычках
+            tokens.append((token_match.lastgroup, offset, offset + len(scalar)))
+        elif scalar[0] in '[{':
+            # Списки и словари в одну строку: отдельные значения внутри
+            tokens.extend(
+                (match.lastgroup, value_start + match.start(), value_start + match.end())
+                for match in VALUE_TOKEN_PATTERN.finditer(value)
+            )
+        else:
+            tokens.append(('string', offset, offset + len(scalar)))
+        return tokens
 
     def get_full_config_data(self):
         """Получение полных данных конфигурации"""
@@ -760,8 +1572,10 @@ def main():
 
     # Обработка закрытия окна
     def on_closing():
+        # Сохранение выполняется в фоновом потоке: окно закрывается после его завершения
         if messagebox.askokcancel("Выход", "Сохранить изменения перед выходом?"):
-            app.save_file()
+            if app.save_file(on_saved=root.destroy):
+                return
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -770,6 +1584,7 @@ def main():
     root.bind('<Control-o>', lambda e: app.open_file())
     root.bind('<Control-s>', lambda e: app.save_file())
     root.bind('<Control-z>', lambda e: app.undo_changes())
+    root.bind('<Control-f>', lambda e: app.search_entry.focus_set())
 
     root.mainloop()
 